@@ -0,0 +1,122 @@
+import csv
+import json
+from datetime import date
+
+PERIODS = ('day', 'week', 'month', 'year', 'all')
+MEASURES = ('sum', 'count')
+
+
+class BudgetRule:
+    def __init__(self, name, limit, transaction_type='debit', per=('customer_id',), period='month', measure='sum'):
+        if period not in PERIODS:
+            raise ValueError(f"Invalid period '{period}'. Choose from: {', '.join(PERIODS)}.")
+        if measure not in MEASURES:
+            raise ValueError(f"Invalid measure '{measure}'. Choose from: {', '.join(MEASURES)}.")
+        self.name = name
+        self.limit = float(limit)
+        self.transaction_type = transaction_type.lower() if transaction_type else None
+        self.per = tuple(per)
+        self.period = period
+        self.measure = measure
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], data['limit'], data.get('type', 'debit'), data.get('per', ['customer_id']), data.get('period', 'month'), data.get('measure', 'sum'))
+
+    def period_key(self, transaction_date):
+        if self.period == 'all':
+            return ''
+        if self.period == 'day':
+            return transaction_date
+        if self.period == 'month':
+            return transaction_date[:7]
+        if self.period == 'year':
+            return transaction_date[:4]
+        year, week, _ = date.fromisoformat(transaction_date).isocalendar()
+        return f"{year}-W{week:02d}"
+
+
+class BudgetRulesEngine:
+    def __init__(self, rules=None):
+        self.rules = []
+        self.by_type = {}
+        self.candidates = {}
+        self.totals = {}
+        self.alerts = []
+        for rule in rules or []:
+            self.add_rule(rule)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls([BudgetRule.from_dict(data) for data in json.load(f)])
+
+    def add_rule(self, rule):
+        index = len(self.rules)
+        self.rules.append(rule)
+        self.by_type.setdefault(rule.transaction_type, []).append(index)
+        self.candidates = {}
+
+    def rules_for(self, transaction_type):
+        candidates = self.candidates.get(transaction_type)
+        if candidates is None:
+            candidates = sorted(self.by_type.get(transaction_type, []) + self.by_type.get(None, []))
+            self.candidates[transaction_type] = candidates
+        return candidates
+
+    def evaluate(self, transaction):
+        candidates = self.rules_for(str(transaction.get('type', '')).lower())
+        if not candidates:
+            return []
+
+        try:
+            amount = abs(float(transaction.get('amount', 0)))
+        except (ValueError, TypeError):
+            return []
+        transaction_date = str(transaction.get('date', ''))
+
+        new_alerts = []
+        for index in candidates:
+            rule = self.rules[index]
+            try:
+                period = rule.period_key(transaction_date)
+            except ValueError:
+                continue
+            key = (index, tuple(transaction.get(field, 'N/A') for field in rule.per), period)
+            previous = self.totals.get(key, 0.0)
+            total = previous + (amount if rule.measure == 'sum' else 1)
+            self.totals[key] = total
+
+            if previous <= rule.limit < total:
+                alert = (index, key[1], period, total, transaction.get('transaction_id', 'N/A'))
+                self.alerts.append(alert)
+                new_alerts.append(alert)
+        return new_alerts
+
+    def evaluate_all(self, transactions_list):
+        for transaction in transactions_list:
+            self.evaluate(transaction)
+        return self.alerts
+
+    def alert_message(self, alert):
+        index, group, period, total, transaction_id = alert
+        rule = self.rules[index]
+        who = ", ".join(f"{field} {value}" for field, value in zip(rule.per, group)) or "all transactions"
+        when = f" in {period}" if period else ""
+        measure = f"${total:.2f}" if rule.measure == 'sum' else f"{total:.0f} transactions"
+        return f"Budget alert '{rule.name}': {who}{when} reached {measure} (limit {rule.limit:g}) at transaction {transaction_id}."
+
+    def save_alerts(self, filename):
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['rule', 'group', 'period', 'total', 'transaction_id'])
+            for index, group, period, total, transaction_id in self.alerts:
+                writer.writerow([self.rules[index].name, '|'.join(str(value) for value in group), period, f"{total:.2f}", transaction_id])
+
+    def report_lines(self, max_alerts=50):
+        lines = [f"Budget Alerts ({len(self.alerts)}): \n"]
+        if not self.alerts:
+            lines.append("No budget rules exceeded. \n")
+        for alert in self.alerts[:max_alerts]:
+            lines.append(f"- {self.alert_message(alert)}\n")
+        return lines
@@ -0,0 +1,213 @@
+import argparse
+import csv
+import os
+import pickle
+import shutil
+
+from personal_finance_lib8 import ERROR_LOG_FILE, initialize_error_log, log_error, process_transaction_row
+from transaction_stats import IncrementalSummary
+
+DEFAULT_CHECKPOINT_EVERY = 100000
+STATE_FILE = 'state.pkl'
+ROWS_FILE = 'rows.pkl'
+
+
+def checkpoint_dir_for(filename):
+    return filename + '.checkpoint'
+
+
+def source_fingerprint(filename):
+    info = os.stat(filename)
+    return {'size': info.st_size, 'mtime': info.st_mtime}
+
+
+def read_record(file):
+    raw = file.readline()
+    if not raw:
+        return None
+    text = raw.decode('utf-8')
+    while text.count('"') % 2 == 1:
+        more = file.readline()
+        if not more:
+            break
+        text += more.decode('utf-8')
+    return next(csv.reader(text.splitlines(keepends=True)), [])
+
+
+def iter_rows_with_offsets(file, fieldnames):
+    while True:
+        values = read_record(file)
+        if values is None:
+            return
+        if not values:
+            continue
+        yield dict(zip(fieldnames, values)), file.tell()
+
+
+def write_state(checkpoint_dir, state):
+    state_filename = os.path.join(checkpoint_dir, STATE_FILE)
+    temp_filename = state_filename + '.tmp'
+    with open(temp_filename, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_filename, state_filename)
+
+
+def read_state(checkpoint_dir):
+    state_filename = os.path.join(checkpoint_dir, STATE_FILE)
+    if not os.path.exists(state_filename):
+        return None
+    try:
+        with open(state_filename, 'rb') as f:
+            return pickle.load(f)
+    except (pickle.UnpicklingError, EOFError, OSError) as e:
+        log_error(f"Ignoring unreadable checkpoint '{state_filename}': {e}")
+        return None
+
+
+def file_size(filename):
+    return os.path.getsize(filename) if os.path.exists(filename) else 0
+
+
+def truncate_file(filename, size):
+    if file_size(filename) > size:
+        with open(filename, 'r+b') as f:
+            f.truncate(size)
+
+
+def restore_into(target, restored):
+    # The caller keeps using the objects it passed in, so a resumed run
+    # copies the checkpointed state into them instead of replacing them.
+    if target is None:
+        return restored
+    if restored is not None:
+        vars(target).clear()
+        vars(target).update(vars(restored))
+    return target
+
+
+def read_rows(rows_filename):
+    rows = []
+    with open(rows_filename, 'rb') as f:
+        while True:
+            try:
+                rows.append(pickle.load(f))
+            except EOFError:
+                return rows
+
+
+def new_state(filename, stats, rules, rollups):
+    return {
+        'source': os.path.abspath(filename),
+        'fingerprint': source_fingerprint(filename),
+        'fieldnames': None,
+        'offset': 0,
+        'rows_read': 0,
+        'rows_kept': 0,
+        'rows_size': 0,
+        'errors_size': file_size(ERROR_LOG_FILE),
+        'summary': IncrementalSummary(),
+        'stats': stats,
+        'rules': rules,
+        'rollups': rollups,
+        'rejects': []
+    }
+
+
+def load_transactions_resumable(filename='financial_transactions_short.csv', checkpoint_dir=None, checkpoint_every=DEFAULT_CHECKPOINT_EVERY, stats=None, keep_rows=True, rules=None, rollups=None):
+    if not os.path.exists(ERROR_LOG_FILE):
+        initialize_error_log()
+    if not os.path.exists(filename):
+        print(f"Error: The file '{filename}' was not found.")
+        log_error(f"Error: The file '{filename}' was not found during loading.")
+        return [], {}
+
+    checkpoint_dir = checkpoint_dir or checkpoint_dir_for(filename)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    rows_filename = os.path.join(checkpoint_dir, ROWS_FILE)
+
+    state = read_state(checkpoint_dir)
+    if state is not None and (state['source'] != os.path.abspath(filename) or state['fingerprint'] != source_fingerprint(filename)):
+        print(f"Checkpoint in '{checkpoint_dir}' does not match '{filename}'. Starting over.")
+        state = None
+    if state is not None and (file_size(rows_filename) < state['rows_size'] or file_size(ERROR_LOG_FILE) < state['errors_size']):
+        print(f"Checkpoint in '{checkpoint_dir}' is missing rows or logged errors. Starting over.")
+        state = None
+
+    if state is None:
+        state = new_state(filename, stats, rules, rollups)
+        open(rows_filename, 'wb').close()
+        write_state(checkpoint_dir, state)
+    else:
+        print(f"Resuming '{filename}' from byte {state['offset']} ({state['rows_read']} rows already processed).")
+        truncate_file(rows_filename, state['rows_size'])
+        truncate_file(ERROR_LOG_FILE, state['errors_size'])
+        state['stats'] = restore_into(stats, state['stats'])
+        state['rules'] = restore_into(rules, state.get('rules'))
+        state['rollups'] = restore_into(rollups, state.get('rollups'))
+
+    summary = state['summary']
+    stats = state['stats']
+    rules = state['rules']
+    rollups = state['rollups']
+    rejects = state['rejects']
+    since_checkpoint = 0
+
+    with open(filename, 'rb') as source, open(rows_filename, 'ab') as rows_file:
+        if state['fieldnames'] is None:
+            state['fieldnames'] = read_record(source) or []
+            state['offset'] = source.tell()
+        source.seek(state['offset'])
+
+        for row, offset in iter_rows_with_offsets(source, state['fieldnames']):
+            state['rows_read'] += 1
+            current_item = process_transaction_row(row)
+            if current_item is None:
+                rejects.append(row.get('transaction_id', 'N/A'))
+            else:
+                summary.apply(current_item)
+                if stats is not None:
+                    flagged = stats.update(current_item)
+                    if flagged:
+                        log_error(f"Anomaly: transaction {flagged['transaction_id']} for customer {flagged['customer_id']} has amount {flagged['amount']:.2f} (z-score {flagged['z_score']:.2f}).")
+                if rules is not None:
+                    rules.evaluate(current_item)
+                if rollups is not None:
+                    rollups.add(current_item)
+                if keep_rows:
+                    pickle.dump(current_item, rows_file, protocol=pickle.HIGHEST_PROTOCOL)
+                state['rows_kept'] += 1
+
+            state['offset'] = offset
+            since_checkpoint += 1
+            if since_checkpoint >= checkpoint_every:
+                rows_file.flush()
+                os.fsync(rows_file.fileno())
+                state['rows_size'] = rows_file.tell()
+                state['errors_size'] = file_size(ERROR_LOG_FILE)
+                write_state(checkpoint_dir, state)
+                since_checkpoint = 0
+
+    transactions = read_rows(rows_filename) if keep_rows else []
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+
+    print(f"Successfully loaded and processed {state['rows_kept']} transactions ({len(rejects)} rejected).")
+    print(f"Transaction processing complete. Check {ERROR_LOG_FILE} for any logged issues.")
+    return transactions, summary.to_dict()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a large transactions file with resumable checkpoints.")
+    parser.add_argument('input', help="transactions CSV file")
+    parser.add_argument('--checkpoint-dir', default=None, help="where to keep checkpoint state (default: <input>.checkpoint)")
+    parser.add_argument('--every', type=int, default=DEFAULT_CHECKPOINT_EVERY, help="rows between checkpoints")
+    args = parser.parse_args()
+
+    _, summary = load_transactions_resumable(args.input, args.checkpoint_dir, args.every, keep_rows=False)
+    if summary:
+        print(f"Net Balance: ${summary['net_balance']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
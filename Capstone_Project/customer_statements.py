@@ -0,0 +1,169 @@
+import argparse
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import time
+import zipfile
+import zlib
+from datetime import datetime
+from multiprocessing import Pool
+
+import personal_finance_lib8
+from personal_finance_lib8 import log_error
+
+DEFAULT_BUCKETS = 64
+SAFE_NAME_PATTERN = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def bucket_for(customer_id, buckets):
+    return zlib.crc32(str(customer_id).encode('utf-8')) % buckets
+
+
+def statement_filename(customer_id):
+    # IDs that clean up to the same name ('a/b' and 'a_b', or 'A' and 'a' on
+    # a case-insensitive file system) are kept apart by a hash of the raw ID.
+    raw_id = str(customer_id)
+    digest = hashlib.sha1(raw_id.encode('utf-8')).hexdigest()[:8]
+    return f"statement_{SAFE_NAME_PATTERN.sub('_', raw_id)}_{digest}.txt"
+
+
+def render_statement(customer_id, transactions, generated_at):
+    transactions.sort(key=lambda transaction: (transaction.get('date', ''), str(transaction.get('transaction_id', ''))))
+    lines = [
+        f"--- Customer Statement: {customer_id} ({generated_at}) ---\n",
+        f"Period: {transactions[0].get('date', 'N/A')} to {transactions[-1].get('date', 'N/A')}\n\n",
+        f"{'ID':<10} | {'Date':<10} | {'Type':<8} | {'Amount':>12} | Description\n",
+        f"{'-' * 10} | {'-' * 10} | {'-' * 8} | {'-' * 12} | {'-' * 30}\n"
+    ]
+
+    totals_by_type = {}
+    balance = 0.0
+    for transaction in transactions:
+        try:
+            amount = float(transaction.get('amount', 0))
+        except (ValueError, TypeError):
+            continue
+        transaction_type = str(transaction.get('type', 'unknown')).lower()
+        totals_by_type[transaction_type] = totals_by_type.get(transaction_type, 0.0) + amount
+        balance += amount
+        lines.append(f"{str(transaction.get('transaction_id', 'N/A')):<10} | {transaction.get('date', 'N/A'):<10} | {transaction_type:<8} | {amount:>12.2f} | {transaction.get('description', '')}\n")
+
+    lines.append("\nTotals by Type: \n")
+    for transaction_type, total_amount in sorted(totals_by_type.items()):
+        lines.append(f"- {transaction_type.title()}: ${total_amount:.2f}\n")
+    lines.append(f"Net Balance: ${balance:.2f}\n")
+    return "".join(lines)
+
+
+def spill_buckets(transactions, temp_dir, buckets):
+    files = {}
+    count = 0
+    try:
+        for transaction in transactions:
+            bucket = bucket_for(transaction.get('customer_id', 'N/A'), buckets)
+            file = files.get(bucket)
+            if file is None:
+                file = open(os.path.join(temp_dir, f"bucket_{bucket}.pkl"), 'wb')
+                files[bucket] = file
+            pickle.dump(transaction, file, protocol=pickle.HIGHEST_PROTOCOL)
+            count += 1
+    finally:
+        for file in files.values():
+            file.close()
+    return [file.name for file in files.values()], count
+
+
+def read_bucket(bucket_filename):
+    grouped = {}
+    with open(bucket_filename, 'rb') as f:
+        while True:
+            try:
+                transaction = pickle.load(f)
+            except EOFError:
+                break
+            grouped.setdefault(transaction.get('customer_id', 'N/A'), []).append(transaction)
+    return grouped
+
+
+def render_bucket(job):
+    bucket_filename, output_dir, generated_at = job
+    grouped = read_bucket(bucket_filename)
+    rendered = []
+    for customer_id in sorted(grouped, key=str):
+        content = render_statement(customer_id, grouped[customer_id], generated_at)
+        if output_dir is None:
+            rendered.append((statement_filename(customer_id), content))
+        else:
+            with open(os.path.join(output_dir, statement_filename(customer_id)), 'w', encoding='utf-8') as f:
+                f.write(content)
+            rendered.append((statement_filename(customer_id), None))
+    os.remove(bucket_filename)
+    return rendered
+
+
+def generate_customer_statements(source='financial_transactions_short.csv', output='statements', processes=None, archive=False, buckets=DEFAULT_BUCKETS):
+    print(f"\n--- Generating Customer Statements to '{output}' ---")
+    if isinstance(source, str):
+        transactions = personal_finance_lib8.iter_transactions(source)
+    else:
+        transactions = source
+
+    start_time = time.perf_counter()
+    generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    statements = 0
+    try:
+        with tempfile.TemporaryDirectory(prefix='pf_statements_') as temp_dir:
+            try:
+                bucket_filenames, transaction_count = spill_buckets(transactions, temp_dir, buckets)
+            except FileNotFoundError:
+                print(f"Error: The file '{source}' was not found.")
+                log_error(f"Error: The file '{source}' was not found while generating statements.")
+                return 0
+
+            output_dir = None
+            zip_file = None
+            if archive:
+                zip_file = zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED)
+            else:
+                os.makedirs(output, exist_ok=True)
+                output_dir = output
+
+            try:
+                jobs = [(bucket_filename, output_dir, generated_at) for bucket_filename in bucket_filenames]
+                with Pool(processes) as pool:
+                    for completed, rendered in enumerate(pool.imap_unordered(render_bucket, jobs), start=1):
+                        for name, content in rendered:
+                            if zip_file is not None:
+                                zip_file.writestr(name, content)
+                        statements += len(rendered)
+                        elapsed = time.perf_counter() - start_time
+                        print(f"Progress: {completed}/{len(jobs)} buckets, {statements} statements ({statements / elapsed:.0f} statements/s)")
+            finally:
+                if zip_file is not None:
+                    zip_file.close()
+    except (IOError, OSError) as e:
+        print(f"Error writing customer statements to '{output}': {e}")
+        log_error(f"Error writing customer statements to '{output}': {e}")
+        return statements
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Generated {statements} statements from {transaction_count} transactions in {elapsed:.2f}s ({transaction_count / max(elapsed, 1e-9):.0f} transactions/s).")
+    return statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate one statement per customer in parallel.")
+    parser.add_argument('input', help="transactions CSV file")
+    parser.add_argument('output', help="output directory, or .zip file with --archive")
+    parser.add_argument('--archive', action='store_true', help="write all statements into a single zip archive")
+    parser.add_argument('--processes', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--buckets', type=int, default=DEFAULT_BUCKETS, help="customer partitions spilled to disk")
+    args = parser.parse_args()
+
+    generate_customer_statements(args.input, args.output, args.processes, args.archive, args.buckets)
+
+
+if __name__ == '__main__':
+    main()
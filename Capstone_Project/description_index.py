@@ -0,0 +1,187 @@
+import re
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+COMPACT_THRESHOLD = 64
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def encode_postings(ids):
+    encoded = array('I')
+    previous = 0
+    for transaction_id in ids:
+        encoded.append(transaction_id - previous)
+        previous = transaction_id
+    return encoded
+
+
+def decode_postings(encoded):
+    return list(accumulate(encoded))
+
+
+class DescriptionIndex:
+    def __init__(self, keep_rows=True):
+        self.keep_rows = keep_rows
+        self.postings = {}
+        self.last_ids = {}
+        self.pending = {}
+        self.removed = {}
+        self.rows = {}
+        self.vocabulary = []
+        self.vocabulary_dirty = False
+
+    def __len__(self):
+        return len(self.postings)
+
+    def add_all(self, transactions_list):
+        keyed = [(transaction_key(transaction), transaction) for transaction in transactions_list]
+        for _, transaction in sorted((item for item in keyed if item[0] is not None), key=lambda item: item[0]):
+            self.add(transaction)
+        self.compact()
+
+    def add(self, transaction):
+        transaction_id = transaction_key(transaction)
+        if transaction_id is None:
+            return
+        if self.keep_rows:
+            self.rows[transaction_id] = transaction
+
+        for token in set(tokenize(transaction.get('description', ''))):
+            removed = self.removed.get(token)
+            if removed and transaction_id in removed:
+                removed.discard(transaction_id)
+                continue
+
+            encoded = self.postings.get(token)
+            if encoded is None:
+                self.postings[token] = array('I', [transaction_id])
+                self.last_ids[token] = transaction_id
+                self.vocabulary_dirty = True
+            elif transaction_id > self.last_ids[token]:
+                encoded.append(transaction_id - self.last_ids[token])
+                self.last_ids[token] = transaction_id
+            else:
+                self.pending.setdefault(token, set()).add(transaction_id)
+                self.maybe_compact(token)
+
+    def remove(self, transaction, description=None):
+        transaction_id = transaction_key(transaction)
+        if transaction_id is None:
+            return
+        if description is None:
+            description = transaction.get('description', '')
+        self.rows.pop(transaction_id, None)
+
+        for token in set(tokenize(description)):
+            if token not in self.postings:
+                continue
+            pending = self.pending.get(token)
+            if pending and transaction_id in pending:
+                pending.discard(transaction_id)
+                continue
+            self.removed.setdefault(token, set()).add(transaction_id)
+            self.maybe_compact(token)
+
+    def update(self, transaction, old_description):
+        self.remove(transaction, old_description)
+        self.add(transaction)
+
+    def maybe_compact(self, token):
+        changes = len(self.pending.get(token, ())) + len(self.removed.get(token, ()))
+        if changes >= COMPACT_THRESHOLD:
+            self.compact_token(token)
+
+    def compact_token(self, token):
+        ids = self.lookup(token)
+        self.pending.pop(token, None)
+        self.removed.pop(token, None)
+        if ids:
+            self.postings[token] = encode_postings(ids)
+            self.last_ids[token] = ids[-1]
+        else:
+            del self.postings[token]
+            del self.last_ids[token]
+            self.vocabulary_dirty = True
+
+    def compact(self):
+        for token in list(set(self.pending) | set(self.removed)):
+            if token in self.postings:
+                self.compact_token(token)
+
+    def lookup(self, token):
+        encoded = self.postings.get(token)
+        if encoded is None:
+            return []
+        ids = decode_postings(encoded)
+        removed = self.removed.get(token)
+        if removed:
+            ids = [transaction_id for transaction_id in ids if transaction_id not in removed]
+        pending = self.pending.get(token)
+        if pending:
+            ids = sorted(set(ids).union(pending))
+        return ids
+
+    def lookup_prefix(self, prefix):
+        if self.vocabulary_dirty:
+            self.vocabulary = sorted(self.postings)
+            self.vocabulary_dirty = False
+        matches = set()
+        position = bisect_left(self.vocabulary, prefix)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(prefix):
+            matches.update(self.lookup(self.vocabulary[position]))
+            position += 1
+        return sorted(matches)
+
+    def lookup_term(self, term):
+        if term.endswith('*'):
+            prefix = term[:-1].lower()
+            return self.lookup_prefix(prefix) if prefix else []
+        tokens = tokenize(term)
+        if not tokens:
+            return []
+        return intersect_all([self.lookup(token) for token in tokens])
+
+    def search_ids(self, query):
+        results = set()
+        for group in re.split(r"\s+OR\s+", query.strip()):
+            terms = [term for term in group.split() if term != 'AND']
+            if not terms:
+                continue
+            results.update(intersect_all([self.lookup_term(term) for term in terms]))
+        return sorted(results)
+
+    def search(self, query):
+        ids = self.search_ids(query)
+        if not self.keep_rows:
+            return ids
+        return [self.rows[transaction_id] for transaction_id in ids if transaction_id in self.rows]
+
+    def memory_bytes(self):
+        return sum(encoded.itemsize * len(encoded) for encoded in self.postings.values())
+
+
+def transaction_key(transaction):
+    try:
+        return int(transaction.get('transaction_id'))
+    except (ValueError, TypeError):
+        return None
+
+
+def intersect_all(lists):
+    if not lists:
+        return []
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for other in lists[1:]:
+        if not result:
+            break
+        other_set = set(other)
+        result = [transaction_id for transaction_id in result if transaction_id in other_set]
+    return result
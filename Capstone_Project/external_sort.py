@@ -0,0 +1,147 @@
+import argparse
+import csv
+import heapq
+import os
+import pickle
+import tempfile
+
+import personal_finance_lib8
+from personal_finance_lib8 import STREAMING_FIELDS, format_transaction_for_file, log_error
+
+DEFAULT_RUN_SIZE = 100000
+DEFAULT_MAX_OPEN_RUNS = 64
+SORT_KEYS = ['transaction_id', 'date', 'customer_id', 'amount', 'type', 'description']
+
+
+def natural_value(value):
+    text = str(value).strip()
+    try:
+        return (0, int(text), '')
+    except ValueError:
+        return (1, 0, text)
+
+
+def make_sort_key(keys):
+    getters = []
+    for key in keys:
+        if key not in SORT_KEYS:
+            raise ValueError(f"Cannot sort by '{key}'. Choose from: {', '.join(SORT_KEYS)}.")
+        if key == 'amount':
+            getters.append(lambda transaction: float(transaction.get('amount', 0)))
+        elif key in ('transaction_id', 'customer_id'):
+            getters.append(lambda transaction, key=key: natural_value(transaction.get(key, '')))
+        else:
+            getters.append(lambda transaction, key=key: str(transaction.get(key, '')))
+
+    def sort_key(transaction):
+        return tuple(getter(transaction) for getter in getters)
+    return sort_key
+
+
+def write_run(transactions, sort_key, reverse, temp_dir):
+    transactions.sort(key=sort_key, reverse=reverse)
+    handle, run_filename = tempfile.mkstemp(suffix='.run', dir=temp_dir)
+    with os.fdopen(handle, 'wb') as f:
+        for transaction in transactions:
+            pickle.dump(transaction, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return run_filename
+
+
+def read_run(run_filename):
+    with open(run_filename, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def merge_runs(run_filenames, sort_key, reverse):
+    return heapq.merge(*(read_run(run_filename) for run_filename in run_filenames), key=sort_key, reverse=reverse)
+
+
+def reduce_runs(run_filenames, sort_key, reverse, temp_dir, max_open_runs):
+    while len(run_filenames) > max_open_runs:
+        next_runs = []
+        for start in range(0, len(run_filenames), max_open_runs):
+            group = run_filenames[start:start + max_open_runs]
+            handle, merged_filename = tempfile.mkstemp(suffix='.run', dir=temp_dir)
+            with os.fdopen(handle, 'wb') as f:
+                for transaction in merge_runs(group, sort_key, reverse):
+                    pickle.dump(transaction, f, protocol=pickle.HIGHEST_PROTOCOL)
+            for run_filename in group:
+                os.remove(run_filename)
+            next_runs.append(merged_filename)
+        run_filenames = next_runs
+    return run_filenames
+
+
+def iter_sorted(transactions, keys=('date',), reverse=False, run_size=DEFAULT_RUN_SIZE, max_open_runs=DEFAULT_MAX_OPEN_RUNS, temp_dir=None):
+    sort_key = make_sort_key(keys)
+    with tempfile.TemporaryDirectory(prefix='pf_sort_', dir=temp_dir) as run_dir:
+        run_filenames = []
+        buffer = []
+        for transaction in transactions:
+            buffer.append(transaction)
+            if len(buffer) >= run_size:
+                run_filenames.append(write_run(buffer, sort_key, reverse, run_dir))
+                buffer = []
+
+        if not run_filenames:
+            buffer.sort(key=sort_key, reverse=reverse)
+            yield from buffer
+            return
+
+        if buffer:
+            run_filenames.append(write_run(buffer, sort_key, reverse, run_dir))
+            buffer = []
+
+        run_filenames = reduce_runs(run_filenames, sort_key, reverse, run_dir, max_open_runs)
+        yield from merge_runs(run_filenames, sort_key, reverse)
+
+
+def write_transactions_csv(transactions, output_filename):
+    count = 0
+    with open(output_filename, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=STREAMING_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for transaction in transactions:
+            writer.writerow(format_transaction_for_file(transaction))
+            count += 1
+    return count
+
+
+def sort_transactions_file(input_filename, output_filename, keys=('date',), reverse=False, run_size=DEFAULT_RUN_SIZE, max_open_runs=DEFAULT_MAX_OPEN_RUNS, temp_dir=None):
+    try:
+        transactions = personal_finance_lib8.iter_transactions(input_filename)
+        sorted_transactions = iter_sorted(transactions, keys, reverse, run_size, max_open_runs, temp_dir)
+        count = write_transactions_csv(sorted_transactions, output_filename)
+    except FileNotFoundError:
+        print(f"Error: The file '{input_filename}' was not found.")
+        log_error(f"Error: The file '{input_filename}' was not found during sorting.")
+        return 0
+    except (IOError, ValueError) as e:
+        print(f"Error sorting '{input_filename}' into '{output_filename}': {e}")
+        log_error(f"Error sorting '{input_filename}' into '{output_filename}': {e}")
+        return 0
+
+    print(f"Sorted {count} transactions by {', '.join(keys)} into '{output_filename}'.")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sort a transactions CSV file that may be larger than memory.")
+    parser.add_argument('input', help="CSV file to sort")
+    parser.add_argument('output', help="CSV file to write the sorted transactions to")
+    parser.add_argument('--keys', default='date', help="comma separated sort keys, e.g. date,customer_id,amount")
+    parser.add_argument('--reverse', action='store_true', help="sort in descending order")
+    parser.add_argument('--run-size', type=int, default=DEFAULT_RUN_SIZE, help="transactions held in memory per sorted run")
+    parser.add_argument('--temp-dir', default=None, help="directory for temporary run files")
+    args = parser.parse_args()
+
+    keys = [key.strip() for key in args.keys.split(',') if key.strip()]
+    sort_transactions_file(args.input, args.output, keys, args.reverse, args.run_size, temp_dir=args.temp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,369 @@
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+import personal_finance_lib8
+from personal_finance_lib8 import log_error
+from transaction_record import VALID_TYPES
+from transaction_stats import IncrementalSummary
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+STATUS_TEXT = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ReadWriteLock:
+    def __init__(self):
+        self.readers = 0
+        self.writer = False
+        self.waiting_writers = 0
+        self.condition = asyncio.Condition()
+
+    async def acquire_read(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: not self.writer and self.waiting_writers == 0)
+            self.readers += 1
+
+    async def release_read(self):
+        async with self.condition:
+            self.readers -= 1
+            if self.readers == 0:
+                self.condition.notify_all()
+
+    async def acquire_write(self):
+        async with self.condition:
+            self.waiting_writers += 1
+            try:
+                await self.condition.wait_for(lambda: not self.writer and self.readers == 0)
+            finally:
+                self.waiting_writers -= 1
+            self.writer = True
+
+    async def release_write(self):
+        async with self.condition:
+            self.writer = False
+            self.condition.notify_all()
+
+    def read(self):
+        return LockContext(self.acquire_read, self.release_read)
+
+    def write(self):
+        return LockContext(self.acquire_write, self.release_write)
+
+
+class LockContext:
+    def __init__(self, acquire, release):
+        self.acquire = acquire
+        self.release = release
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.release()
+
+
+class TransactionBook:
+    def __init__(self):
+        self.transactions = {}
+        self.summary = IncrementalSummary()
+        self.max_id = 0
+        self.lock = ReadWriteLock()
+
+    def replace_all(self, transactions_list):
+        self.transactions = {}
+        self.summary = IncrementalSummary()
+        self.max_id = 0
+        for transaction in transactions_list:
+            self.insert(transaction)
+
+    def insert(self, transaction):
+        transaction_id = str(transaction['transaction_id'])
+        previous = self.transactions.get(transaction_id)
+        if previous is not None:
+            self.summary.apply(previous, -1)
+        self.transactions[transaction_id] = transaction
+        self.summary.apply(transaction)
+        try:
+            self.max_id = max(self.max_id, int(transaction_id))
+        except ValueError:
+            pass
+
+    def get(self, transaction_id):
+        transaction = self.transactions.get(str(transaction_id))
+        if transaction is None:
+            raise HTTPError(404, f"Transaction with ID {transaction_id} not found.")
+        return transaction
+
+    def query(self, customer_id=None, transaction_type=None, start_date=None, end_date=None, offset=0, limit=100):
+        results = []
+        skipped = 0
+        for transaction in self.transactions.values():
+            if customer_id and transaction.get('customer_id') != customer_id:
+                continue
+            if transaction_type and transaction.get('type') != transaction_type:
+                continue
+            if start_date and transaction.get('date', '') < start_date:
+                continue
+            if end_date and transaction.get('date', '') > end_date:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            results.append(transaction)
+            if len(results) >= limit:
+                break
+        return results
+
+    def add(self, data):
+        transaction = {
+            'transaction_id': str(self.max_id + 1),
+            'date': parse_date(data.get('date')),
+            'customer_id': require_text(data, 'customer_id', "Customer ID cannot be empty."),
+            'amount': parse_amount(data.get('amount')),
+            'type': parse_type(data.get('type')),
+            'description': require_text(data, 'description', "Description cannot be empty.")
+        }
+        if transaction['type'] == 'debit':
+            transaction['amount'] = transaction['amount'] * -1
+        self.insert(transaction)
+        return transaction
+
+    def update(self, transaction_id, data):
+        transaction = self.get(transaction_id)
+        updated = dict(transaction)
+        if 'description' in data:
+            updated['description'] = str(data['description']).strip()
+        if 'type' in data:
+            new_type = parse_type(data['type'])
+            current_amount = float(updated.get('amount', 0))
+            if new_type == 'debit' and updated.get('type') != 'debit':
+                updated['amount'] = abs(current_amount) * -1
+            elif new_type != 'debit' and updated.get('type') == 'debit':
+                updated['amount'] = abs(current_amount)
+            updated['type'] = new_type
+        if 'amount' in data:
+            new_amount = parse_amount(data['amount'])
+            updated['amount'] = new_amount * -1 if updated.get('type') == 'debit' else new_amount
+
+        self.summary.apply(transaction, -1)
+        transaction.update(updated)
+        self.summary.apply(transaction)
+        return transaction
+
+    def delete(self, transaction_id):
+        transaction = self.get(transaction_id)
+        del self.transactions[str(transaction_id)]
+        self.summary.apply(transaction, -1)
+        return transaction
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(str(value).strip(), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except (ValueError, TypeError):
+        raise HTTPError(400, "Invalid date format. Please use YYYY-MM-DD.")
+
+
+def parse_amount(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        raise HTTPError(400, "Invalid amount. Please enter a numerical value.")
+
+
+def parse_type(value):
+    transaction_type = str(value or '').strip().lower()
+    if transaction_type not in VALID_TYPES:
+        raise HTTPError(400, "Invalid type. Please enter 'credit', 'debit', or 'transfer'.")
+    return transaction_type
+
+
+def require_text(data, key, message):
+    value = str(data.get(key) or '').strip()
+    if not value:
+        raise HTTPError(400, message)
+    return value
+
+
+def resolve_data_file(data_dir, filename):
+    filename = str(filename or '').strip()
+    parts = filename.replace('\\', '/').split('/')
+    if not filename or os.path.isabs(filename) or os.path.splitdrive(filename)[0] or '..' in parts:
+        raise HTTPError(400, "Filename must be a relative path inside the data directory.")
+    path = os.path.realpath(os.path.join(data_dir, filename))
+    if os.path.commonpath([path, data_dir]) != data_dir:
+        raise HTTPError(400, "Filename must be a relative path inside the data directory.")
+    return path
+
+
+class FinanceService:
+    def __init__(self, book=None, data_dir='.'):
+        self.book = book or TransactionBook()
+        self.data_dir = os.path.realpath(data_dir)
+        self.server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError):
+                    break
+                if not request_line:
+                    break
+
+                keep_alive = True
+                try:
+                    method, target, version = request_line.decode('latin-1').strip().split(' ', 2)
+                    headers = await read_headers(reader)
+                    keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                    body = await read_body(reader, headers)
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': e.message}
+                except ValueError:
+                    status, payload = 400, {'error': "Malformed request."}
+                except Exception as e:
+                    log_error(f"An unexpected error occurred in the finance service: {e}")
+                    status, payload = 500, {'error': str(e)}
+
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        parts = [part for part in url.path.split('/') if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        data = json.loads(body) if body else {}
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Request body must be a JSON object.")
+
+        if parts == ['load'] and method == 'POST':
+            return await self.load(data)
+        if parts == ['analyze'] and method == 'GET':
+            async with self.book.lock.read():
+                return 200, self.book.summary.to_dict()
+        if parts == ['report'] and method == 'POST':
+            return await self.report(data)
+        if parts == ['transactions'] and method == 'GET':
+            async with self.book.lock.read():
+                results = self.book.query(query.get('customer_id'), query.get('type'), query.get('start_date'), query.get('end_date'), int(query.get('offset', 0)), int(query.get('limit', 100)))
+                return 200, {'transactions': results, 'count': len(results)}
+        if parts == ['transactions'] and method == 'POST':
+            async with self.book.lock.write():
+                return 201, self.book.add(data)
+        if len(parts) == 2 and parts[0] == 'transactions':
+            if method == 'GET':
+                async with self.book.lock.read():
+                    return 200, self.book.get(parts[1])
+            if method in ('PUT', 'PATCH'):
+                async with self.book.lock.write():
+                    return 200, self.book.update(parts[1], data)
+            if method == 'DELETE':
+                async with self.book.lock.write():
+                    return 200, self.book.delete(parts[1])
+            raise HTTPError(405, f"Method {method} not allowed.")
+        raise HTTPError(404, f"No route for {method} {url.path}.")
+
+    async def load(self, data):
+        filename = data.get('filename', 'financial_transactions_short.csv')
+        return await self.load_file(resolve_data_file(self.data_dir, filename))
+
+    async def load_file(self, filename):
+        transactions_list = await asyncio.to_thread(personal_finance_lib8.load_transactions, filename)
+        async with self.book.lock.write():
+            self.book.replace_all(transactions_list)
+            return 200, {'loaded': len(transactions_list), 'summary': self.book.summary.to_dict()}
+
+    async def report(self, data):
+        filename = data.get('filename', 'report.txt')
+        path = resolve_data_file(self.data_dir, filename)
+        async with self.book.lock.read():
+            transactions_list = list(self.book.transactions.values())
+            await asyncio.to_thread(personal_finance_lib8.generate_report, transactions_list, path)
+        return 200, {'report': filename, 'transactions': len(transactions_list)}
+
+
+async def read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+async def read_body(reader, headers):
+    length = int(headers.get('content-length', 0) or 0)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "Request body too large.")
+    if length <= 0:
+        return b''
+    return await reader.readexactly(length)
+
+
+def encode_response(status, payload, keep_alive=True):
+    body = json.dumps(payload).encode('utf-8')
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode('latin-1') + body
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, filename=None, data_dir='.'):
+    service = FinanceService(data_dir=data_dir)
+    if filename:
+        await service.load_file(filename)
+    port = await service.start(host, port)
+    print(f"Smart Personal Finance Analyzer service listening on http://{host}:{port}")
+    async with service.server:
+        await service.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the finance analyzer over HTTP/JSON on localhost.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--load', default=None, help="transactions CSV file to load at startup")
+    parser.add_argument('--data-dir', default='.', help="directory that /load and /report filenames are relative to")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.load, args.data_dir))
+    except KeyboardInterrupt:
+        print("Service stopped.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import csv
+from bisect import bisect_right, insort
+
+DEFAULT_REPORTING_CURRENCY = 'USD'
+
+
+class FXRates:
+    def __init__(self, reporting_currency=DEFAULT_REPORTING_CURRENCY):
+        self.reporting_currency = reporting_currency.upper()
+        self.dates = {}
+        self.rates = {}
+        self.cache = {}
+
+    @classmethod
+    def load(cls, filename, reporting_currency=DEFAULT_REPORTING_CURRENCY):
+        fx_rates = cls(reporting_currency)
+        rows = []
+        with open(filename, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                rows.append((row['currency'].strip().upper(), row['date'].strip(), float(row['rate'])))
+
+        # Only currency and date are sorted on, so a rate listed again later
+        # in the file replaces the earlier one for that day.
+        rows.sort(key=lambda row: row[:2])
+        for currency, date, rate in rows:
+            dates = fx_rates.dates.setdefault(currency, [])
+            rates = fx_rates.rates.setdefault(currency, [])
+            if dates and dates[-1] == date:
+                rates[-1] = rate
+                continue
+            dates.append(date)
+            rates.append(rate)
+        return fx_rates
+
+    def add_rate(self, currency, date, rate):
+        currency = currency.upper()
+        dates = self.dates.setdefault(currency, [])
+        rates = self.rates.setdefault(currency, [])
+        position = bisect_right(dates, date)
+        if position and dates[position - 1] == date:
+            rates[position - 1] = rate
+        else:
+            insort(dates, date)
+            rates.insert(position, rate)
+        self.cache = {}
+
+    def rate(self, currency, date):
+        key = (currency, date)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        code = (currency or self.reporting_currency).strip().upper()
+        if code == self.reporting_currency:
+            value = 1.0
+        else:
+            dates = self.dates.get(code)
+            if not dates:
+                raise LookupError(f"No FX rates loaded for currency '{code}'.")
+            position = bisect_right(dates, str(date)) - 1
+            if position < 0:
+                raise LookupError(f"No FX rate for '{code}' on or before {date}.")
+            value = self.rates[code][position]
+
+        self.cache[key] = value
+        return value
+
+    def convert(self, amount, currency, date):
+        return amount * self.rate(currency, date)
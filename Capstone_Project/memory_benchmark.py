@@ -0,0 +1,57 @@
+import argparse
+import csv
+import gc
+import os
+import random
+import time
+
+import personal_finance_lib8
+from transaction_record import deep_size
+
+DEFAULT_ROWS = 5000000
+WORDS = "expect series shake art again our each left similar likely coach take direction wife job pull determine leader move college".split()
+
+
+def write_sample_file(filename, rows, customers=50000, seed=42):
+    generator = random.Random(seed)
+    descriptions = [" ".join(generator.sample(WORDS, 5)).capitalize() + "." for _ in range(2000)]
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(personal_finance_lib8.TRANSACTION_FIELDS)
+        for transaction_id in range(1, rows + 1):
+            writer.writerow([
+                transaction_id,
+                f"{generator.randint(2019, 2024)}-{generator.randint(1, 12):02d}-{generator.randint(1, 28):02d}",
+                generator.randint(1, customers),
+                f"{generator.uniform(1, 10000):.2f}",
+                generator.choice(("credit", "debit", "transfer")),
+                generator.choice(descriptions)
+            ])
+
+
+def measure(filename, compact):
+    gc.collect()
+    start = time.perf_counter()
+    transactions = list(personal_finance_lib8.iter_transactions(filename, compact=compact))
+    elapsed = time.perf_counter() - start
+    total_bytes = deep_size(transactions)
+    return len(transactions), total_bytes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare bytes per transaction for dict rows and compact Transaction rows.")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS)
+    parser.add_argument('--file', default='memory_benchmark.csv', help="sample file to create (kept if it already exists)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"Writing {args.rows} sample transactions to '{args.file}'...")
+        write_sample_file(args.file, args.rows)
+
+    for label, compact in (("dict rows", False), ("compact rows", True)):
+        count, total_bytes, elapsed = measure(args.file, compact)
+        print(f"{label:<13}: {count} transactions, {total_bytes / 1024 / 1024:.1f} MiB, {total_bytes / max(count, 1):.1f} bytes/transaction, loaded in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+import argparse
+import csv
+import json
+import os
+
+import personal_finance_lib8
+from personal_finance_lib8 import STREAMING_FIELDS, format_transaction_for_write, log_error
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def partition_key(transaction):
+    return str(transaction.get('date', ''))[:7]
+
+
+def partition_path(partition):
+    year = partition[:4]
+    return os.path.join(year, f"{partition}.csv")
+
+
+def partition_fieldnames(filename, is_new):
+    if is_new:
+        return STREAMING_FIELDS
+    with open(filename, 'r', newline='', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        header = reader.fieldnames or []
+        if all(field in header for field in STREAMING_FIELDS):
+            return header
+        rows = list(reader)
+
+    # Partitions written before a column existed are rewritten once with
+    # the full header, so appended values are not dropped.
+    header = header + [field for field in STREAMING_FIELDS if field not in header]
+    with open(filename, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=header)
+        writer.writeheader()
+        writer.writerows(rows)
+    return header
+
+
+def read_manifest(directory):
+    manifest_filename = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(manifest_filename):
+        return {'partitions': {}}
+    with open(manifest_filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_manifest(directory, manifest):
+    manifest_filename = os.path.join(directory, MANIFEST_FILE)
+    temp_filename = manifest_filename + '.tmp'
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_filename, manifest_filename)
+
+
+def write_partitioned(transactions, directory, append=False):
+    os.makedirs(directory, exist_ok=True)
+    manifest = read_manifest(directory)
+    if not append:
+        for entry in manifest['partitions'].values():
+            stale_filename = os.path.join(directory, entry['file'])
+            if os.path.exists(stale_filename):
+                os.remove(stale_filename)
+        manifest = {'partitions': {}}
+    partitions = manifest['partitions']
+
+    files = {}
+    writers = {}
+    touched = set()
+    count = 0
+    try:
+        for transaction in transactions:
+            partition = partition_key(transaction)
+            if len(partition) != 7:
+                log_error(f"Skipping transaction {transaction.get('transaction_id', 'N/A')} with no usable date for partitioning.")
+                continue
+
+            writer = writers.get(partition)
+            if writer is None:
+                relative_filename = partition_path(partition)
+                filename = os.path.join(directory, relative_filename)
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
+                is_new = partition not in partitions or not os.path.exists(filename)
+                file = open(filename, 'a' if append and not is_new else 'w', newline='', encoding='utf-8')
+                writer = csv.DictWriter(file, fieldnames=partition_fieldnames(filename, is_new), extrasaction='ignore')
+                if is_new:
+                    writer.writeheader()
+                    partitions[partition] = {'file': relative_filename, 'rows': 0, 'min_date': None, 'max_date': None}
+                files[partition] = file
+                writers[partition] = writer
+
+            writer.writerow(format_transaction_for_write(transaction))
+            entry = partitions[partition]
+            entry['rows'] += 1
+            date = transaction['date']
+            if entry['min_date'] is None or date < entry['min_date']:
+                entry['min_date'] = date
+            if entry['max_date'] is None or date > entry['max_date']:
+                entry['max_date'] = date
+            touched.add(partition)
+            count += 1
+    finally:
+        for file in files.values():
+            file.close()
+        write_manifest(directory, manifest)
+
+    print(f"Wrote {count} transactions to {len(touched)} partition(s) in '{directory}'.")
+    return count
+
+
+def append_partitioned(transactions, directory):
+    return write_partitioned(transactions, directory, append=True)
+
+
+def partition_from_csv(filename, directory, append=False):
+    try:
+        return write_partitioned(personal_finance_lib8.iter_transactions(filename), directory, append)
+    except FileNotFoundError:
+        print(f"Error: The file '{filename}' was not found.")
+        log_error(f"Error: The file '{filename}' was not found during partitioning.")
+        return 0
+
+
+def matching_partitions(directory, start_date=None, end_date=None):
+    manifest = read_manifest(directory)
+    selected = []
+    for partition, entry in sorted(manifest['partitions'].items()):
+        if entry['rows'] == 0:
+            continue
+        if start_date and entry['max_date'] < start_date:
+            continue
+        if end_date and entry['min_date'] > end_date:
+            continue
+        selected.append((partition, entry))
+    return selected
+
+
+def iter_partitioned(directory, start_date=None, end_date=None):
+    for partition, entry in matching_partitions(directory, start_date, end_date):
+        fully_inside = (not start_date or entry['min_date'] >= start_date) and (not end_date or entry['max_date'] <= end_date)
+        with open(os.path.join(directory, entry['file']), 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                if not fully_inside:
+                    if start_date and row['date'] < start_date:
+                        continue
+                    if end_date and row['date'] > end_date:
+                        continue
+                try:
+                    row['amount'] = float(row['amount'])
+                except (ValueError, TypeError):
+                    log_error(f"Error: Could not convert amount '{row.get('amount')}' to float in transaction {row.get('transaction_id', 'N/A')} from partition {partition}.")
+                    continue
+                yield row
+
+
+def load_partitioned(directory, start_date=None, end_date=None):
+    selected = matching_partitions(directory, start_date, end_date)
+    transactions = list(iter_partitioned(directory, start_date, end_date))
+    print(f"Loaded {len(transactions)} transactions from {len(selected)} partition(s) in '{directory}'.")
+    return transactions
+
+
+def analyze_partitioned(directory, start_date=None, end_date=None, return_data=True):
+    return personal_finance_lib8.analyze_transactions(iter_partitioned(directory, start_date, end_date), return_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store transactions in per-month partition files.")
+    parser.add_argument('command', choices=['split', 'append'], help="split rewrites the partitions, append adds a new feed")
+    parser.add_argument('input', help="transactions CSV file")
+    parser.add_argument('directory', help="partitioned storage directory")
+    args = parser.parse_args()
+
+    partition_from_csv(args.input, args.directory, append=args.command == 'append')
+
+
+if __name__ == '__main__':
+    main()
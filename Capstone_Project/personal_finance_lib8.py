@@ -1,8 +1,24 @@
 import csv 
-from datetime import datetime
+from datetime import date, datetime, timedelta
+import heapq
 import os
+import statistics
+import string
+
+from transaction_record import VALID_TYPES, LazyTransaction, StringInterner, Transaction, parse_transaction_date, signed_amount
+from rollups import Rollups, rollup_filename
+from transaction_stats import TransactionStats
+from xlsx_io import XLSXWriter, is_xlsx, iter_xlsx_rows
 
 ERROR_LOG_FILE = 'errors.txt'
+DESCRIPTION_CLEANUP_TABLE = str.maketrans({char: ' ' for char in string.punctuation + string.digits})
+RECURRING_FREQUENCIES = [('Weekly', 7), ('Biweekly', 14), ('Monthly', 30), ('Quarterly', 91), ('Yearly', 365)]
+TRANSACTION_FIELDS = ['transaction_id', 'date', 'customer_id', 'amount', 'type', 'description']
+OPTIONAL_FIELDS = ['currency']
+# Writers that stream rows cannot look ahead for optional fields, so they
+# always write every column.
+STREAMING_FIELDS = TRANSACTION_FIELDS + OPTIONAL_FIELDS
+LAZY_REQUIRED_FIELDS = ('transaction_id', 'date', 'type')
 
 def initialize_error_log():
     try:
@@ -19,16 +35,160 @@ def log_error(message):
     except IOError as e:
         print(f"Failed to write to error log file '{ERROR_LOG_FILE}': {e}")
 
-def load_transactions(filename='financial_transactions_short.csv'):
+def process_transaction_row(row):
+    current_item = row.copy()
+
+    date_str = (current_item.get('date') or '').strip()
+    parsed_date = parse_transaction_date(date_str)
+
+    if parsed_date:
+        current_item['date'] = parsed_date
+    else:
+        print(f"DEBUG: Skipping transaction ID {current_item.get('transaction_id', 'N/A')} due to invalid date. Actual date value: '{date_str}'")
+        log_error(f"Skipping transaction {current_item.get('transaction_id', 'N/A')}. Invalid date format '{date_str}'.")
+        return None
+
+    amount_str = ''
+    try:
+        amount_str = (current_item.get('amount') or '').strip()
+        if not amount_str:
+            new_amount = 0.0
+            print(f"Warning: Empty amount found for transaction {current_item.get('transaction_id', 'N/A')}. Setting to 0.0.")
+        else:
+            new_amount = float(amount_str)
+
+        transaction_type = (current_item.get('type') or '').lower().strip()
+        if transaction_type == "debit":
+            current_item['amount'] = new_amount * -1
+        elif transaction_type == "credit" or transaction_type == "transfer":
+            current_item['amount'] = new_amount
+        else:
+            print(f"DEBUG: Skipping transaction ID {current_item.get('transaction_id', 'N/A')} due to invalid type. Actual type value: '{transaction_type}'")
+            log_error(f"Skipping transaction {current_item.get('transaction_id', 'N/A')}. Invalid or empty type '{transaction_type}'.")
+            return None
+
+        return current_item
+    except ValueError:
+        log_error(f"Error: Could not convert amount '{amount_str}' to float in transaction {current_item.get('transaction_id', 'N/A')}.")
+        return None
+    except Exception as e:
+        log_error(f"An unexpected error occurred processing transaction {current_item.get('transaction_id', 'N/A')}: {e}")
+        return None
+
+def read_column(values, layout, column):
+    position = layout.get(column)
+    if position is None or position >= len(values):
+        return ''
+    return values[position]
+
+def check_projected_row(values, positions):
+    # The same checks, in the same order and with the same messages, as
+    # process_transaction_row, so a projected or lazy load logs exactly
+    # what a full load would.
+    transaction_id = read_column(values, positions, 'transaction_id') if 'transaction_id' in positions else 'N/A'
+    date_str = read_column(values, positions, 'date').strip()
+    parsed_date = parse_transaction_date(date_str)
+    if parsed_date is None:
+        print(f"DEBUG: Skipping transaction ID {transaction_id} due to invalid date. Actual date value: '{date_str}'")
+        log_error(f"Skipping transaction {transaction_id}. Invalid date format '{date_str}'.")
+        return None
+
+    amount_str = read_column(values, positions, 'amount').strip()
+    if not amount_str:
+        print(f"Warning: Empty amount found for transaction {transaction_id}. Setting to 0.0.")
+    transaction_type = read_column(values, positions, 'type').lower().strip()
+    try:
+        amount = signed_amount(amount_str, transaction_type)
+    except ValueError:
+        log_error(f"Error: Could not convert amount '{amount_str}' to float in transaction {transaction_id}.")
+        return None
+
+    if transaction_type not in VALID_TYPES:
+        print(f"DEBUG: Skipping transaction ID {transaction_id} due to invalid type. Actual type value: '{transaction_type}'")
+        log_error(f"Skipping transaction {transaction_id}. Invalid or empty type '{transaction_type}'.")
+        return None
+    return parsed_date, amount, transaction_type
+
+def iter_projected_transactions(filename='financial_transactions_short.csv', columns=None, lazy=False):
+    with open(filename, 'r', newline='') as file:
+        csv_reader = csv.reader(file)
+        header = next(csv_reader, None)
+        if header is None:
+            return
+        positions = {name: position for position, name in enumerate(header)}
+        columns = list(columns) if columns is not None else list(header)
+        if lazy:
+            # Rows are validated on the ID, date and type even when only other
+            # columns are projected, so those stay readable on every row.
+            layout = {column: positions[column] for column in header if column in columns or column in LAZY_REQUIRED_FIELDS}
+
+        for values in csv_reader:
+            if not values:
+                continue
+            checked = check_projected_row(values, positions)
+            if checked is None:
+                continue
+            parsed_date, amount, transaction_type = checked
+
+            if lazy:
+                current_item = LazyTransaction(layout, values, transaction_type)
+                current_item['date'] = parsed_date
+                if 'amount' in layout:
+                    current_item['amount'] = amount
+                yield current_item
+                continue
+
+            current_item = {}
+            for column in columns:
+                if column == 'date':
+                    current_item['date'] = parsed_date
+                elif column == 'amount':
+                    current_item['amount'] = amount
+                elif column == 'type':
+                    current_item['type'] = transaction_type
+                else:
+                    current_item[column] = read_column(values, positions, column)
+            yield current_item
+
+def iter_transactions(filename='financial_transactions_short.csv', compact=False, columns=None, lazy=False):
+    if is_xlsx(filename):
+        yield from iter_rows_as_transactions(iter_xlsx_rows(filename), compact)
+        return
+    if columns is not None or lazy:
+        yield from iter_projected_transactions(filename, columns, lazy)
+        return
+
+    with open(filename, 'r', newline='') as file:
+        yield from iter_rows_as_transactions(csv.DictReader(file), compact)
+
+def iter_rows_as_transactions(rows, compact=False):
+    interner = StringInterner() if compact else None
+    for row in rows:
+        current_item = process_transaction_row(row)
+        if current_item is None:
+            continue
+        if compact:
+            current_item = Transaction.from_mapping(current_item, interner)
+        yield current_item
+
+def load_transactions(filename='financial_transactions_short.csv', stats=None, sketches=None, compact=False, columns=None, lazy=False, rules=None, rollups=None):
     if not os.path.exists(ERROR_LOG_FILE):
         initialize_error_log()
 
-    loaded_transactions = []
+    processed_transactions = []
     try:
-        with open(filename, 'r', newline='') as file:
-            csv_reader = csv.DictReader(file)
-            for row in csv_reader:
-                loaded_transactions.append(row)
+        for current_item in iter_transactions(filename, compact, columns, lazy):
+            processed_transactions.append(current_item)
+            if stats is not None:
+                flagged = stats.update(current_item)
+                if flagged:
+                    log_error(f"Anomaly: transaction {flagged['transaction_id']} for customer {flagged['customer_id']} has amount {flagged['amount']:.2f} (z-score {flagged['z_score']:.2f}).")
+            if sketches is not None:
+                sketches.update(current_item)
+            if rules is not None:
+                rules.evaluate(current_item)
+            if rollups is not None:
+                rollups.add(current_item)
     except FileNotFoundError:
         print(f"Error: The file '{filename}' was not found.")
         log_error(f"Error: The file '{filename}' was not found during loading.")
@@ -37,57 +197,15 @@ def load_transactions(filename='financial_transactions_short.csv'):
         print(f"An unexpected error occurred while reading '{filename}': {e}")
         log_error(f"An unexpected error occurred while reading '{filename}': {e}")
 
-    processed_transactions = []
-    for item in loaded_transactions:
-        current_item = item.copy()
-
-        date_str = current_item.get('date', '').strip()
-        parsed_date = None
-        date_formats = ["%Y-%m-%d", "%d-%m-%Y", "%m/%d/%Y"]
-        for fmt in date_formats:
-            try:
-                parsed_date = datetime.strptime(date_str, fmt)
-                break
-            except ValueError:
-                continue
-
-        if parsed_date:
-            current_item['date'] = parsed_date.strftime("%Y-%m-%d")
-        else:
-            print(f"DEBUG: Skipping transaction ID {current_item.get('transaction_id', 'N/A')} due to invalid date. Actual date value: '{date_str}'")
-            log_error(f"Skipping transaction {current_item.get('transaction_id', 'N/A')}. Invalid date format '{date_str}'.")
-            continue
-
-        try:
-            amount_str = current_item.get('amount', '').strip()
-            if not amount_str:
-                new_amount = 0.0
-                print(f"Warning: Empty amount found for transaction {current_item.get('transaction_id', 'N/A')}. Setting to 0.0.")
-            else:
-                new_amount = float(amount_str)
-
-            transaction_type = current_item.get('type', '').lower().strip()
-            if transaction_type == "debit":
-                current_item['amount'] = new_amount * -1
-            elif transaction_type == "credit" or transaction_type == "transfer":
-                current_item['amount'] = new_amount
-            else:
-                print(f"DEBUG: Skipping transaction ID {current_item.get('transaction_id', 'N/A')} due to invalid type. Actual type value: '{transaction_type}'")
-                log_error(f"Skipping transaction {current_item.get('transaction_id', 'N/A')}. Invalid or empty type '{transaction_type}'.")
-                continue
-
-            processed_transactions.append(current_item)
-        except ValueError:
-            log_error(f"Error: Could not convert amount '{amount_str}' to float in transaction {current_item.get('transaction_id', 'N/A')}.")
-            continue
-        except Exception as e:
-            log_error(f"An unexpected error occurred processing transaction {current_item.get('transaction_id', 'N/A')}: {e}")
-
     print(f"Successfully loaded and processed {len(processed_transactions)} transactions.")
+    if stats is not None and stats.flagged:
+        print(f"Flagged {len(stats.flagged)} unusual transactions across {len(stats.customers)} customers.")
+    if rules is not None and rules.alerts:
+        print(f"{len(rules.alerts)} budget alerts raised.")
     print(f"Transaction processing complete. Check {ERROR_LOG_FILE} for any logged issues.")
     return processed_transactions
 
-def add_transaction(transactions_list):
+def add_transaction(transactions_list, index=None, rules=None, rollups=None, shared=None):
     print("\n--- Add new Transaction ---")
     max_id = 0
     if transactions_list:
@@ -141,6 +259,15 @@ def add_transaction(transactions_list):
             'description': description
         }
         transactions_list.append(new_transaction)
+        if index is not None:
+            index.add(new_transaction)
+        if rules is not None:
+            for alert in rules.evaluate(new_transaction):
+                print(rules.alert_message(alert))
+        if rollups is not None:
+            rollups.add(new_transaction)
+        if shared is not None:
+            shared.add(new_transaction)
         print(f"\nTransaction added successfully! Details: ")
         for key, value in new_transaction.items():
             print(f"- {key.replace('_', ' ').title()}: {value}")
@@ -194,7 +321,7 @@ def view_transactions(transactions_list):
 
         print(" | ".join(row_values))
 
-def update_transaction(transactions_list):
+def update_transaction(transactions_list, index=None, rollups=None, shared=None):
     print("\n--- Update Transaction ---")
     if not transactions_list:
         print("No transactions to update. Please load or add transactions first.")
@@ -222,6 +349,7 @@ def update_transaction(transactions_list):
         print(f"Transaction with ID {transaction_to_update} not found.")
         return
 
+    previous_transaction = found_transaction.copy()
     print(f"\nTransaction found. Current details for ID {transaction_to_update}: ")
     print(f"1. Description: {found_transaction.get('description', 'N/A')}")
     print(f"2. Type: {found_transaction.get('type', 'N/A')}")
@@ -235,7 +363,10 @@ def update_transaction(transactions_list):
             return
         elif field_choice == '1':
             new_description = input("Enter new description: ").strip()
+            old_description = found_transaction.get('description', '')
             found_transaction['description'] = new_description
+            if index is not None:
+                index.update(found_transaction, old_description)
             print("Description updated successfully.")
             break
         elif field_choice == '2':
@@ -272,6 +403,10 @@ def update_transaction(transactions_list):
             break
         else:
             print("Invalid choice. Please enter 1, 2, 3, or 0 to cancel.")
+    if rollups is not None:
+        rollups.replace(previous_transaction, found_transaction)
+    if shared is not None:
+        shared.replace(previous_transaction, found_transaction)
     print(f"\nUpdated transaction details for ID {transaction_to_update}: ")
     for key, value in found_transaction.items():
         if key == 'amount':
@@ -280,7 +415,7 @@ def update_transaction(transactions_list):
             print(f"- {key.replace('_', ' ').title()}: {value}")
 
 
-def delete_transaction(transactions_list):
+def delete_transaction(transactions_list, index=None, rollups=None, shared=None):
     print("\n--- Delete Transaction ---")
 
     if not transactions_list:
@@ -312,6 +447,12 @@ def delete_transaction(transactions_list):
 
                 if confirm == 'yes':
                     del transactions_list[found_index]
+                    if index is not None:
+                        index.remove(transaction_details)
+                    if rollups is not None:
+                        rollups.remove(transaction_details)
+                    if shared is not None:
+                        shared.remove(transaction_details)
                     print(f"Transaction with ID {transaction_to_delete} deleted successfully.")
 
                 else:
@@ -328,7 +469,32 @@ def delete_transaction(transactions_list):
             log_error(f"An unexpected error occurred during deletion: {e}")
             break
 
-def analyze_transactions(transactions_list, return_data = False):
+def convert_transactions(transactions_list, fx_rates):
+    converted = []
+    rate_cache = fx_rates.cache
+    for transaction in transactions_list:
+        try:
+            amount = float(transaction.get('amount', 0))
+            currency = transaction.get('currency')
+            if currency:
+                rate_key = (currency, transaction.get('date'))
+                rate = rate_cache.get(rate_key)
+                amount *= rate if rate is not None else fx_rates.rate(*rate_key)
+        except (ValueError, TypeError, LookupError) as e:
+            log_error(f"Error processing amount for financial analysis: {transaction.get('transaction_id', 'N/A')}. Error: {e}")
+            continue
+        converted_item = dict(transaction.items())
+        converted_item['amount'] = amount
+        converted_item['currency'] = fx_rates.reporting_currency
+        converted.append(converted_item)
+    return converted
+
+def format_money(amount, currency=None):
+    if currency is None:
+        return f"${amount:.2f}"
+    return f"{amount:.2f} {currency}"
+
+def analyze_transactions(transactions_list, return_data = False, fx_rates=None):
     print("\n--- Financial Summary ---")
     if not transactions_list:
         message = "No transactions to analyze. Please load or add transactions first."
@@ -341,11 +507,20 @@ def analyze_transactions(transactions_list, return_data = False):
     total_transfers = 0.0
     net_balance = 0.0
     totals_by_type = {}
+    rate_cache = fx_rates.cache if fx_rates is not None else None
 
     for transaction in transactions_list:
         try:
             amount = float(transaction.get('amount', 0))
             transaction_type = transaction.get('type', 'unknown').lower()
+            if rate_cache is not None:
+                currency = transaction.get('currency')
+                if currency:
+                    # Rows without a currency are already in the reporting
+                    # currency; the rest read the rate cache before a lookup.
+                    rate_key = (currency, transaction.get('date'))
+                    rate = rate_cache.get(rate_key)
+                    amount *= rate if rate is not None else fx_rates.rate(*rate_key)
 
             if transaction_type == 'credit':
                 total_credits += amount
@@ -360,7 +535,7 @@ def analyze_transactions(transactions_list, return_data = False):
                 totals_by_type[transaction_type] += amount
             else:
                 totals_by_type[transaction_type] = amount
-        except (ValueError, TypeError) as e:
+        except (ValueError, TypeError, LookupError) as e:
             log_error(f"Error processing amount for financial analysis: {transaction.get('transaction_id', 'N/A')}. Error: {e}")
             if not return_data:
                 print(f"Warning: Skipping a transaction due to invalid amount for analysis (ID: {transaction.get('transaction_id', 'N/A')}).")
@@ -373,79 +548,275 @@ def analyze_transactions(transactions_list, return_data = False):
         "net_balance": net_balance,
         "totals_by_type": totals_by_type
     }
+    if fx_rates is not None:
+        summary_data["currency"] = fx_rates.reporting_currency
 
     if return_data:
         return summary_data
     else:
-        print(f"Total Credits: ${total_credits:.2f}")
-        print(f"Total Debits: ${total_debits:.2f}")
-        print(f"Total Transfers: ${total_transfers:.2f}")
-        print(f"Net Balance: ${net_balance:.2f}")
+        currency = fx_rates.reporting_currency if fx_rates is not None else None
+        if currency is not None:
+            print(f"Amounts converted to {currency}.")
+        print(f"Total Credits: {format_money(total_credits, currency)}")
+        print(f"Total Debits: {format_money(total_debits, currency)}")
+        print(f"Total Transfers: {format_money(total_transfers, currency)}")
+        print(f"Net Balance: {format_money(net_balance, currency)}")
 
         print("\nTotals by Type:")
         if totals_by_type:
             for transaction_type, total_amount in totals_by_type.items():
-                print(f"- {transaction_type.replace('_', ' ').title()}: ${total_amount:.2f}")
+                print(f"- {transaction_type.replace('_', ' ').title()}: {format_money(total_amount, currency)}")
         else:
             print("No categorized transactions.")
         return None
 
-def save_transactions(transactions_list, filename='financial_transactions_short.csv'):
-    header = ['transaction_id', 'date', 'customer_id', 'amount', 'type', 'description']
+def transaction_magnitude(transaction):
+    try:
+        return abs(float(transaction.get('amount', 0)))
+    except (ValueError, TypeError):
+        return None
+
+def matches_filters(transaction, transaction_type=None, month=None):
+    if transaction_type and transaction.get('type', '').lower() != transaction_type:
+        return False
+    if month and not str(transaction.get('date', '')).startswith(month):
+        return False
+    return True
+
+def top_transactions(transactions_list, n=10, key=transaction_magnitude, group_by=None, transaction_type=None, month=None, largest=True):
+    if n <= 0:
+        return {} if group_by else []
+
+    sign = 1 if largest else -1
+    heaps = {}
+    for sequence, transaction in enumerate(transactions_list):
+        if not matches_filters(transaction, transaction_type, month):
+            continue
+        value = key(transaction)
+        if value is None:
+            continue
+
+        group = transaction.get(group_by, 'N/A') if group_by else None
+        heap = heaps.get(group)
+        if heap is None:
+            heap = []
+            heaps[group] = heap
+
+        entry = (sign * value, -sequence, transaction)
+        if len(heap) < n:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    results = {}
+    for group, heap in heaps.items():
+        heap.sort(key=lambda entry: entry[:2], reverse=True)
+        results[group] = [entry[2] for entry in heap]
+
+    if group_by:
+        return results
+    return results.get(None, [])
+
+def bottom_transactions(transactions_list, n=10, key=transaction_magnitude, group_by=None, transaction_type=None, month=None):
+    return top_transactions(transactions_list, n, key, group_by, transaction_type, month, largest=False)
+
+def top_customers(transactions_list, n=10, transaction_type='debit', month=None, largest=True):
+    totals = {}
+    for transaction in transactions_list:
+        if not matches_filters(transaction, transaction_type, month):
+            continue
+        value = transaction_magnitude(transaction)
+        if value is None:
+            continue
+        customer_id = transaction.get('customer_id', 'N/A')
+        totals[customer_id] = totals.get(customer_id, 0.0) + value
+
+    if largest:
+        return heapq.nlargest(n, totals.items(), key=lambda item: item[1])
+    return heapq.nsmallest(n, totals.items(), key=lambda item: item[1])
+
+def normalize_description(description):
+    return ' '.join(str(description or '').translate(DESCRIPTION_CLEANUP_TABLE).lower().split())
+
+def classify_interval(interval_days, tolerance):
+    for label, days in RECURRING_FREQUENCIES:
+        if abs(interval_days - days) <= max(1.0, days * tolerance):
+            return label
+    return f"Every {interval_days:.0f} days"
+
+def detect_recurring_transactions(transactions_list, min_occurrences=3, amount_rounding=0, interval_tolerance=0.2):
+    groups = {}
+    for transaction in transactions_list:
+        try:
+            amount = abs(float(transaction.get('amount', 0)))
+            transaction_date = date.fromisoformat(str(transaction.get('date', '')))
+        except (ValueError, TypeError):
+            continue
+        key = (transaction.get('customer_id', 'N/A'), normalize_description(transaction.get('description')), round(amount, amount_rounding))
+        group = groups.get(key)
+        if group is None:
+            group = []
+            groups[key] = group
+        group.append((transaction_date, amount))
+
+    recurring = []
+    for (customer_id, description, rounded_amount), occurrences in groups.items():
+        if len(occurrences) < min_occurrences:
+            continue
+        occurrences.sort()
+        intervals = [(later[0] - earlier[0]).days for earlier, later in zip(occurrences, occurrences[1:])]
+        typical_interval = statistics.median(intervals)
+        if typical_interval < 1:
+            continue
+        allowed = max(1.0, typical_interval * interval_tolerance)
+        regular = sum(1 for interval in intervals if abs(interval - typical_interval) <= allowed)
+        if regular < len(intervals) * (1 - interval_tolerance):
+            continue
+
+        last_date = occurrences[-1][0]
+        recurring.append({
+            'customer_id': customer_id,
+            'description': description,
+            'amount': sum(amount for _, amount in occurrences) / len(occurrences),
+            'occurrences': len(occurrences),
+            'interval_days': typical_interval,
+            'frequency': classify_interval(typical_interval, interval_tolerance),
+            'first_date': occurrences[0][0].isoformat(),
+            'last_date': last_date.isoformat(),
+            'next_expected_date': (last_date + timedelta(days=round(typical_interval))).isoformat()
+        })
+
+    recurring.sort(key=lambda item: (-item['occurrences'], str(item['customer_id'])))
+    return recurring
+
+def format_transaction_for_write(transaction):
+    transaction_for_write = transaction.copy()
+    if 'amount' in transaction_for_write and isinstance(transaction_for_write['amount'], (int, float)):
+        transaction_for_write['amount'] = f"{transaction_for_write['amount']:.2f}"
+    return transaction_for_write
+
+def format_transaction_for_file(transaction):
+    # Loading negates debit amounts; files that are read back with
+    # iter_transactions must keep the amounts as they were in the input.
+    transaction_for_write = format_transaction_for_write(transaction)
+    amount = transaction.get('amount')
+    if str(transaction.get('type', '')).lower().strip() == 'debit' and isinstance(amount, (int, float)):
+        transaction_for_write['amount'] = f"{-amount:.2f}"
+    return transaction_for_write
+
+def fieldnames_for(transactions_list):
+    header = list(TRANSACTION_FIELDS)
+    for field in OPTIONAL_FIELDS:
+        if any(transaction.get(field) for transaction in transactions_list):
+            header.append(field)
+    return header
+
+def save_transactions(transactions_list, filename='financial_transactions_short.csv', rollups=None):
+    header = fieldnames_for(transactions_list)
 
     try:
-        with open(filename, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=header)
-            writer.writeheader()
-            for transaction in transactions_list:
-                transaction_for_write = transaction.copy()
-                if 'amount' in transaction_for_write and isinstance(transaction_for_write['amount'], (int, float)):
-                    transaction_for_write['amount'] = f"{transaction_for_write['amount']:.2f}"
-
-                writer.writerow(transaction_for_write)
+        if is_xlsx(filename):
+            with XLSXWriter(filename, header) as writer:
+                writer.writeheader()
+                for transaction in transactions_list:
+                    writer.writerow(format_transaction_for_write(transaction))
+        else:
+            with open(filename, mode='w', newline='', encoding='utf-8') as file:
+                writer = csv.DictWriter(file, fieldnames=header, extrasaction='ignore')
+                writer.writeheader()
+                for transaction in transactions_list:
+                    writer.writerow(format_transaction_for_write(transaction))
         print(f"Transactions successfully saved to '{filename}'.")
+        if rollups is not None:
+            rollups.save(rollup_filename(filename), filename)
     except Exception as e:
         log_error(f"Error writing transactions to '{filename}': {e}")
         print(f"Error writing transactions to '{filename}': {e}")
 
-def generate_report(transactions_data, filename='report.txt'):
+def generate_report(transactions_data, filename='report.txt', stats=None, sketches=None, top_n=0, fx_rates=None, recurring=False, rules=None, rollups=None):
     print(f"\n--- Generating Financial Report to '{filename}' ---")
 
     if not transactions_data:
         report_content = "No transactions available to generate a report."
         print(report_content)
     else:
-        summary = analyze_transactions(transactions_data, return_data = True)
+        use_rollups = rollups is not None and fx_rates is None and rollups.is_fresh(transactions_data)
+        currency = None
+        if use_rollups:
+            summary = rollups.summary()
+        elif fx_rates is not None:
+            # Rankings and recurring amounts are compared across rows, so
+            # every row is converted once before any section is built.
+            currency = fx_rates.reporting_currency
+            transactions_data = convert_transactions(transactions_data, fx_rates)
+            summary = analyze_transactions(transactions_data, return_data = True)
+            if summary:
+                summary['currency'] = currency
+        else:
+            summary = analyze_transactions(transactions_data, return_data = True)
 
         if not summary:
             report_content = "Could not generate financial summary. No valid transactions found."
             print(report_content)
         else:
             report_content = f"--- Financial Report ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')}) ---\n\n"
-            report_content += f"Total Credits: ${summary['total_credits']:.2f}\n"
-            report_content += f"Total Debits: ${summary['total_debits']:.2f}\n"
-            report_content += f"Total Transfers: ${summary['total_transfers']:.2f}\n"
-            report_content += f"Net Balance: ${summary['net_balance']:.2f}\n\n"
+            if 'currency' in summary:
+                report_content += f"Reporting Currency: {summary['currency']}\n\n"
+            report_content += f"Total Credits: {format_money(summary['total_credits'], currency)}\n"
+            report_content += f"Total Debits: {format_money(summary['total_debits'], currency)}\n"
+            report_content += f"Total Transfers: {format_money(summary['total_transfers'], currency)}\n"
+            report_content += f"Net Balance: {format_money(summary['net_balance'], currency)}\n\n"
 
             report_content += "Totals by Type: \n"
             if summary['totals_by_type']:
                 for transaction_type, total_amount in summary['totals_by_type'].items():
-                    report_content += f"- {transaction_type.replace('_', ' ').title()}: ${total_amount:.2f}\n"
+                    report_content += f"- {transaction_type.replace('_', ' ').title()}: {format_money(total_amount, currency)}\n"
             else:
                 report_content += "No categorized transactions. \n"
 
+            if top_n > 0:
+                report_content += f"\nLargest {top_n} Debits: \n"
+                for transaction in top_transactions(transactions_data, top_n, transaction_type='debit'):
+                    report_content += f"- ID {transaction.get('transaction_id', 'N/A')} | {transaction.get('date', 'N/A')} | Customer {transaction.get('customer_id', 'N/A')} | {format_money(transaction_magnitude(transaction), currency)}\n"
+
+                report_content += f"\nTop {top_n} Customers by Debits: \n"
+                for customer_id, total_amount in top_customers(transactions_data, top_n):
+                    report_content += f"- Customer {customer_id}: {format_money(total_amount, currency)}\n"
+
+            if use_rollups:
+                report_content += "\n" + "".join(rollups.report_lines())
+
+            if recurring:
+                recurring_payments = detect_recurring_transactions(transactions_data)
+                report_content += f"\nRecurring Payments ({len(recurring_payments)} found): \n"
+                for item in recurring_payments:
+                    report_content += f"- Customer {item['customer_id']} | {item['description']} | {format_money(item['amount'], currency)} | {item['frequency']} x{item['occurrences']} | next expected {item['next_expected_date']}\n"
+
+            if rules is not None:
+                report_content += "\n" + "".join(rules.report_lines())
+            if stats is not None:
+                report_content += "\n" + "".join(stats.report_lines())
+            if sketches is not None:
+                report_content += "\n" + "".join(sketches.report_lines())
+
     try:
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(report_content)
         print(f"Financial report successfully generated to '{filename}'.")
+        if sketches is not None:
+            sketch_filename = os.path.splitext(filename)[0] + '.sketch.json'
+            sketches.save(sketch_filename)
+            print(f"Analytics sketches saved to '{sketch_filename}'.")
     except IOError as e:
         log_error(f"Error writing report to '{filename}': {e}")
         print(f"Error writing report to '{filename}': {e}")
     except Exception as e:
         log_error(f"An unexpected error occurred while generating the report: {e}")
         print(f"An unexpected error occurred while generating the report: {e}")
-def main():
+def main(shared_book=None):
     transactions_data = []
+    transaction_stats = TransactionStats()
+    transaction_rollups = Rollups()
     initialize_error_log()
 
     while True:
@@ -462,25 +833,37 @@ def main():
 
         choice = input("Enter your choice (1-9): ").strip()
         if choice == '1':
-            transactions_data = load_transactions()
+            transaction_stats = TransactionStats()
+            transaction_rollups = Rollups()
+            if shared_book is not None:
+                transactions_data = shared_book.open()
+                for transaction in transactions_data:
+                    transaction_stats.update(transaction)
+                transaction_rollups = Rollups.from_transactions(transactions_data)
+            else:
+                transactions_data = load_transactions(stats=transaction_stats, rollups=transaction_rollups)
         elif choice == '2':
             if not transactions_data:
                 print("Please load transactions first (option 1) before adding new ones.")
             else:
-                add_transaction(transactions_data)
+                add_transaction(transactions_data, rollups=transaction_rollups, shared=shared_book)
         elif choice == '3':
             view_transactions(transactions_data)
         elif choice == '4':
-            update_transaction(transactions_data)
+            update_transaction(transactions_data, rollups=transaction_rollups, shared=shared_book)
         elif choice == '5':
-            delete_transaction(transactions_data)
+            delete_transaction(transactions_data, rollups=transaction_rollups, shared=shared_book)
         elif choice == '6':
             analyze_transactions(transactions_data)
         elif choice == '7': 
-            save_transactions(transactions_data)
+            if shared_book is not None:
+                shared_book.save()
+                transaction_rollups = Rollups.from_transactions(transactions_data)
+            else:
+                save_transactions(transactions_data, rollups=transaction_rollups)
             print("Transactions saved successfully.")
         elif choice == '8':
-            generate_report(transactions_data)
+            generate_report(transactions_data, stats=transaction_stats, top_n=10, recurring=True, rollups=transaction_rollups)
         elif choice == '9':
             print("Exiting Smart Personal Finance Analyzer. Goodbye!")
             break
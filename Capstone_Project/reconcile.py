@@ -0,0 +1,230 @@
+import argparse
+import csv
+import os
+import pickle
+import tempfile
+import zlib
+
+import personal_finance_lib8
+from external_sort import read_run
+from personal_finance_lib8 import log_error
+
+MATCHED = 'matched'
+AMOUNT_MISMATCH = 'amount_mismatch'
+MISSING_LEFT = 'missing_left'
+MISSING_RIGHT = 'missing_right'
+INVALID_AMOUNT = 'invalid_amount'
+STATUSES = [MATCHED, AMOUNT_MISMATCH, MISSING_LEFT, MISSING_RIGHT, INVALID_AMOUNT]
+DIFFERENCE_FIELDS = ['status', 'key', 'left_amount', 'right_amount', 'difference', 'left_date', 'right_date', 'description']
+
+DEFAULT_KEYS = ('transaction_id',)
+DEFAULT_TOLERANCE = 0.005
+DEFAULT_MAX_BUILD_ROWS = 1000000
+DEFAULT_PARTITIONS = 64
+
+
+def make_key_function(keys):
+    keys = tuple(keys)
+    if not keys:
+        raise ValueError("At least one key column is needed to reconcile.")
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda transaction: str(transaction.get(key, '')).strip()
+    return lambda transaction: tuple(str(transaction.get(key, '')).strip() for key in keys)
+
+
+def amount_of(transaction):
+    try:
+        return float(transaction.get('amount', 0))
+    except (ValueError, TypeError):
+        return None
+
+
+def add_to_table(table, key, transaction):
+    matches = table.get(key)
+    if matches is None:
+        table[key] = [transaction]
+    else:
+        matches.append(transaction)
+
+
+def probe(table, left_transactions, key_function, tolerance):
+    # Duplicate keys are consumed in order through a cursor per key rather
+    # than list.pop(0), so heavily repeated keys stay linear.
+    cursors = {}
+    for left in left_transactions:
+        key = key_function(left)
+        matches = table.get(key)
+        if not matches:
+            yield MISSING_RIGHT, key, left, None
+            continue
+        position = cursors.get(key, 0)
+        right = matches[position]
+        if position + 1 == len(matches):
+            del table[key]
+            cursors.pop(key, None)
+        else:
+            cursors[key] = position + 1
+
+        left_amount = amount_of(left)
+        right_amount = amount_of(right)
+        if left_amount is None or right_amount is None:
+            yield INVALID_AMOUNT, key, left, right
+        elif abs(left_amount - right_amount) > tolerance:
+            yield AMOUNT_MISMATCH, key, left, right
+        else:
+            yield MATCHED, key, left, right
+
+    for key, unmatched in table.items():
+        for right in unmatched[cursors.get(key, 0):]:
+            yield MISSING_LEFT, key, None, right
+
+
+def partition_for(key, partitions):
+    return zlib.crc32(repr(key).encode('utf-8')) % partitions
+
+
+def spill_partitions(transactions, key_function, temp_dir, prefix, partitions):
+    files = {}
+    try:
+        for transaction in transactions:
+            partition = partition_for(key_function(transaction), partitions)
+            file = files.get(partition)
+            if file is None:
+                file = open(os.path.join(temp_dir, f"{prefix}_{partition}.pkl"), 'wb')
+                files[partition] = file
+            pickle.dump(transaction, file, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        for file in files.values():
+            file.close()
+    return {partition: file.name for partition, file in files.items()}
+
+
+def iter_reconciled(left_transactions, right_transactions, keys=DEFAULT_KEYS, tolerance=DEFAULT_TOLERANCE, max_build_rows=DEFAULT_MAX_BUILD_ROWS, partitions=DEFAULT_PARTITIONS, temp_dir=None):
+    key_function = make_key_function(keys)
+    right_transactions = iter(right_transactions)
+
+    table = {}
+    build_rows = 0
+    overflow = None
+    for transaction in right_transactions:
+        if build_rows >= max_build_rows:
+            overflow = transaction
+            break
+        add_to_table(table, key_function(transaction), transaction)
+        build_rows += 1
+
+    if overflow is None:
+        yield from probe(table, left_transactions, key_function, tolerance)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='pf_reconcile_', dir=temp_dir) as spill_dir:
+        def remaining_right():
+            for matches in table.values():
+                yield from matches
+            table.clear()
+            yield overflow
+            yield from right_transactions
+
+        right_files = spill_partitions(remaining_right(), key_function, spill_dir, 'right', partitions)
+        left_files = spill_partitions(left_transactions, key_function, spill_dir, 'left', partitions)
+
+        for partition in sorted(set(right_files) | set(left_files)):
+            partition_table = {}
+            if partition in right_files:
+                for transaction in read_run(right_files[partition]):
+                    add_to_table(partition_table, key_function(transaction), transaction)
+                os.remove(right_files[partition])
+            left_partition = read_run(left_files[partition]) if partition in left_files else []
+            yield from probe(partition_table, left_partition, key_function, tolerance)
+            if partition in left_files:
+                os.remove(left_files[partition])
+
+
+def amount_text(transaction):
+    if transaction is None:
+        return ''
+    amount = amount_of(transaction)
+    # Unparseable amounts are written as found so they can be fixed.
+    return str(transaction.get('amount', '')) if amount is None else f"{amount:.2f}"
+
+
+def difference_row(status, key, left, right):
+    left_amount = amount_of(left) if left is not None else None
+    right_amount = amount_of(right) if right is not None else None
+    difference = left_amount - right_amount if left_amount is not None and right_amount is not None else None
+    source = left if left is not None else right
+    return [
+        status,
+        '|'.join(key) if isinstance(key, tuple) else key,
+        amount_text(left),
+        amount_text(right),
+        '' if difference is None else f"{difference:.2f}",
+        '' if left is None else left.get('date', ''),
+        '' if right is None else right.get('date', ''),
+        source.get('description', '')
+    ]
+
+
+def reconcile_files(left_filename, right_filename, output_filename=None, keys=DEFAULT_KEYS, tolerance=DEFAULT_TOLERANCE, max_build_rows=DEFAULT_MAX_BUILD_ROWS, partitions=DEFAULT_PARTITIONS, temp_dir=None, include_matched=False):
+    counts = {status: 0 for status in STATUSES}
+    output = None
+    try:
+        if output_filename is not None:
+            output = open(output_filename, 'w', newline='', encoding='utf-8')
+            writer = csv.writer(output)
+            writer.writerow(DIFFERENCE_FIELDS)
+
+        left_transactions = personal_finance_lib8.iter_transactions(left_filename)
+        right_transactions = personal_finance_lib8.iter_transactions(right_filename)
+        for status, key, left, right in iter_reconciled(left_transactions, right_transactions, keys, tolerance, max_build_rows, partitions, temp_dir):
+            counts[status] += 1
+            if output is not None and (status != MATCHED or include_matched):
+                writer.writerow(difference_row(status, key, left, right))
+    except FileNotFoundError as e:
+        print(f"Error: The file '{e.filename}' was not found.")
+        log_error(f"Error: The file '{e.filename}' was not found during reconciliation.")
+        return None
+    except (IOError, ValueError) as e:
+        print(f"Error reconciling '{left_filename}' with '{right_filename}': {e}")
+        log_error(f"Error reconciling '{left_filename}' with '{right_filename}': {e}")
+        return None
+    finally:
+        if output is not None:
+            output.close()
+
+    return counts
+
+
+def summary_lines(counts, left_name='left', right_name='right'):
+    return [
+        f"Matched: {counts[MATCHED]}\n",
+        f"Amount mismatches: {counts[AMOUNT_MISMATCH]}\n",
+        f"Missing from {left_name}: {counts[MISSING_LEFT]}\n",
+        f"Missing from {right_name}: {counts[MISSING_RIGHT]}\n",
+        f"Invalid amounts: {counts[INVALID_AMOUNT]}\n"
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile two transaction books (e.g. our book against the bank's export).")
+    parser.add_argument('left', help="our transactions file (CSV or XLSX)")
+    parser.add_argument('right', help="the file to reconcile against (CSV or XLSX)")
+    parser.add_argument('--output', default='reconciliation.csv', help="CSV file for the differences")
+    parser.add_argument('--keys', default='transaction_id', help="comma separated key columns, e.g. date,customer_id,description")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="largest amount difference still treated as a match")
+    parser.add_argument('--max-build-rows', type=int, default=DEFAULT_MAX_BUILD_ROWS, help="rows of the right file kept in memory before spilling to disk")
+    parser.add_argument('--partitions', type=int, default=DEFAULT_PARTITIONS, help="number of spill partitions for large books")
+    parser.add_argument('--temp-dir', default=None, help="directory for temporary partition files")
+    parser.add_argument('--include-matched', action='store_true', help="also write matched rows to the output")
+    args = parser.parse_args()
+
+    keys = [key.strip() for key in args.keys.split(',') if key.strip()]
+    counts = reconcile_files(args.left, args.right, args.output, keys, args.tolerance, args.max_build_rows, args.partitions, args.temp_dir, args.include_matched)
+    if counts is not None:
+        print("".join(summary_lines(counts, args.left, args.right)), end='')
+        print(f"Differences written to '{args.output}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+import json
+import os
+from datetime import date
+
+GRAINS = ('day', 'week', 'month')
+ROLLUP_SUFFIX = '.rollups.json'
+
+
+def rollup_filename(book_filename):
+    return book_filename + ROLLUP_SUFFIX
+
+
+def book_fingerprint(book_filename):
+    try:
+        info = os.stat(book_filename)
+    except OSError:
+        return None
+    return [info.st_size, info.st_mtime_ns]
+
+
+class Rollups:
+    def __init__(self, by_customer=False):
+        self.by_customer = by_customer
+        self.tables = {grain: {} for grain in GRAINS}
+        self.customer_tables = {grain: {} for grain in GRAINS} if by_customer else None
+        self.count = 0
+        self.fresh = True
+        self.week_cache = {}
+
+    @classmethod
+    def from_transactions(cls, transactions, by_customer=False):
+        rollups = cls(by_customer)
+        for transaction in transactions:
+            rollups.apply(transaction)
+        return rollups
+
+    def periods(self, transaction_date):
+        transaction_date = str(transaction_date)
+        week = self.week_cache.get(transaction_date)
+        if week is None:
+            year, week_number, _ = date.fromisoformat(transaction_date).isocalendar()
+            week = f"{year}-W{week_number:02d}"
+            self.week_cache[transaction_date] = week
+        return (('day', transaction_date), ('week', week), ('month', transaction_date[:7]))
+
+    def apply(self, transaction, sign=1):
+        try:
+            amount = float(transaction.get('amount', 0))
+            periods = self.periods(transaction.get('date', ''))
+        except (ValueError, TypeError):
+            return
+        transaction_type = str(transaction.get('type', 'unknown')).lower()
+        customer_id = transaction.get('customer_id', 'N/A')
+
+        for grain, period in periods:
+            update_bucket(self.tables[grain], (period, transaction_type), sign, amount)
+            if self.by_customer:
+                update_bucket(self.customer_tables[grain], (period, transaction_type, customer_id), sign, amount)
+        self.count += sign
+
+    def add(self, transaction):
+        self.apply(transaction, 1)
+
+    def remove(self, transaction):
+        self.apply(transaction, -1)
+
+    def replace(self, old_transaction, new_transaction):
+        self.apply(old_transaction, -1)
+        self.apply(new_transaction, 1)
+
+    def is_fresh(self, transactions_list=None):
+        if not self.fresh:
+            return False
+        return transactions_list is None or self.count == len(transactions_list)
+
+    def rows(self, grain='month', customer_id=None):
+        if customer_id is None:
+            table = self.tables[grain]
+            return [{'period': period, 'type': transaction_type, 'count': count, 'total': total}
+                    for (period, transaction_type), (count, total) in sorted(table.items())]
+        if not self.by_customer:
+            raise ValueError("Customer rollups were not kept. Create Rollups(by_customer=True).")
+        matching = [(key, bucket) for key, bucket in self.customer_tables[grain].items() if key[2] == customer_id]
+        return [{'period': period, 'type': transaction_type, 'customer_id': customer, 'count': count, 'total': total}
+                for (period, transaction_type, customer), (count, total) in sorted(matching)]
+
+    def net_flow(self, grain='month', start=None, end=None, customer_id=None):
+        flow = {}
+        for row in self.rows(grain, customer_id):
+            if (start is not None and row['period'] < start) or (end is not None and row['period'] > end):
+                continue
+            flow[row['period']] = flow.get(row['period'], 0.0) + row['total']
+        return sorted(flow.items())
+
+    def summary(self):
+        totals_by_type = {}
+        for (_, transaction_type), (_, total) in self.tables['month'].items():
+            totals_by_type[transaction_type] = totals_by_type.get(transaction_type, 0.0) + total
+        return {
+            "total_credits": totals_by_type.get('credit', 0.0),
+            "total_debits": totals_by_type.get('debit', 0.0),
+            "total_transfers": totals_by_type.get('transfer', 0.0),
+            "net_balance": sum(totals_by_type.values()),
+            "totals_by_type": totals_by_type
+        }
+
+    def report_lines(self, grain='month', limit=12):
+        flow = self.net_flow(grain)
+        lines = [f"Net Flow by {grain.title()} (last {min(limit, len(flow))} of {len(flow)}): \n"]
+        for period, total in flow[-limit:]:
+            lines.append(f"- {period}: ${total:.2f}\n")
+        return lines
+
+    def save(self, filename, book_filename=None):
+        data = {
+            'by_customer': self.by_customer,
+            'count': self.count,
+            'book': book_fingerprint(book_filename) if book_filename else None,
+            'tables': {grain: [[*key, count, total] for key, (count, total) in table.items()] for grain, table in self.tables.items()},
+        }
+        if self.by_customer:
+            data['customer_tables'] = {grain: [[*key, count, total] for key, (count, total) in table.items()] for grain, table in self.customer_tables.items()}
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, filename, book_filename=None):
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        rollups = cls(data['by_customer'])
+        rollups.count = data['count']
+        for grain, rows in data['tables'].items():
+            rollups.tables[grain] = {(period, transaction_type): [count, total] for period, transaction_type, count, total in rows}
+        if rollups.by_customer:
+            for grain, rows in data['customer_tables'].items():
+                rollups.customer_tables[grain] = {(period, transaction_type, customer): [count, total] for period, transaction_type, customer, count, total in rows}
+        if book_filename is not None:
+            rollups.fresh = data['book'] is not None and data['book'] == book_fingerprint(book_filename)
+        return rollups
+
+    @classmethod
+    def for_book(cls, book_filename, by_customer=False):
+        filename = rollup_filename(book_filename)
+        if os.path.exists(filename):
+            rollups = cls.load(filename, book_filename)
+            if rollups.fresh and rollups.by_customer == by_customer:
+                return rollups
+
+        import personal_finance_lib8
+        rollups = cls.from_transactions(personal_finance_lib8.iter_transactions(book_filename), by_customer)
+        rollups.save(filename, book_filename)
+        return rollups
+
+
+def update_bucket(table, key, sign, amount):
+    bucket = table.get(key)
+    if bucket is None:
+        table[key] = [sign, sign * amount]
+        return
+    bucket[0] += sign
+    bucket[1] += sign * amount
+    if bucket[0] == 0:
+        del table[key]
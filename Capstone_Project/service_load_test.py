@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from finance_service import DEFAULT_HOST, DEFAULT_PORT, FinanceService
+
+
+async def send_request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    request = (
+        f"{method} {path} HTTP/1.1\r\n"
+        f"Host: localhost\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode('latin-1') + body
+    writer.write(request)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value.strip())
+    body = await reader.readexactly(length)
+    return status, json.loads(body)
+
+
+def choose_request(write_ratio):
+    roll = random.random()
+    if roll < write_ratio:
+        return 'POST', '/transactions', {'date': '2024-01-15', 'customer_id': str(random.randint(1, 1000)), 'amount': round(random.uniform(1, 500), 2), 'type': random.choice(['credit', 'debit', 'transfer']), 'description': 'load test'}
+    if roll < 0.5 + write_ratio / 2:
+        return 'GET', '/analyze', None
+    return 'GET', f"/transactions?customer_id={random.randint(1, 1000)}&limit=20", None
+
+
+async def client(host, port, requests, write_ratio, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            method, path, payload = choose_request(write_ratio)
+            start = time.perf_counter()
+            status, _ = await send_request(reader, writer, method, path, payload)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_load_test(host=DEFAULT_HOST, port=None, filename=None, clients=50, requests=200, write_ratio=0.1):
+    service = None
+    if port is None:
+        service = FinanceService()
+        if filename:
+            await service.load_file(filename)
+        port = await service.start(host, 0)
+
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(client(host, port, requests, write_ratio, latencies, errors) for _ in range(clients)))
+    finally:
+        elapsed = time.perf_counter() - start
+        if service is not None:
+            await service.stop()
+
+    latencies.sort()
+    results = {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000
+    }
+    print(f"Requests: {results['requests']} ({results['errors']} errors) in {elapsed:.2f}s")
+    print(f"Throughput: {results['requests_per_second']:.0f} requests/sec")
+    print(f"Latency: p50 {results['p50_ms']:.2f} ms, p99 {results['p99_ms']:.2f} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the finance analyzer service.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=None, help=f"port of a running service (e.g. {DEFAULT_PORT}); starts an in-process service if omitted")
+    parser.add_argument('--load', default='financial_transactions_short.csv', help="transactions CSV file for the in-process service")
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200, help="requests per client")
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    args = parser.parse_args()
+
+    asyncio.run(run_load_test(args.host, args.port, args.load, args.clients, args.requests, args.write_ratio))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+import argparse
+import csv
+import json
+import os
+import uuid
+
+import personal_finance_lib8
+from personal_finance_lib8 import fieldnames_for, format_transaction_for_file, log_error
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+JOURNAL_SUFFIX = '.journal'
+LOCK_SUFFIX = '.lock'
+
+
+class BookLock:
+    def __init__(self, filename, exclusive=True):
+        self.filename = filename
+        self.exclusive = exclusive
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.filename, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+        else:
+            self.file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.file.close()
+        self.file = None
+
+
+def transaction_key(transaction):
+    return str(transaction.get('transaction_id', ''))
+
+
+class SharedBook:
+    def __init__(self, filename='financial_transactions_short.csv'):
+        self.filename = filename
+        self.journal_filename = filename + JOURNAL_SUFFIX
+        self.lock_filename = filename + LOCK_SUFFIX
+        self.transactions = []
+        self.by_id = {}
+        self.versions = {}
+        self.pending = {}
+        self.generation = None
+        self.offset = 0
+        self.fingerprint = None
+
+    def open(self):
+        with BookLock(self.lock_filename, exclusive=False):
+            self.reload()
+        print(f"Opened shared book '{self.filename}' with {len(self.transactions)} transactions.")
+        return self.transactions
+
+    def book_fingerprint(self):
+        try:
+            info = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return (info.st_ino, info.st_size, info.st_mtime_ns)
+
+    def reload(self):
+        # The menu holds on to the list open() returned, so it is refilled
+        # in place rather than replaced.
+        self.fingerprint = self.book_fingerprint()
+        self.transactions[:] = personal_finance_lib8.iter_transactions(self.filename) if self.fingerprint is not None else []
+        self.by_id = {transaction_key(transaction): transaction for transaction in self.transactions}
+        self.versions = {}
+        self.generation = None
+        self.offset = 0
+        for entry in self.read_journal():
+            self.apply_entry(entry)
+
+    def read_journal(self, truncate_partial=False):
+        if not os.path.exists(self.journal_filename):
+            return []
+        entries = []
+        with open(self.journal_filename, 'r+b' if truncate_partial else 'rb') as f:
+            header = f.readline()
+            if not header.endswith(b'\n'):
+                return []
+            header = json.loads(header)
+            if header['generation'] != self.generation:
+                self.generation = header['generation']
+                self.versions.update(header.get('versions', {}))
+                self.offset = f.tell()
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    if truncate_partial:
+                        f.truncate(self.offset)
+                    break
+                entries.append(json.loads(line))
+                self.offset += len(line)
+        return entries
+
+    def apply_entry(self, entry):
+        key = entry['id']
+        transaction = self.by_id.get(key)
+        if entry['op'] == 'add' and transaction is None:
+            transaction = dict(entry['fields'])
+            self.transactions.append(transaction)
+            self.by_id[key] = transaction
+        elif entry['op'] == 'update' and transaction is not None:
+            transaction.update(entry['fields'])
+        elif entry['op'] == 'delete' and transaction is not None:
+            del self.by_id[key]
+            self.transactions.remove(transaction)
+        self.versions[key] = entry['version']
+
+    def add(self, transaction):
+        key = transaction_key(transaction)
+        self.by_id[key] = transaction
+        self.pending[key] = {'op': 'add', 'row': transaction}
+
+    def replace(self, old_transaction, new_transaction):
+        key = transaction_key(new_transaction)
+        change = self.pending.get(key)
+        if change is None:
+            change = {'op': 'update', 'version': self.versions.get(key, 0), 'base': {}}
+            self.pending[key] = change
+        if change['op'] != 'update':
+            return
+        for field, value in old_transaction.items():
+            if new_transaction.get(field) != value and field not in change['base']:
+                change['base'][field] = value
+
+    def remove(self, transaction):
+        key = transaction_key(transaction)
+        self.by_id.pop(key, None)
+        change = self.pending.get(key)
+        if change is not None and change['op'] == 'add':
+            del self.pending[key]
+            return
+        base = dict(transaction.items())
+        if change is not None:
+            base.update(change['base'])
+        self.pending[key] = {'op': 'delete', 'version': self.versions.get(key, 0), 'base': base}
+
+    def stored_row(self, key, change, their_entries):
+        row = self.by_id.get(key)
+        stored = dict(row.items()) if row is not None else {}
+        stored.update(change.get('base', {}))
+        deleted = False
+        for entry in their_entries:
+            if entry['op'] == 'delete':
+                deleted = True
+            elif entry['op'] == 'update':
+                stored.update(entry['fields'])
+        return stored, deleted
+
+    def next_id(self):
+        numeric_ids = [int(key) for key in list(self.by_id) + list(self.versions) if key.isdigit()]
+        return str(max(numeric_ids, default=0) + 1)
+
+    def merge(self, their_entries):
+        result = {'merged': 0, 'conflicts': [], 'renumbered': {}}
+        theirs = {}
+        displaced = set()
+        for entry in their_entries:
+            change = self.pending.get(entry['id'])
+            if change is not None and change['op'] != 'add':
+                theirs.setdefault(entry['id'], []).append(entry)
+                self.versions[entry['id']] = entry['version']
+                continue
+            if change is not None and entry['id'] not in displaced:
+                # Their new row takes the ID; ours is renumbered below.
+                displaced.add(entry['id'])
+                self.by_id.pop(entry['id'], None)
+            self.apply_entry(entry)
+            result['merged'] += 1
+
+        entries = []
+        for key, change in list(self.pending.items()):
+            if change['op'] == 'add':
+                row = change['row']
+                existing = self.by_id.get(key)
+                if key in self.versions or (existing is not None and existing is not row):
+                    new_key = self.next_id()
+                    row['transaction_id'] = new_key
+                    if existing is row:
+                        del self.by_id[key]
+                    result['renumbered'][key] = new_key
+                    key = new_key
+                self.by_id[key] = row
+                entries.append({'op': 'add', 'id': key, 'fields': dict(row.items())})
+                continue
+
+            row = self.by_id.get(key)
+            their_changes = theirs.get(key, [])
+            if self.versions.get(key, 0) == change['version']:
+                if change['op'] == 'delete':
+                    entries.append({'op': 'delete', 'id': key})
+                else:
+                    entries.append({'op': 'update', 'id': key, 'fields': {field: row[field] for field in change['base']}})
+                continue
+
+            stored, deleted = self.stored_row(key, change, their_changes)
+            result['merged'] += len(their_changes)
+            if change['op'] == 'delete':
+                self.versions[key] = their_changes[-1]['version']
+                if deleted:
+                    continue
+                if stored == change['base']:
+                    existing = self.by_id.pop(key, None)
+                    if existing is not None:
+                        self.transactions.remove(existing)
+                    entries.append({'op': 'delete', 'id': key})
+                    continue
+                if key not in self.by_id:
+                    restored = dict(stored)
+                    self.transactions.append(restored)
+                    self.by_id[key] = restored
+                result['conflicts'].append(f"Transaction {key} was changed by someone else; it was not deleted.")
+                continue
+
+            if deleted:
+                self.by_id.pop(key, None)
+                if row in self.transactions:
+                    self.transactions.remove(row)
+                self.versions[key] = their_changes[-1]['version']
+                result['conflicts'].append(f"Transaction {key} was deleted by someone else; your changes were dropped.")
+                continue
+
+            fields = {}
+            for field, value in stored.items():
+                if field not in change['base']:
+                    row[field] = value
+                elif value != change['base'][field] and value != row[field]:
+                    result['conflicts'].append(f"Transaction {key}: '{field}' was changed to '{value}' by someone else; your value '{row[field]}' was not saved.")
+                    row[field] = value
+                else:
+                    fields[field] = row[field]
+            self.versions[key] = their_changes[-1]['version']
+            if fields:
+                entries.append({'op': 'update', 'id': key, 'fields': fields})
+        return entries, result
+
+    def rebase(self):
+        pending_rows = {key: self.by_id.get(key) for key in self.pending}
+        self.reload()
+        their_entries = []
+        for key, change in self.pending.items():
+            row = pending_rows[key]
+            if change['op'] == 'add':
+                self.transactions.append(change['row'])
+                self.by_id.setdefault(key, change['row'])
+                continue
+            current = self.by_id.get(key)
+            version = max(self.versions.get(key, 0), change['version'] + 1)
+            if current is None:
+                their_entries.append({'op': 'delete', 'id': key, 'version': version})
+                continue
+            their_entries.append({'op': 'update', 'id': key, 'version': version, 'fields': dict(current.items())})
+            if row is not None:
+                self.transactions[self.transactions.index(current)] = row
+                self.by_id[key] = row
+        return their_entries
+
+    def save(self):
+        with BookLock(self.lock_filename, exclusive=True):
+            result = self.save_locked()
+        print(f"Saved {result['saved']} changes to '{self.filename}' and merged {result['merged']} changes from other sessions.")
+        for old_key, new_key in result['renumbered'].items():
+            print(f"- New transaction {old_key} was saved as {new_key}.")
+        for conflict in result['conflicts']:
+            print(f"- Conflict: {conflict}")
+            log_error(f"Shared book conflict in '{self.filename}': {conflict}")
+        return result
+
+    def save_locked(self):
+        generation = self.generation
+        their_entries = self.read_journal(truncate_partial=True)
+        # A new journal generation or a rewritten CSV means another session
+        # compacted (possibly before this one ever saw a journal), so the
+        # book is read again before merging.
+        if (generation is not None and self.generation != generation) or self.fingerprint != self.book_fingerprint():
+            their_entries = self.rebase()
+
+        entries, result = self.merge(their_entries)
+
+        if not os.path.exists(self.journal_filename):
+            self.generation = uuid.uuid4().hex
+            with open(self.journal_filename, 'wb') as f:
+                f.write(json.dumps({'generation': self.generation}).encode('utf-8') + b'\n')
+                self.offset = f.tell()
+
+        with open(self.journal_filename, 'ab') as f:
+            for entry in entries:
+                entry['version'] = self.versions.get(entry['id'], 0) + 1
+                self.versions[entry['id']] = entry['version']
+                line = json.dumps(entry, default=str).encode('utf-8') + b'\n'
+                f.write(line)
+                self.offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.pending = {}
+        result['saved'] = len(entries)
+        return result
+
+    def compact(self):
+        with BookLock(self.lock_filename, exclusive=True):
+            result = self.save_locked()
+            temp_filename = self.filename + '.tmp'
+            with open(temp_filename, 'w', newline='', encoding='utf-8') as file:
+                writer = csv.DictWriter(file, fieldnames=fieldnames_for(self.transactions), extrasaction='ignore')
+                writer.writeheader()
+                for transaction in self.transactions:
+                    writer.writerow(format_transaction_for_file(transaction))
+            os.replace(temp_filename, self.filename)
+            self.fingerprint = self.book_fingerprint()
+
+            self.generation = uuid.uuid4().hex
+            temp_filename = self.journal_filename + '.tmp'
+            with open(temp_filename, 'wb') as f:
+                f.write(json.dumps({'generation': self.generation, 'versions': self.versions}).encode('utf-8') + b'\n')
+                self.offset = f.tell()
+            os.replace(temp_filename, self.journal_filename)
+        print(f"Compacted '{self.journal_filename}' into '{self.filename}'.")
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the finance menu against a transactions file shared with other analysts.")
+    parser.add_argument('book', nargs='?', default='financial_transactions_short.csv', help="shared transactions CSV file")
+    parser.add_argument('--compact', action='store_true', help="fold the change journal into the CSV file and exit")
+    args = parser.parse_args()
+
+    book = SharedBook(args.book)
+    if args.compact:
+        book.open()
+        book.compact()
+        return
+    personal_finance_lib8.main(shared_book=book)
+
+
+if __name__ == '__main__':
+    main()
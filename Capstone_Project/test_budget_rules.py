@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from budget_rules import BudgetRule, BudgetRulesEngine
+
+TRANSACTIONS = [
+    {'transaction_id': '1', 'date': '2024-01-02', 'customer_id': '5', 'amount': -60.0, 'type': 'debit'},
+    {'transaction_id': '2', 'date': '2024-01-03', 'customer_id': '5', 'amount': -50.0, 'type': 'debit'},
+    {'transaction_id': '3', 'date': '2024-01-04', 'customer_id': '5', 'amount': -30.0, 'type': 'debit'},
+    {'transaction_id': '4', 'date': '2024-02-01', 'customer_id': '5', 'amount': -90.0, 'type': 'debit'},
+    {'transaction_id': '5', 'date': '2024-01-05', 'customer_id': '6', 'amount': 500.0, 'type': 'credit'}
+]
+
+
+def test_alert_once_when_limit_is_crossed():
+    engine = BudgetRulesEngine([BudgetRule('Monthly spend', 100)])
+
+    alerts = engine.evaluate_all(TRANSACTIONS)
+
+    assert alerts == [(0, ('5',), '2024-01', 110.0, '2')]
+    assert engine.report_lines()[1] == "- Budget alert 'Monthly spend': customer_id 5 in 2024-01 reached $110.00 (limit 100) at transaction 2.\n"
+
+
+def test_rules_for_any_type_and_counts(tmp_path):
+    filename = tmp_path / 'rules.json'
+    filename.write_text(json.dumps([
+        {'name': 'Busy week', 'limit': 2, 'type': None, 'per': [], 'period': 'week', 'measure': 'count'},
+        {'name': 'Big year', 'limit': 200, 'period': 'year'}
+    ]), encoding='utf-8')
+    engine = BudgetRulesEngine.load(filename)
+
+    engine.evaluate_all(TRANSACTIONS)
+
+    assert [engine.rules[index].name for index, *_ in engine.alerts] == ['Busy week', 'Big year']
+    assert engine.alerts[0][2] == '2024-W01'
+    assert engine.alert_message(engine.alerts[0]) == "Budget alert 'Busy week': all transactions in 2024-W01 reached 3 transactions (limit 2) at transaction 3."
+
+
+def test_invalid_rule():
+    with pytest.raises(ValueError):
+        BudgetRule('Bad', 10, period='fortnight')
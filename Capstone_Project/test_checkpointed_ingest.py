@@ -0,0 +1,132 @@
+import os
+import re
+
+import pytest
+
+import checkpointed_ingest
+from budget_rules import BudgetRule, BudgetRulesEngine
+from checkpointed_ingest import load_transactions_resumable, read_state, write_state
+from personal_finance_lib8 import ERROR_LOG_FILE
+from rollups import Rollups
+from transaction_stats import TransactionStats
+
+ROWS = [
+    "1,2024-01-02,5,100.00,credit,Salary",
+    "2,2024-01-03,5,40.00,debit,Groceries",
+    "3,not-a-date,6,12.00,debit,Broken date",
+    "4,2024-01-09,6,75.50,debit,Utilities",
+    "5,2024-02-01,5,20.00,transfer,Savings",
+    "6,2024-02-03,6,300.00,debit,Rent",
+    "7,2024-02-04,7,15.00,refund,Unknown type",
+    "8,2024-02-10,7,60.00,credit,Gift",
+]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def write_book(tmp_path):
+    filename = tmp_path / 'book.csv'
+    filename.write_text("transaction_id,date,customer_id,amount,type,description\n" + "\n".join(ROWS) + "\n", encoding='utf-8')
+    return str(filename)
+
+
+def make_rules():
+    return BudgetRulesEngine([BudgetRule('monthly debits', 100, 'debit', ('customer_id',), 'month')])
+
+
+def interrupt_after(monkeypatch, rows):
+    original = checkpointed_ingest.process_transaction_row
+    seen = []
+
+    def process(row):
+        if len(seen) == rows:
+            raise Interrupted()
+        seen.append(row)
+        return original(row)
+    monkeypatch.setattr(checkpointed_ingest, 'process_transaction_row', process)
+    return lambda: monkeypatch.setattr(checkpointed_ingest, 'process_transaction_row', original)
+
+
+def error_lines():
+    with open(ERROR_LOG_FILE, 'r', encoding='utf-8') as f:
+        return [re.sub(r'^\[[^\]]*\] ', '', line) for line in f]
+
+
+def run(filename, **kwargs):
+    stats, rules, rollups = TransactionStats(min_history=1), make_rules(), Rollups()
+    transactions, summary = load_transactions_resumable(filename, stats=stats, rules=rules, rollups=rollups, **kwargs)
+    return transactions, summary, stats, rules, rollups
+
+
+def expected_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = write_book(tmp_path)
+    result = run(filename, checkpoint_every=2)
+    expected_errors = error_lines()
+    os.remove(ERROR_LOG_FILE)
+    return filename, result, expected_errors
+
+
+@pytest.mark.parametrize('interrupt_at, checkpoint_every', [(4, 100), (5, 2)])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, monkeypatch, interrupt_at, checkpoint_every):
+    filename, expected, expected_errors = expected_run(tmp_path, monkeypatch)
+
+    restore = interrupt_after(monkeypatch, interrupt_at)
+    with pytest.raises(Interrupted):
+        run(filename, checkpoint_every=checkpoint_every)
+    restore()
+    transactions, summary, stats, _, _ = run(filename, checkpoint_every=checkpoint_every)
+
+    assert transactions == expected[0]
+    assert summary == expected[1]
+    assert error_lines() == expected_errors
+    assert stats.overall.count == expected[2].overall.count == 6
+    assert stats.flagged == expected[2].flagged
+
+
+def test_resumed_run_raises_the_same_alerts(tmp_path, monkeypatch):
+    filename, expected, _ = expected_run(tmp_path, monkeypatch)
+
+    restore = interrupt_after(monkeypatch, 5)
+    with pytest.raises(Interrupted):
+        run(filename, checkpoint_every=2)
+    restore()
+    _, _, _, rules, _ = run(filename, checkpoint_every=2)
+
+    assert rules.alerts
+    assert rules.alerts == expected[3].alerts
+
+
+def test_resumed_run_fills_callers_rollups(tmp_path, monkeypatch):
+    filename, expected, _ = expected_run(tmp_path, monkeypatch)
+
+    restore = interrupt_after(monkeypatch, 5)
+    with pytest.raises(Interrupted):
+        run(filename, checkpoint_every=2)
+    restore()
+    _, _, _, _, rollups = run(filename, checkpoint_every=2)
+
+    assert rollups.count == 6
+    assert rollups.rows('month') == expected[4].rows('month')
+
+
+def test_shorter_error_log_starts_over_without_padding(tmp_path, monkeypatch):
+    filename, expected, expected_errors = expected_run(tmp_path, monkeypatch)
+
+    restore = interrupt_after(monkeypatch, 5)
+    with pytest.raises(Interrupted):
+        run(filename, checkpoint_every=2)
+    restore()
+    checkpoint_dir = filename + '.checkpoint'
+    state = read_state(checkpoint_dir)
+    state['errors_size'] += 10000
+    write_state(checkpoint_dir, state)
+
+    transactions, summary, _, _, _ = run(filename, checkpoint_every=2)
+
+    assert transactions == expected[0]
+    assert summary == expected[1]
+    with open(ERROR_LOG_FILE, 'rb') as f:
+        assert b'\0' not in f.read()
@@ -0,0 +1,52 @@
+import os
+import zipfile
+
+from customer_statements import generate_customer_statements, render_statement, statement_filename
+
+TRANSACTIONS = [
+    {'transaction_id': '1', 'date': '2024-02-01', 'customer_id': '7', 'amount': -12.5, 'type': 'debit', 'description': 'Coffee'},
+    {'transaction_id': '2', 'date': '2024-01-15', 'customer_id': '7', 'amount': 100.0, 'type': 'credit', 'description': 'Salary'},
+    {'transaction_id': '3', 'date': '2024-01-20', 'customer_id': '3', 'amount': -40.0, 'type': 'debit', 'description': 'Fee'},
+    {'transaction_id': '4', 'date': '2024-03-02', 'customer_id': '../x', 'amount': 5.0, 'type': 'transfer', 'description': 'Move'}
+]
+
+
+def test_statement_lists_rows_in_date_order():
+    content = render_statement('7', [dict(transaction) for transaction in TRANSACTIONS[:2]], '2024-04-01 00:00:00')
+
+    assert content.index('Salary') < content.index('Coffee')
+    assert "Period: 2024-01-15 to 2024-02-01" in content
+    assert "- Debit: $-12.50" in content
+    assert "Net Balance: $87.50" in content
+
+
+def test_statement_filenames_stay_distinct_and_in_output_directory():
+    names = [statement_filename(customer_id) for customer_id in ('../x', 'a/b', 'a_b', 'A', 'a', 7, '7')]
+
+    assert all('/' not in name and name.startswith('statement_') for name in names)
+    assert statement_filename('../x').startswith('statement_.._x_')
+    assert len({name.lower() for name in names[:5]}) == 5
+    assert names[5] == names[6]
+
+
+def test_colliding_ids_get_separate_statements(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    transactions = [dict(TRANSACTIONS[0], customer_id='a/b'), dict(TRANSACTIONS[1], customer_id='a_b')]
+
+    assert generate_customer_statements(transactions, str(tmp_path / 'statements'), processes=1, buckets=1) == 2
+    assert len(os.listdir(tmp_path / 'statements')) == 2
+
+
+def test_directory_and_archive_match(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_dir = tmp_path / 'statements'
+    archive = tmp_path / 'statements.zip'
+
+    assert generate_customer_statements([dict(transaction) for transaction in TRANSACTIONS], str(output_dir), processes=2, buckets=4) == 3
+    assert generate_customer_statements([dict(transaction) for transaction in TRANSACTIONS], str(archive), processes=2, archive=True, buckets=4) == 3
+
+    with zipfile.ZipFile(archive) as zip_file:
+        assert sorted(zip_file.namelist()) == sorted(os.listdir(output_dir))
+        for name in zip_file.namelist():
+            # The first line carries the generation time, which can differ between runs.
+            assert zip_file.read(name).decode('utf-8').split('\n', 1)[1] == (output_dir / name).read_text(encoding='utf-8').split('\n', 1)[1]
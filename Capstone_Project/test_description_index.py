@@ -0,0 +1,56 @@
+from description_index import DescriptionIndex, decode_postings, encode_postings
+
+
+def sample_index():
+    index = DescriptionIndex()
+    index.add_all([
+        {'transaction_id': '3', 'description': 'Grocery store purchase'},
+        {'transaction_id': '1', 'description': 'Coffee shop'},
+        {'transaction_id': '2', 'description': 'Grocery delivery fee'},
+        {'transaction_id': '4', 'description': 'Gas station'},
+        {'transaction_id': 'bad', 'description': 'Grocery'}
+    ])
+    return index
+
+
+def test_postings_round_trip():
+    ids = [2, 3, 10, 400, 401]
+
+    assert decode_postings(encode_postings(ids)) == ids
+
+
+def test_search_queries():
+    index = sample_index()
+
+    assert index.search_ids('grocery') == [2, 3]
+    assert index.search_ids('grocery AND fee') == [2]
+    assert index.search_ids('coffee OR gas') == [1, 4]
+    assert index.search_ids('gro*') == [2, 3]
+    assert index.search_ids('missing') == []
+    assert [row['transaction_id'] for row in index.search('STORE')] == ['3']
+
+
+def test_index_follows_changes():
+    index = sample_index()
+    coffee = {'transaction_id': '1', 'description': 'Grocery run'}
+
+    index.update(coffee, 'Coffee shop')
+    index.remove({'transaction_id': '3', 'description': 'Grocery store purchase'})
+    index.add({'transaction_id': '5', 'description': 'Gas refill'})
+
+    assert index.search_ids('grocery') == [1, 2]
+    assert index.search_ids('coffee') == []
+    assert index.search_ids('gas') == [4, 5]
+    assert index.search(' run') == [coffee]
+
+
+def test_many_out_of_order_changes_compact():
+    index = DescriptionIndex(keep_rows=False)
+    for transaction_id in range(200, 0, -1):
+        index.add({'transaction_id': transaction_id, 'description': 'Rent'})
+    for transaction_id in range(1, 201, 2):
+        index.remove({'transaction_id': transaction_id, 'description': 'Rent'})
+
+    assert index.search('rent') == list(range(2, 201, 2))
+    index.compact()
+    assert index.search('rent') == list(range(2, 201, 2))
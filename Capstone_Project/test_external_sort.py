@@ -0,0 +1,66 @@
+import csv
+import os
+
+import personal_finance_lib8
+from external_sort import iter_sorted, sort_transactions_file
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'financial_transactions_short.csv')
+
+
+def totals(filename):
+    summary = personal_finance_lib8.analyze_transactions(personal_finance_lib8.load_transactions(filename), return_data=True)
+    return {key: round(summary[key], 2) for key in ('total_credits', 'total_debits', 'total_transfers', 'net_balance')}
+
+
+def test_sort_keeps_file_totals(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_filename = str(tmp_path / 'sorted.csv')
+
+    count = sort_transactions_file(SAMPLE_FILE, output_filename, keys=('date', 'customer_id'), run_size=100)
+
+    assert count == len(personal_finance_lib8.load_transactions(SAMPLE_FILE))
+    assert totals(output_filename) == totals(SAMPLE_FILE)
+
+
+def test_sort_only_reorders_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    input_filename = tmp_path / 'book.csv'
+    input_filename.write_text(
+        "transaction_id,date,customer_id,amount,type,description\n"
+        "1,2024-03-01,7,12.50,debit,Coffee\n"
+        "2,2024-01-15,3,100.00,credit,Refund\n"
+        "3,2024-02-10,7,-40.00,debit,Fee\n",
+        encoding='utf-8'
+    )
+    output_filename = tmp_path / 'sorted.csv'
+
+    sort_transactions_file(str(input_filename), str(output_filename), keys=('date',))
+
+    with open(output_filename, newline='', encoding='utf-8') as f:
+        rows = [(row['transaction_id'], row['amount']) for row in csv.DictReader(f)]
+    assert rows == [('2', '100.00'), ('3', '-40.00'), ('1', '12.50')]
+
+
+def test_merge_of_spilled_runs_matches_in_memory_sort():
+    transactions = [{'transaction_id': str(i), 'date': f'2024-01-{(i * 7) % 28 + 1:02d}', 'amount': float(i % 5)} for i in range(200)]
+    keys = ('date', 'amount', 'transaction_id')
+    expected = list(iter_sorted(transactions, keys, run_size=1000))
+    assert list(iter_sorted(transactions, keys, run_size=9, max_open_runs=3)) == expected
+
+
+def test_sort_keeps_currencies_when_first_row_has_none(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    input_filename = tmp_path / 'book.csv'
+    input_filename.write_text(
+        "transaction_id,date,customer_id,amount,type,description,currency\n"
+        "1,2024-01-01,7,12.50,debit,Coffee,\n"
+        "2,2024-01-15,3,100.00,credit,Refund,EUR\n"
+        "3,2024-02-10,7,40.00,debit,Fee,GBP\n",
+        encoding='utf-8'
+    )
+    output_filename = tmp_path / 'sorted.csv'
+
+    sort_transactions_file(str(input_filename), str(output_filename), keys=('date',), run_size=1)
+
+    with open(output_filename, newline='', encoding='utf-8') as f:
+        assert [(row['transaction_id'], row['currency']) for row in csv.DictReader(f)] == [('1', ''), ('2', 'EUR'), ('3', 'GBP')]
@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+import pytest
+
+from finance_service import FinanceService, HTTPError
+
+
+def call(service, method, target, data=None):
+    body = json.dumps(data).encode('utf-8') if data is not None else b''
+    return asyncio.run(service.dispatch(method, target, body))
+
+
+def test_load_and_report_stay_inside_data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    (data_dir / 'book.csv').write_text(
+        "transaction_id,date,customer_id,amount,type,description\n"
+        "1,2024-01-02,5,10.00,credit,Deposit\n"
+        "2,2024-01-03,5,4.00,debit,Lunch\n",
+        encoding='utf-8'
+    )
+    service = FinanceService(data_dir=str(data_dir))
+
+    status, payload = call(service, 'POST', '/load', {'filename': 'book.csv'})
+    assert status == 200
+    assert payload['loaded'] == 2
+    status, _ = call(service, 'POST', '/report', {'filename': 'report.txt'})
+    assert status == 200
+    assert (data_dir / 'report.txt').exists()
+
+
+@pytest.mark.parametrize('filename', ['../secret.csv', 'reports/../../secret.csv', '/etc/passwd', ''])
+def test_filenames_outside_data_dir_are_rejected(tmp_path, filename):
+    service = FinanceService(data_dir=str(tmp_path))
+    for target in ('/load', '/report'):
+        with pytest.raises(HTTPError) as error:
+            call(service, 'POST', target, {'filename': filename})
+        assert error.value.status == 400
+
+
+def test_debits_are_stored_negative_and_summarized():
+    service = FinanceService()
+    status, transaction = call(service, 'POST', '/transactions', {'date': '2024-02-01', 'customer_id': '9', 'amount': '25', 'type': 'debit', 'description': 'Gym'})
+    assert status == 201
+    assert transaction['amount'] == -25.0
+    _, summary = call(service, 'GET', '/analyze')
+    assert summary['total_debits'] == -25.0
+    assert summary['count'] == 1
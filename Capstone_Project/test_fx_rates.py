@@ -0,0 +1,79 @@
+import pytest
+
+import personal_finance_lib8
+from fx_rates import FXRates
+
+RATES = (
+    "currency,date,rate\n"
+    "eur,2024-01-01,1.10\n"
+    "EUR,2024-02-01,1.20\n"
+    "EUR,2024-01-01,1.05\n"
+    "GBP,2024-01-01,1.25\n"
+)
+
+
+def test_rate_uses_latest_date_on_or_before(tmp_path):
+    filename = tmp_path / 'rates.csv'
+    filename.write_text(RATES, encoding='utf-8')
+    fx_rates = FXRates.load(filename)
+
+    assert fx_rates.rate('EUR', '2024-01-01') == 1.05
+    assert fx_rates.rate('eur', '2024-01-31') == 1.05
+    assert fx_rates.rate('EUR', '2024-03-01') == 1.20
+    assert fx_rates.rate('', '2020-01-01') == 1.0
+    with pytest.raises(LookupError):
+        fx_rates.rate('EUR', '2023-12-31')
+    with pytest.raises(LookupError):
+        fx_rates.rate('JPY', '2024-01-01')
+
+
+def test_added_rate_replaces_cached_rate():
+    fx_rates = FXRates()
+    fx_rates.add_rate('eur', '2024-01-01', 1.1)
+    assert fx_rates.convert(10.0, 'EUR', '2024-01-15') == pytest.approx(11.0)
+
+    fx_rates.add_rate('EUR', '2024-01-10', 1.2)
+    fx_rates.add_rate('EUR', '2024-01-01', 1.0)
+
+    assert [fx_rates.convert(10.0, currency, day) for currency, day in (('EUR', '2024-01-05'), ('EUR', '2024-01-15'), ('USD', '2024-01-15'))] == pytest.approx([10.0, 12.0, 10.0])
+
+
+def test_analysis_converts_to_reporting_currency(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fx_rates = FXRates()
+    fx_rates.add_rate('EUR', '2024-01-01', 1.5)
+    transactions = [
+        {'transaction_id': '1', 'date': '2024-01-02', 'amount': 100.0, 'type': 'credit', 'currency': 'EUR'},
+        {'transaction_id': '2', 'date': '2024-01-03', 'amount': -40.0, 'type': 'debit', 'currency': ''},
+        {'transaction_id': '3', 'date': '2024-01-03', 'amount': -10.0, 'type': 'debit', 'currency': 'JPY'}
+    ]
+
+    summary = personal_finance_lib8.analyze_transactions(transactions, return_data=True, fx_rates=fx_rates)
+
+    assert summary['total_credits'] == pytest.approx(150.0)
+    assert summary['total_debits'] == pytest.approx(-40.0)
+    assert summary['currency'] == 'USD'
+
+
+def test_report_ranks_and_labels_converted_amounts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fx_rates = FXRates('EUR')
+    fx_rates.add_rate('JPY', '2024-01-01', 0.01)
+    fx_rates.add_rate('USD', '2024-01-01', 0.5)
+    transactions = [
+        {'transaction_id': '1', 'date': '2024-01-02', 'customer_id': '5', 'amount': -5000.0, 'type': 'debit', 'currency': 'JPY', 'description': 'Ramen'},
+        {'transaction_id': '2', 'date': '2024-01-03', 'customer_id': '6', 'amount': -80.0, 'type': 'debit', 'currency': 'USD', 'description': 'Books'},
+        {'transaction_id': '3', 'date': '2024-01-04', 'customer_id': '7', 'amount': -60.0, 'type': 'debit', 'currency': '', 'description': 'Rent'},
+        {'transaction_id': '4', 'date': '2024-01-04', 'customer_id': '8', 'amount': -99.0, 'type': 'debit', 'currency': 'CHF', 'description': 'No rate'}
+    ]
+
+    personal_finance_lib8.generate_report(transactions, 'report.txt', top_n=2, fx_rates=fx_rates)
+
+    report = (tmp_path / 'report.txt').read_text(encoding='utf-8')
+    assert "Reporting Currency: EUR" in report
+    assert "Total Debits: -150.00 EUR" in report
+    assert "$" not in report
+    largest = report.split("Largest 2 Debits: \n")[1].split("\n\n")[0].splitlines()
+    assert largest == ["- ID 3 | 2024-01-04 | Customer 7 | 60.00 EUR", "- ID 1 | 2024-01-02 | Customer 5 | 50.00 EUR"]
+    assert report.split("Top 2 Customers by Debits: \n")[1].splitlines()[:2] == ["- Customer 7: 60.00 EUR", "- Customer 5: 50.00 EUR"]
+    assert transactions[0]['amount'] == -5000.0
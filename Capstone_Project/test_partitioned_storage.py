@@ -0,0 +1,73 @@
+import os
+
+from partitioned_storage import append_partitioned, load_partitioned, read_manifest, write_partitioned
+
+
+def make_transaction(transaction_id, date, amount):
+    return {
+        'transaction_id': str(transaction_id),
+        'date': date,
+        'customer_id': '1',
+        'amount': amount,
+        'type': 'credit',
+        'description': 'Deposit'
+    }
+
+
+def test_rewrite_removes_stale_partitions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    directory = str(tmp_path / 'book')
+    write_partitioned([make_transaction(1, '2023-11-05', 10.0), make_transaction(2, '2023-12-01', 20.0)], directory)
+    assert os.path.exists(os.path.join(directory, '2023', '2023-11.csv'))
+
+    write_partitioned([make_transaction(3, '2024-01-02', 30.0)], directory)
+
+    assert sorted(read_manifest(directory)['partitions']) == ['2024-01']
+    assert not os.path.exists(os.path.join(directory, '2023', '2023-11.csv'))
+    assert not os.path.exists(os.path.join(directory, '2023', '2023-12.csv'))
+    assert [row['transaction_id'] for row in load_partitioned(directory)] == ['3']
+
+
+def test_append_touches_only_new_months(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    directory = str(tmp_path / 'book')
+    write_partitioned([make_transaction(1, '2024-01-05', 10.0), make_transaction(2, '2024-02-01', -20.0)], directory)
+    january = os.path.join(directory, '2024', '2024-01.csv')
+    before = os.path.getmtime(january)
+
+    append_partitioned([make_transaction(3, '2024-02-09', 5.0)], directory)
+
+    assert os.path.getmtime(january) == before
+    manifest = read_manifest(directory)['partitions']
+    assert manifest['2024-02']['rows'] == 2
+    assert manifest['2024-02']['max_date'] == '2024-02-09'
+    rows = load_partitioned(directory, start_date='2024-02-01')
+    assert [(row['transaction_id'], row['amount']) for row in rows] == [('2', -20.0), ('3', 5.0)]
+
+
+def test_mixed_currencies_are_kept(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    directory = str(tmp_path / 'book')
+    plain = make_transaction(1, '2024-01-05', 10.0)
+    euro = dict(make_transaction(2, '2024-01-06', 20.0), currency='EUR')
+    write_partitioned([plain, euro], directory)
+
+    pound = dict(make_transaction(3, '2024-01-07', 30.0), currency='GBP')
+    append_partitioned([pound], directory)
+
+    rows = load_partitioned(directory)
+    assert [(row['transaction_id'], row['currency']) for row in rows] == [('1', ''), ('2', 'EUR'), ('3', 'GBP')]
+
+
+def test_append_adds_currency_column_to_old_partition(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    directory = str(tmp_path / 'book')
+    write_partitioned([make_transaction(1, '2024-01-05', 10.0)], directory)
+    january = os.path.join(directory, '2024', '2024-01.csv')
+    with open(january, 'w', encoding='utf-8') as f:
+        f.write("transaction_id,date,customer_id,amount,type,description\n1,2024-01-05,1,10.00,credit,Deposit\n")
+
+    append_partitioned([dict(make_transaction(2, '2024-01-08', 5.0), currency='EUR')], directory)
+
+    rows = load_partitioned(directory)
+    assert [(row['transaction_id'], row['currency']) for row in rows] == [('1', ''), ('2', 'EUR')]
@@ -0,0 +1,75 @@
+import random
+
+from personal_finance_lib8 import bottom_transactions, detect_recurring_transactions, top_customers, top_transactions
+
+
+def sample_transactions(count=500):
+    generator = random.Random(3)
+    transactions = []
+    for transaction_id in range(1, count + 1):
+        transaction_type = generator.choice(['credit', 'debit', 'transfer'])
+        amount = round(generator.uniform(1, 50), 0)
+        transactions.append({
+            'transaction_id': str(transaction_id),
+            'date': f"2024-0{generator.randint(1, 3)}-15",
+            'customer_id': str(generator.randint(1, 20)),
+            'amount': -amount if transaction_type == 'debit' else amount,
+            'type': transaction_type
+        })
+    return transactions
+
+
+def test_top_transactions_match_full_sort():
+    transactions = sample_transactions()
+
+    expected = sorted(transactions, key=lambda transaction: abs(transaction['amount']), reverse=True)[:10]
+
+    assert top_transactions(transactions, 10) == expected
+    assert bottom_transactions(transactions, 10) == sorted(transactions, key=lambda transaction: abs(transaction['amount']))[:10]
+
+
+def test_top_transactions_filter_and_group():
+    transactions = sample_transactions()
+    transactions.append({'transaction_id': 'x', 'date': '2024-01-15', 'customer_id': '1', 'amount': 'bad', 'type': 'debit'})
+
+    grouped = top_transactions(transactions, 3, group_by='customer_id', transaction_type='debit', month='2024-02')
+
+    for customer_id, rows in grouped.items():
+        candidates = [transaction for transaction in transactions if transaction['customer_id'] == customer_id and transaction['type'] == 'debit' and transaction['date'].startswith('2024-02')]
+        assert rows == sorted(candidates, key=lambda transaction: abs(transaction['amount']), reverse=True)[:3]
+    assert top_transactions(transactions, 0) == []
+    assert top_transactions(transactions, 0, group_by='customer_id') == {}
+
+
+def test_top_customers_total_debits():
+    transactions = [
+        {'customer_id': '1', 'amount': -10.0, 'type': 'debit'},
+        {'customer_id': '2', 'amount': -25.0, 'type': 'debit'},
+        {'customer_id': '1', 'amount': -20.0, 'type': 'debit'},
+        {'customer_id': '3', 'amount': 500.0, 'type': 'credit'}
+    ]
+
+    assert top_customers(transactions, 2) == [('1', 30.0), ('2', 25.0)]
+    assert top_customers(transactions, 1, largest=False) == [('2', 25.0)]
+
+
+def test_detect_recurring_monthly_payment():
+    transactions = [
+        {'customer_id': '5', 'date': f"2024-{month:02d}-0{1 + month % 3}", 'amount': -9.99, 'type': 'debit', 'description': 'NETFLIX.com'}
+        for month in range(1, 7)
+    ]
+    transactions += [
+        {'customer_id': '5', 'date': '2024-01-10', 'amount': -30.0, 'type': 'debit', 'description': 'Dinner'},
+        {'customer_id': '5', 'date': '2024-02-25', 'amount': -30.0, 'type': 'debit', 'description': 'Dinner'},
+        {'customer_id': '5', 'date': '2024-03-02', 'amount': -30.0, 'type': 'debit', 'description': 'Dinner'},
+        {'customer_id': '6', 'date': 'not a date', 'amount': -9.99, 'type': 'debit', 'description': 'Netflix com'}
+    ]
+
+    recurring = detect_recurring_transactions(transactions)
+
+    assert len(recurring) == 1
+    assert recurring[0]['description'] == 'netflix com'
+    assert recurring[0]['occurrences'] == 6
+    assert recurring[0]['frequency'] == 'Monthly'
+    assert recurring[0]['last_date'] == '2024-06-01'
+    assert recurring[0]['next_expected_date'] > '2024-06-25'
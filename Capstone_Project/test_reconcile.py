@@ -0,0 +1,79 @@
+import csv
+import random
+
+from reconcile import AMOUNT_MISMATCH, INVALID_AMOUNT, MATCHED, MISSING_LEFT, MISSING_RIGHT, difference_row, iter_reconciled, reconcile_files
+
+
+def outcome(results):
+    return sorted((status, str(key), None if left is None else left['amount'], None if right is None else right['amount']) for status, key, left, right in results)
+
+
+def sample_books():
+    generator = random.Random(11)
+    left = []
+    right = []
+    for transaction_id in range(1, 301):
+        amount = round(generator.uniform(1, 100), 2)
+        row = {'transaction_id': str(transaction_id % 250), 'date': '2024-01-01', 'amount': amount, 'description': 'Row'}
+        if transaction_id % 7 != 0:
+            left.append(row)
+        if transaction_id % 11 != 0:
+            right.append(dict(row, amount=amount + (5 if transaction_id % 13 == 0 else 0.001)))
+    return left, right
+
+
+def test_statuses():
+    left = [{'transaction_id': '1', 'amount': 10.0}, {'transaction_id': '2', 'amount': 20.0}, {'transaction_id': '3', 'amount': 30.0}]
+    right = [{'transaction_id': '1', 'amount': 10.004}, {'transaction_id': '2', 'amount': 21.0}, {'transaction_id': '4', 'amount': 40.0}]
+
+    assert outcome(iter_reconciled(left, right)) == [
+        (AMOUNT_MISMATCH, '2', 20.0, 21.0),
+        (MATCHED, '1', 10.0, 10.004),
+        (MISSING_LEFT, '4', None, 40.0),
+        (MISSING_RIGHT, '3', 30.0, None)
+    ]
+
+
+def test_duplicate_keys_match_in_order():
+    left = [{'transaction_id': '1', 'amount': float(amount)} for amount in range(3000)]
+    right = [{'transaction_id': '1', 'amount': float(amount)} for amount in range(3002)]
+
+    results = list(iter_reconciled(left, right))
+
+    assert [status for status, _, _, _ in results] == [MATCHED] * 3000 + [MISSING_LEFT] * 2
+    assert [right['amount'] for _, _, _, right in results[-2:]] == [3000.0, 3001.0]
+
+
+def test_unreadable_amounts_never_match():
+    left = [{'transaction_id': '1', 'amount': 'abc'}, {'transaction_id': '2', 'amount': 0.0}]
+    right = [{'transaction_id': '1', 'amount': 0.0}, {'transaction_id': '2', 'amount': ''}]
+
+    results = list(iter_reconciled(left, right))
+
+    assert [(status, key) for status, key, _, _ in results] == [(INVALID_AMOUNT, '1'), (INVALID_AMOUNT, '2')]
+    assert difference_row(*results[0])[1:5] == ['1', 'abc', '0.00', '']
+
+
+def test_spilled_join_matches_in_memory_join(tmp_path):
+    left, right = sample_books()
+
+    in_memory = outcome(iter_reconciled(left, right))
+    spilled = outcome(iter_reconciled(left, right, max_build_rows=10, partitions=4, temp_dir=str(tmp_path)))
+
+    assert spilled == in_memory
+    assert {status for status, _, _, _ in in_memory} == {MATCHED, AMOUNT_MISMATCH, MISSING_LEFT, MISSING_RIGHT}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_reconcile_files_writes_differences(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    header = "transaction_id,date,customer_id,amount,type,description\n"
+    (tmp_path / 'ours.csv').write_text(header + "1,2024-01-02,5,10.00,debit,Coffee\n2,2024-01-03,5,20.00,credit,Refund\n", encoding='utf-8')
+    (tmp_path / 'bank.csv').write_text(header + "1,2024-01-02,5,10.00,debit,Coffee\n2,2024-01-03,5,25.00,credit,Refund\n3,2024-01-04,5,5.00,debit,Fee\n", encoding='utf-8')
+
+    counts = reconcile_files('ours.csv', 'bank.csv', 'differences.csv', keys=['transaction_id', 'date'])
+
+    assert counts == {MATCHED: 1, AMOUNT_MISMATCH: 1, MISSING_LEFT: 1, MISSING_RIGHT: 0, INVALID_AMOUNT: 0}
+    with open(tmp_path / 'differences.csv', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [(row['status'], row['key'], row['difference']) for row in rows] == [(AMOUNT_MISMATCH, '2|2024-01-03', '-5.00'), (MISSING_LEFT, '3|2024-01-04', '')]
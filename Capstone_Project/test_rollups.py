@@ -0,0 +1,64 @@
+import os
+
+import personal_finance_lib8
+from rollups import Rollups, rollup_filename
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'financial_transactions_short.csv')
+BOOK = (
+    "transaction_id,date,customer_id,amount,type,description\n"
+    "1,2024-01-02,5,100.00,credit,Salary\n"
+    "2,2024-01-03,5,40.00,debit,Groceries\n"
+    "3,2024-02-01,6,20.00,transfer,Savings\n"
+)
+
+
+def rounded(summary):
+    return {key: round(summary[key], 2) for key in ('total_credits', 'total_debits', 'total_transfers', 'net_balance')}
+
+
+def test_summary_matches_full_analysis(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    transactions = personal_finance_lib8.load_transactions(SAMPLE_FILE)
+
+    rollups = Rollups.from_transactions(transactions)
+
+    assert rounded(rollups.summary()) == rounded(personal_finance_lib8.analyze_transactions(transactions, return_data=True))
+    assert rollups.is_fresh(transactions)
+
+
+def test_incremental_changes_match_rebuild():
+    transactions = [
+        {'date': '2024-01-02', 'customer_id': '5', 'amount': 100.0, 'type': 'credit'},
+        {'date': '2024-01-03', 'customer_id': '5', 'amount': -40.0, 'type': 'debit'},
+        {'date': '2024-02-01', 'customer_id': '6', 'amount': 20.0, 'type': 'transfer'}
+    ]
+    rollups = Rollups.from_transactions(transactions, by_customer=True)
+    edited = dict(transactions[1], amount=-55.0, date='2024-02-03')
+
+    rollups.replace(transactions[1], edited)
+    rollups.remove(transactions[2])
+    rollups.add({'date': '2024-03-01', 'customer_id': '6', 'amount': -5.0, 'type': 'debit'})
+    rebuilt = Rollups.from_transactions([transactions[0], edited, {'date': '2024-03-01', 'customer_id': '6', 'amount': -5.0, 'type': 'debit'}], by_customer=True)
+
+    for grain in ('day', 'week', 'month'):
+        assert rollups.rows(grain) == rebuilt.rows(grain)
+        assert rollups.rows(grain, customer_id='5') == rebuilt.rows(grain, customer_id='5')
+    assert rollups.net_flow() == [('2024-01', 100.0), ('2024-02', -55.0), ('2024-03', -5.0)]
+    assert rollups.net_flow(start='2024-02', customer_id='6') == [('2024-03', -5.0)]
+
+
+def test_saved_rollups_go_stale_when_book_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    book_filename = str(tmp_path / 'book.csv')
+    with open(book_filename, 'w', encoding='utf-8') as f:
+        f.write(BOOK)
+
+    rollups = Rollups.for_book(book_filename)
+    assert os.path.exists(rollup_filename(book_filename))
+    assert Rollups.load(rollup_filename(book_filename), book_filename).rows() == rollups.rows()
+
+    with open(book_filename, 'a', encoding='utf-8') as f:
+        f.write("4,2024-02-05,6,10.00,debit,Fee\n")
+
+    assert not Rollups.load(rollup_filename(book_filename), book_filename).fresh
+    assert Rollups.for_book(book_filename).net_flow() == [('2024-01', 60.0), ('2024-02', 10.0)]
@@ -0,0 +1,126 @@
+import csv
+
+from shared_book import SharedBook
+
+BOOK = (
+    "transaction_id,date,customer_id,amount,type,description\n"
+    "1,2024-01-02,5,100.00,credit,Salary\n"
+    "2,2024-01-03,5,40.00,debit,Groceries\n"
+    "3,2024-01-04,6,75.50,debit,Utilities\n"
+)
+
+
+def write_book(tmp_path):
+    filename = tmp_path / 'book.csv'
+    filename.write_text(BOOK, encoding='utf-8')
+    return str(filename)
+
+
+def open_book(filename):
+    book = SharedBook(filename)
+    book.open()
+    return book
+
+
+def add(book, transaction_id, amount, description):
+    row = {'transaction_id': transaction_id, 'date': '2024-02-01', 'customer_id': '9', 'amount': amount, 'type': 'credit', 'description': description}
+    book.transactions.append(row)
+    book.add(row)
+    return row
+
+
+def update(book, transaction_id, **fields):
+    row = book.by_id[transaction_id]
+    previous = dict(row.items())
+    row.update(fields)
+    book.replace(previous, row)
+
+
+def rows_by_id(book):
+    return {transaction['transaction_id']: transaction for transaction in book.transactions}
+
+
+def test_pending_add_survives_other_sessions_compaction(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = write_book(tmp_path)
+    a, b = open_book(filename), open_book(filename)
+    add(a, '4', 10.0, 'From A')
+    a.save()
+    b.open()
+
+    add(b, '5', 20.0, 'From B')
+    add(a, '5', 30.0, 'Also from A')
+    a.save()
+    a.compact()
+    result = b.save()
+
+    assert result['renumbered'] == {'5': '6'}
+    descriptions = {transaction['transaction_id']: transaction['description'] for transaction in open_book(filename).transactions}
+    assert descriptions == {'1': 'Salary', '2': 'Groceries', '3': 'Utilities', '4': 'From A', '5': 'Also from A', '6': 'From B'}
+
+
+def test_session_opened_before_any_journal_sees_compacted_edits(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = write_book(tmp_path)
+    a, b = open_book(filename), open_book(filename)
+
+    update(a, '2', description='Groceries and milk')
+    a.save()
+    a.compact()
+    update(b, '3', description='Electricity')
+    b.save()
+    b.compact()
+
+    rows = rows_by_id(open_book(filename))
+    assert rows['2']['description'] == 'Groceries and milk'
+    assert rows['3']['description'] == 'Electricity'
+
+
+def test_menu_list_stays_current_after_rebase(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = write_book(tmp_path)
+    a, b = SharedBook(filename), open_book(filename)
+    transactions_data = a.open()
+
+    update(b, '1', description='Bonus')
+    b.save()
+    b.compact()
+    add(a, '4', 5.0, 'Cash')
+    a.save()
+
+    assert transactions_data is a.transactions
+    rows = rows_by_id(a)
+    assert rows['1']['description'] == 'Bonus'
+    assert rows['4']['description'] == 'Cash'
+
+
+def test_compaction_keeps_amounts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = write_book(tmp_path)
+    book = open_book(filename)
+    before = {key: transaction['amount'] for key, transaction in rows_by_id(book).items()}
+
+    book.compact()
+
+    assert {key: transaction['amount'] for key, transaction in rows_by_id(open_book(filename)).items()} == before
+    with open(filename, newline='', encoding='utf-8') as f:
+        assert [row['amount'] for row in csv.DictReader(f)] == ['100.00', '40.00', '75.50']
+
+
+def test_concurrent_edits_to_different_fields_are_merged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = write_book(tmp_path)
+    a, b = open_book(filename), open_book(filename)
+
+    update(a, '1', description='Salary (March)')
+    update(b, '1', customer_id='7')
+    update(b, '3', description='Power')
+    a.save()
+    update(a, '3', description='Gas')
+    a.save()
+    result = b.save()
+
+    assert len(result['conflicts']) == 1
+    rows = rows_by_id(open_book(filename))
+    assert (rows['1']['description'], rows['1']['customer_id']) == ('Salary (March)', '7')
+    assert rows['3']['description'] == 'Gas'
@@ -0,0 +1,49 @@
+import pytest
+
+from transaction_columns import NPY_ALIGNMENT, TransactionColumns, npy_header
+
+TRANSACTIONS = [
+    {'transaction_id': '1', 'date': '2024-01-02', 'customer_id': '5', 'amount': 100.0, 'type': 'credit', 'description': 'Salary', 'currency': ''},
+    {'transaction_id': '2', 'date': '1969-12-31', 'customer_id': '5', 'amount': -40.0, 'type': 'debit', 'description': 'Groceries', 'currency': 'EUR'},
+    {'transaction_id': '3', 'date': '2024-02-01', 'customer_id': 'C-7', 'amount': 20.5, 'type': 'transfer', 'description': 'Savings', 'currency': ''}
+]
+
+
+def test_columns_round_trip_rows():
+    columns = TransactionColumns.from_transactions(TRANSACTIONS)
+
+    assert len(columns) == 3
+    assert columns.row(1) == {**TRANSACTIONS[1], 'transaction_id': 2, 'customer_id': '5'}
+    assert [row['customer_id'] for row in columns.to_transactions()] == ['5', '5', 'C-7']
+    assert list(columns.column('amount').memoryview()) == [100.0, -40.0, 20.5]
+
+
+def test_npy_header_is_aligned():
+    assert len(npy_header('<f8', 12345)) % NPY_ALIGNMENT == 0
+
+
+def test_exported_columns_map_back(tmp_path):
+    columns = TransactionColumns.from_transactions(TRANSACTIONS)
+    columns.export_npy(str(tmp_path))
+
+    mapped = TransactionColumns.open_npy(str(tmp_path))
+
+    assert mapped.to_transactions() == columns.to_transactions()
+    with pytest.raises(ValueError):
+        mapped.append(TRANSACTIONS[0])
+
+
+def test_empty_export_maps_back(tmp_path):
+    TransactionColumns().export_npy(str(tmp_path))
+
+    assert TransactionColumns.open_npy(str(tmp_path)).to_transactions() == []
+
+
+def test_numpy_reads_exported_columns(tmp_path):
+    numpy = pytest.importorskip('numpy')
+    columns = TransactionColumns.from_transactions(TRANSACTIONS)
+    columns.export_npy(str(tmp_path))
+
+    assert numpy.load(tmp_path / 'amount.npy').tolist() == [100.0, -40.0, 20.5]
+    assert numpy.load(tmp_path / 'date.npy').astype(str).tolist() == ['2024-01-02', '1969-12-31', '2024-02-01']
+    assert numpy.asarray(columns.column('transaction_id')).tolist() == [1, 2, 3]
@@ -0,0 +1,104 @@
+import pickle
+
+import personal_finance_lib8
+from personal_finance_lib8 import ERROR_LOG_FILE
+from transaction_record import LazyTransaction, Transaction, parse_transaction_date
+
+BOOK = (
+    "transaction_id,date,customer_id,amount,type,description\n"
+    "1,2024-01-02,5,100.00,credit,Salary\n"
+    "2,01/03/2024,5,40.00,debit,Groceries\n"
+    "3,2024-13-45,6,12.00,debit,Bad date\n"
+    "4,2024-01-09,6,abc,debit,Bad amount\n"
+    "5,2024-02-01,5,20.00,transfer,Savings\n"
+)
+
+
+def test_parse_transaction_date_formats():
+    assert parse_transaction_date('2024-01-02') == '2024-01-02'
+    assert parse_transaction_date('02-01-2024') == '2024-01-02'
+    assert parse_transaction_date('01/02/2024') == '2024-01-02'
+    assert parse_transaction_date('2024-02-30') is None
+    assert parse_transaction_date('') is None
+
+
+def test_lazy_load_rejects_the_same_rows_as_eager_load(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = tmp_path / 'book.csv'
+    filename.write_text(BOOK, encoding='utf-8')
+
+    eager = personal_finance_lib8.load_transactions(str(filename), columns=['transaction_id', 'date', 'amount', 'type'])
+    lazy = personal_finance_lib8.load_transactions(str(filename), lazy=True)
+
+    assert [transaction['transaction_id'] for transaction in lazy] == ['1', '2', '5']
+    assert [transaction.get('amount') for transaction in lazy] == [transaction['amount'] for transaction in eager]
+    assert [transaction.get('date') for transaction in lazy] == ['2024-01-02', '2024-01-03', '2024-02-01']
+    assert personal_finance_lib8.analyze_transactions(lazy, return_data=True) == personal_finance_lib8.analyze_transactions(eager, return_data=True)
+    with open(ERROR_LOG_FILE, 'r', encoding='utf-8') as f:
+        log = f.read()
+    assert log.count("Skipping transaction 3. Invalid date format '2024-13-45'.") == 2
+    assert log.count("Could not convert amount 'abc' to float in transaction 4.") == 2
+
+
+def logged_messages():
+    with open(ERROR_LOG_FILE, 'r', encoding='utf-8') as f:
+        return [line.split('] ', 1)[1] for line in f]
+
+
+def test_projected_loads_log_the_same_errors_as_full_load(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    filename = tmp_path / 'book.csv'
+    filename.write_text(BOOK + "6,2024-02-02,5,,debit,Empty amount\n7,bad,5,xyz,refund,Everything wrong\n8,2024-02-03,5,abc,refund,Bad amount and type\n", encoding='utf-8')
+
+    personal_finance_lib8.initialize_error_log()
+    capsys.readouterr()
+    full = personal_finance_lib8.load_transactions(str(filename))
+    expected_log = logged_messages()[1:]
+    expected_output = capsys.readouterr().out
+    for options in ({'lazy': True}, {'lazy': True, 'columns': ['amount']}, {'columns': ['amount']}):
+        personal_finance_lib8.initialize_error_log()
+        capsys.readouterr()
+
+        projected = personal_finance_lib8.load_transactions(str(filename), **options)
+
+        assert [transaction['amount'] for transaction in projected] == [transaction['amount'] for transaction in full]
+        assert logged_messages()[1:] == expected_log
+        assert capsys.readouterr().out == expected_output
+
+
+def test_lazy_load_of_amount_only_keeps_every_valid_row(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = tmp_path / 'book.csv'
+    filename.write_text(BOOK, encoding='utf-8')
+
+    lazy = personal_finance_lib8.load_transactions(str(filename), lazy=True, columns=['amount'])
+
+    assert [transaction['amount'] for transaction in lazy] == [100.0, -40.0, 20.0]
+    assert 'description' not in lazy[0]
+    summary = personal_finance_lib8.analyze_transactions(lazy, return_data=True)
+    assert summary['net_balance'] == 80.0
+
+
+def test_lazy_and_compact_records_behave_like_dicts():
+    layout = {'transaction_id': 0, 'amount': 1, 'type': 2}
+    lazy = LazyTransaction(layout, ['7', '12.50', 'debit'], 'debit')
+    assert lazy.values() == ['7', -12.5, 'debit']
+    assert dict(lazy.items()) == {'transaction_id': '7', 'amount': -12.5, 'type': 'debit'}
+
+    record = Transaction('7', '2024-01-02', '3', -12.5, 'debit', 'Coffee')
+    assert record.get('amount') == -12.5
+    assert record.copy() == record.to_dict()
+
+
+def test_compact_load_matches_dict_load(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = tmp_path / 'book.csv'
+    filename.write_text(BOOK, encoding='utf-8')
+
+    rows = personal_finance_lib8.load_transactions(str(filename))
+    compact = personal_finance_lib8.load_transactions(str(filename), compact=True)
+
+    assert all(isinstance(transaction, Transaction) for transaction in compact)
+    assert [transaction.to_dict() for transaction in compact] == [{**row, 'currency': row.get('currency', '')} for row in rows]
+    assert compact[0].customer_id is compact[1].customer_id
+    assert pickle.loads(pickle.dumps(compact)) == compact
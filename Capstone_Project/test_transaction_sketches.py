@@ -0,0 +1,72 @@
+import random
+import statistics
+
+from transaction_sketches import CountMinSketch, HyperLogLog, QuantileSketch, TransactionSketches
+
+
+def test_distinct_count_is_close():
+    sketch = HyperLogLog()
+    for value in range(20000):
+        sketch.add(str(value))
+        sketch.add(str(value))
+
+    assert abs(sketch.count() - 20000) / 20000 < 0.03
+
+
+def test_merged_distinct_count_matches_single_sketch():
+    whole = HyperLogLog()
+    first = HyperLogLog()
+    second = HyperLogLog()
+    for value in range(10000):
+        whole.add(str(value))
+        (first if value % 2 else second).add(str(value))
+
+    first.merge(second)
+
+    assert first.count() == whole.count()
+    assert HyperLogLog.from_dict(first.to_dict()).count() == whole.count()
+
+
+def test_quantiles_are_close():
+    generator = random.Random(7)
+    values = [generator.uniform(0, 1000) for _ in range(50000)]
+    first = QuantileSketch(seed=1)
+    second = QuantileSketch(seed=2)
+    for index, value in enumerate(values):
+        (first if index % 2 else second).add(value)
+
+    first.merge(second)
+
+    assert abs(first.quantile(0.5) - statistics.median(values)) < 20
+    assert abs(first.quantile(0.9) - sorted(values)[int(len(values) * 0.9)]) < 20
+
+
+def test_heavy_hitters_find_busiest_keys():
+    sketch = CountMinSketch(top_k=3)
+    for key in range(500):
+        sketch.add(f"customer-{key}")
+    for _ in range(200):
+        sketch.add('busy')
+    for _ in range(100):
+        sketch.add('steady')
+
+    hitters = sketch.heavy_hitters(2)
+
+    assert [key for _, key in hitters] == ['busy', 'steady']
+    assert hitters[0][0] >= 200
+
+
+def test_sketches_round_trip_through_file(tmp_path):
+    sketches = TransactionSketches()
+    for transaction_id in range(1, 101):
+        sketches.update({'transaction_id': transaction_id, 'customer_id': str(transaction_id % 10), 'amount': -float(transaction_id), 'type': 'debit'})
+    sketches.update({'transaction_id': 101, 'customer_id': '1', 'amount': 'bad', 'type': 'debit'})
+    filename = tmp_path / 'sketches.json'
+
+    sketches.save(filename)
+    loaded = TransactionSketches.load(filename)
+
+    assert loaded.rows == 100
+    assert loaded.customers.count() == 10
+    assert loaded.debits.quantile(0.5) == sketches.debits.quantile(0.5)
+    assert loaded.report_lines() == sketches.report_lines()
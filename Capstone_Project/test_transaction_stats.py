@@ -0,0 +1,72 @@
+import statistics
+
+from transaction_stats import RunningStats, TransactionStats
+
+
+def make_transaction(transaction_id, amount, transaction_type, customer_id='C1'):
+    return {
+        'transaction_id': transaction_id,
+        'customer_id': customer_id,
+        'date': f'2024-01-{transaction_id:02d}',
+        'amount': amount,
+        'type': transaction_type
+    }
+
+
+def test_running_stats_match_statistics_module():
+    values = [12.5, -3.0, 40.25, 7.0, 7.0, 19.75]
+    running = RunningStats()
+    for value in values:
+        running.update(value)
+    assert running.count == len(values)
+    assert abs(running.mean - statistics.mean(values)) < 1e-9
+    assert abs(running.variance() - statistics.variance(values)) < 1e-9
+    assert (running.min, running.max) == (min(values), max(values))
+
+
+def test_merge_matches_single_pass():
+    values = [5.0, 8.0, -2.0, 11.0, 3.5, 9.0, 4.0]
+    left, right, whole = RunningStats(), RunningStats(), RunningStats()
+    for index, value in enumerate(values):
+        (left if index < 3 else right).update(value)
+        whole.update(value)
+    left.merge(right)
+    assert left.count == whole.count
+    assert abs(left.mean - whole.mean) < 1e-9
+    assert abs(left.variance() - whole.variance()) < 1e-9
+
+
+def test_outlier_debit_is_flagged_among_credits():
+    stats = TransactionStats()
+    transaction_id = 1
+    for _ in range(5):
+        stats.update(make_transaction(transaction_id, 2500.0, 'credit'))
+        stats.update(make_transaction(transaction_id + 1, -20.0, 'debit'))
+        transaction_id += 2
+    stats.update(make_transaction(transaction_id, -21.0, 'debit'))
+    outlier = stats.update(make_transaction(transaction_id + 1, -900.0, 'debit'))
+
+    assert outlier is not None
+    assert outlier['transaction_id'] == transaction_id + 1
+    assert [item['transaction_id'] for item in stats.flagged] == [transaction_id + 1]
+
+
+def test_credits_are_not_flagged_by_default():
+    stats = TransactionStats()
+    for transaction_id in range(1, 7):
+        stats.update(make_transaction(transaction_id, 10.0 + transaction_id, 'credit'))
+    assert stats.update(make_transaction(7, 5000.0, 'credit')) is None
+    assert stats.flagged == []
+
+
+def test_constant_history_still_flags_a_large_debit():
+    stats = TransactionStats()
+    for transaction_id in range(1, 7):
+        assert stats.update(make_transaction(transaction_id, -20.0, 'debit')) is None
+        assert stats.update(make_transaction(transaction_id, -20.0, 'debit', customer_id='C2')) is None
+
+    flagged = stats.update(make_transaction(7, -9000.0, 'debit'))
+
+    assert flagged is not None
+    assert flagged['transaction_id'] == 7
+    assert stats.update(make_transaction(7, -22.0, 'debit', customer_id='C2')) is None
@@ -0,0 +1,71 @@
+import csv
+import io
+import zipfile
+
+import personal_finance_lib8
+from xlsx_io import MAIN_NS, column_index, column_letter, iter_xlsx_rows, iter_xlsx_values, parse_sheet, write_xlsx
+
+FIELDNAMES = ['transaction_id', 'date', 'customer_id', 'amount', 'type', 'description']
+ROWS = [
+    {'transaction_id': '1', 'date': '2024-01-02', 'customer_id': '5', 'amount': '100.00', 'type': 'credit', 'description': 'Salary & <bonus>'},
+    {'transaction_id': '2', 'date': '2024-01-03', 'customer_id': '5', 'amount': '40.00', 'type': 'debit', 'description': 'Café "Zoë"'},
+    {'transaction_id': '3', 'date': '2024-01-04', 'customer_id': '0042', 'amount': '1e3', 'type': 'transfer', 'description': ' padded '}
+]
+
+
+def test_column_letters_round_trip():
+    for index in (0, 25, 26, 701, 702, 16383):
+        assert column_index(column_letter(index) + '12') == index
+
+
+def test_rows_round_trip(tmp_path):
+    filename = tmp_path / 'book.xlsx'
+
+    assert write_xlsx(ROWS, str(filename), FIELDNAMES) == 3
+
+    assert list(iter_xlsx_rows(str(filename))) == ROWS
+
+
+def test_small_read_chunks_give_the_same_rows(tmp_path):
+    filename = tmp_path / 'book.xlsx'
+    rows = [dict(ROWS[index % 3], transaction_id=str(index)) for index in range(500)]
+    write_xlsx(rows, str(filename), FIELDNAMES)
+
+    assert list(iter_xlsx_values(str(filename), chunk_size=7)) == list(iter_xlsx_values(str(filename)))
+
+
+def test_xlsx_book_loads_like_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    csv_filename = tmp_path / 'book.csv'
+    with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(ROWS)
+    xlsx_filename = tmp_path / 'book.xlsx'
+    write_xlsx(ROWS, str(xlsx_filename), FIELDNAMES)
+
+    assert personal_finance_lib8.load_transactions(str(xlsx_filename)) == personal_finance_lib8.load_transactions(str(csv_filename))
+
+
+def test_formulas_and_phonetic_hints_are_not_read_as_values():
+    sheet = (
+        f'<worksheet xmlns="{MAIN_NS}"><sheetData><row r="1">'
+        '<c r="A1"><v>1</v></c>'
+        '<c r="B1"><f>A1*2</f><v>2</v></c>'
+        '<c r="C1" t="str"><f>"a"&amp;"b"</f><v>ab</v></c>'
+        '<c r="E1" t="inlineStr"><is><r><t>Caf</t></r><r><t>\u00e9</t></r><rPh sb="0" eb="1"><t>KAFE</t></rPh></is></c>'
+        '<c r="F1" t="s"><v>0</v></c>'
+        '</row></sheetData></worksheet>'
+    ).encode('utf-8')
+
+    assert list(parse_sheet(io.BytesIO(sheet), ['shared'], chunk_size=5)) == [['1', '2', 'ab', '', 'Caf\u00e9', 'shared']]
+
+
+def test_ids_keep_leading_zeros(tmp_path):
+    filename = tmp_path / 'book.xlsx'
+    write_xlsx(ROWS, str(filename), FIELDNAMES)
+
+    with zipfile.ZipFile(filename) as archive:
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert '<v>0042</v>' not in sheet
+    assert [row['customer_id'] for row in iter_xlsx_rows(str(filename))] == ['5', '5', '0042']
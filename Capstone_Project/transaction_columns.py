@@ -0,0 +1,218 @@
+import argparse
+import ast
+import json
+import mmap
+import os
+import sys
+from array import array
+from datetime import date, timedelta
+
+ENDIAN = '<' if sys.byteorder == 'little' else '>'
+EPOCH = date(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+NPY_MAGIC = b'\x93NUMPY\x01\x00'
+NPY_ALIGNMENT = 64
+MANIFEST_FILE = 'columns.json'
+
+INTEGER_COLUMNS = ('transaction_id', 'customer_id')
+CATEGORY_COLUMNS = ('type', 'description', 'currency')
+COLUMN_NAMES = ('transaction_id', 'date', 'customer_id', 'amount', 'type', 'description', 'currency')
+
+# array typecode -> NumPy typestr; dates are stored as int64 days since 1970-01-01 (datetime64[D]).
+TYPESTRS = {'q': 'i8', 'd': 'f8', 'i': 'i4'}
+
+
+class Column:
+    def __init__(self, name, values, typestr, categories=None):
+        self.name = name
+        self.values = values
+        self.typestr = typestr
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, position):
+        value = self.values[position]
+        if self.categories is not None:
+            return self.categories[value]
+        if self.typestr.endswith('M8[D]'):
+            return (EPOCH + timedelta(days=value)).isoformat()
+        return value
+
+    def memoryview(self):
+        return memoryview(self.values)
+
+    @property
+    def __array_interface__(self):
+        return {
+            'version': 3,
+            'shape': (len(self.values),),
+            'typestr': self.typestr,
+            'data': memoryview(self.values),
+        }
+
+
+class TransactionColumns:
+    def __init__(self):
+        self.arrays = {
+            'transaction_id': array('q'),
+            'date': array('q'),
+            'customer_id': array('q'),
+            'amount': array('d'),
+            'type': array('i'),
+            'description': array('i'),
+            'currency': array('i'),
+        }
+        self.categories = {name: [] for name in CATEGORY_COLUMNS}
+        self.codes = {name: {} for name in CATEGORY_COLUMNS}
+        self.date_cache = {}
+        self.read_only = False
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        columns = cls()
+        columns.extend(transactions)
+        return columns
+
+    @classmethod
+    def from_file(cls, filename):
+        import personal_finance_lib8
+        return cls.from_transactions(personal_finance_lib8.iter_transactions(filename))
+
+    def __len__(self):
+        return len(self.arrays['amount'])
+
+    def category_code(self, name, value):
+        codes = self.codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = len(self.categories[name])
+            codes[value] = code
+            self.categories[name].append(value)
+        return code
+
+    def encode_as_categories(self, name):
+        values = self.arrays[name]
+        self.categories[name] = []
+        self.codes[name] = {}
+        codes = array('i', (self.category_code(name, str(value)) for value in values))
+        self.arrays[name] = codes
+
+    def day_number(self, value):
+        days = self.date_cache.get(value)
+        if days is None:
+            days = date.fromisoformat(str(value)).toordinal() - EPOCH_ORDINAL
+            self.date_cache[value] = days
+        return days
+
+    def append(self, transaction):
+        if self.read_only:
+            raise ValueError("Memory-mapped columns are read-only.")
+        arrays = self.arrays
+        for name in INTEGER_COLUMNS:
+            value = transaction.get(name, '')
+            if name in self.codes:
+                arrays[name].append(self.category_code(name, str(value)))
+                continue
+            try:
+                arrays[name].append(int(value))
+            except (ValueError, TypeError):
+                self.encode_as_categories(name)
+                arrays[name].append(self.category_code(name, str(value)))
+        arrays['date'].append(self.day_number(transaction.get('date', '')))
+        arrays['amount'].append(float(transaction.get('amount', 0) or 0))
+        for name in CATEGORY_COLUMNS:
+            arrays[name].append(self.category_code(name, transaction.get(name) or ''))
+
+    def extend(self, transactions):
+        for transaction in transactions:
+            self.append(transaction)
+
+    def column(self, name):
+        values = self.arrays[name]
+        if name == 'date':
+            return Column(name, values, f"{ENDIAN}M8[D]")
+        return Column(name, values, ENDIAN + TYPESTRS[values.typecode if isinstance(values, array) else values.format], self.categories.get(name))
+
+    def columns(self):
+        return {name: self.column(name) for name in COLUMN_NAMES}
+
+    def row(self, position):
+        return {name: self.column(name)[position] for name in COLUMN_NAMES}
+
+    def to_transactions(self):
+        columns = self.columns()
+        return [{name: column[position] for name, column in columns.items()} for position in range(len(self))]
+
+    def export_npy(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        manifest = {'rows': len(self), 'columns': {}}
+        for name, column in self.columns().items():
+            filename = f"{name}.npy"
+            write_npy(os.path.join(directory, filename), column)
+            manifest['columns'][name] = {'file': filename, 'typestr': column.typestr, 'categories': column.categories}
+        with open(os.path.join(directory, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        return manifest
+
+    @classmethod
+    def open_npy(cls, directory):
+        with open(os.path.join(directory, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        columns = cls()
+        for name, entry in manifest['columns'].items():
+            columns.arrays[name] = map_npy(os.path.join(directory, entry['file']))
+            if entry['categories'] is not None:
+                columns.categories[name] = entry['categories']
+                columns.codes[name] = {}
+            else:
+                columns.categories.pop(name, None)
+                columns.codes.pop(name, None)
+        columns.read_only = True
+        return columns
+
+
+def npy_header(typestr, rows):
+    header = f"{{'descr': '{typestr}', 'fortran_order': False, 'shape': ({rows},), }}"
+    padding = NPY_ALIGNMENT - (len(NPY_MAGIC) + 2 + len(header) + 1) % NPY_ALIGNMENT
+    header = header + ' ' * (padding % NPY_ALIGNMENT) + '\n'
+    return NPY_MAGIC + len(header).to_bytes(2, 'little') + header.encode('latin1')
+
+
+def write_npy(filename, column):
+    with open(filename, 'wb') as f:
+        f.write(npy_header(column.typestr, len(column)))
+        f.write(column.memoryview())
+
+
+def map_npy(filename):
+    with open(filename, 'rb') as f:
+        if f.read(len(NPY_MAGIC)) != NPY_MAGIC:
+            raise ValueError(f"'{filename}' is not a version 1.0 .npy file.")
+        header_length = int.from_bytes(f.read(2), 'little')
+        header = ast.literal_eval(f.read(header_length).decode('latin1'))
+        offset = len(NPY_MAGIC) + 2 + header_length
+        typestr = header['descr']
+        if typestr[0] != ENDIAN:
+            raise ValueError(f"'{filename}' was written with a different byte order.")
+        typecode = 'q' if 'M8' in typestr else next(code for code, name in TYPESTRS.items() if name == typestr[1:])
+        if os.fstat(f.fileno()).st_size == offset:
+            return array(typecode)
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped)[offset:].cast(typecode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a transactions file as memory-mappable .npy columns.")
+    parser.add_argument('input', help="CSV or XLSX file to export")
+    parser.add_argument('directory', help="directory for the .npy files and columns.json")
+    args = parser.parse_args()
+
+    columns = TransactionColumns.from_file(args.input)
+    columns.export_npy(args.directory)
+    print(f"Exported {len(columns)} transactions as {len(COLUMN_NAMES)} columns to '{args.directory}'.")
+
+
+if __name__ == '__main__':
+    main()
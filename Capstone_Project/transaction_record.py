@@ -0,0 +1,227 @@
+import sys
+from datetime import date, datetime
+
+TRANSACTION_SLOTS = ('transaction_id', 'date', 'customer_id', 'amount', 'type', 'description', 'currency')
+DATE_FORMATS = ["%Y-%m-%d", "%d-%m-%Y", "%m/%d/%Y"]
+VALID_TYPES = ("credit", "debit", "transfer")
+
+
+def parse_transaction_date(date_str):
+    # Most dates are already YYYY-MM-DD, which date.fromisoformat checks
+    # much faster than strptime.
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            date.fromisoformat(date_str)
+            return date_str
+        except ValueError:
+            pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def signed_amount(amount_str, transaction_type):
+    amount = float(amount_str) if amount_str else 0.0
+    if transaction_type == "debit":
+        return amount * -1
+    return amount
+
+
+class Transaction:
+    __slots__ = TRANSACTION_SLOTS
+
+    def __init__(self, transaction_id='', date='', customer_id='', amount=0.0, type='', description='', currency=''):
+        self.transaction_id = transaction_id
+        self.date = date
+        self.customer_id = customer_id
+        self.amount = amount
+        self.type = type
+        self.description = description
+        self.currency = currency
+
+    @classmethod
+    def from_mapping(cls, mapping, interner=None):
+        values = [mapping.get(field, '') for field in TRANSACTION_SLOTS]
+        if interner is not None:
+            interner.intern_values(values)
+        return cls(*values)
+
+    def get(self, key, default=None):
+        if key in TRANSACTION_SLOTS:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key):
+        if key not in TRANSACTION_SLOTS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in TRANSACTION_SLOTS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in TRANSACTION_SLOTS
+
+    def __iter__(self):
+        return iter(TRANSACTION_SLOTS)
+
+    def __len__(self):
+        return len(TRANSACTION_SLOTS)
+
+    def keys(self):
+        return dict.fromkeys(TRANSACTION_SLOTS).keys()
+
+    def values(self):
+        return [getattr(self, field) for field in TRANSACTION_SLOTS]
+
+    def items(self):
+        return [(field, getattr(self, field)) for field in TRANSACTION_SLOTS]
+
+    def copy(self):
+        return Transaction(*self.values())
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, Transaction):
+            return self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Transaction({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (Transaction, tuple(self.values()))
+
+
+class LazyTransaction:
+    __slots__ = ('layout', 'fields', 'transaction_type', 'parsed')
+
+    def __init__(self, layout, fields, transaction_type):
+        self.layout = layout
+        self.fields = fields
+        self.transaction_type = transaction_type
+        self.parsed = None
+
+    def raw(self, key):
+        position = self.layout.get(key)
+        if position is None or position >= len(self.fields):
+            return ''
+        return self.fields[position]
+
+    def parse(self, key):
+        raw_value = self.raw(key)
+        if key == 'type':
+            return self.transaction_type
+        if key == 'date':
+            return parse_transaction_date(raw_value.strip())
+        if key == 'amount':
+            try:
+                return signed_amount(raw_value.strip(), self.transaction_type)
+            except ValueError:
+                return None
+        return raw_value
+
+    def get(self, key, default=None):
+        if key not in self.layout:
+            return default
+        if self.parsed is None:
+            self.parsed = {}
+        elif key in self.parsed:
+            return self.parsed[key]
+        value = self.parse(key)
+        self.parsed[key] = value
+        return value
+
+    def __getitem__(self, key):
+        if key not in self.layout:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.layout:
+            raise KeyError(key)
+        if self.parsed is None:
+            self.parsed = {}
+        self.parsed[key] = value
+
+    def __contains__(self, key):
+        return key in self.layout
+
+    def __iter__(self):
+        return iter(self.layout)
+
+    def __len__(self):
+        return len(self.layout)
+
+    def keys(self):
+        return self.layout.keys()
+
+    def values(self):
+        return [self.get(key) for key in self.layout]
+
+    def items(self):
+        return [(key, self.get(key)) for key in self.layout]
+
+    def copy(self):
+        return self.to_dict()
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"LazyTransaction({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (dict, (self.to_dict(),))
+
+
+class StringInterner:
+    def __init__(self, fields=('date', 'customer_id', 'type', 'description', 'currency')):
+        self.fields = fields
+        self.positions = [TRANSACTION_SLOTS.index(field) for field in fields]
+        self.pool = {}
+
+    def intern(self, value):
+        if not isinstance(value, str):
+            return value
+        return self.pool.setdefault(value, value)
+
+    def intern_values(self, values):
+        setdefault = self.pool.setdefault
+        for position in self.positions:
+            value = values[position]
+            if isinstance(value, str):
+                values[position] = setdefault(value, value)
+        return values
+
+    def intern_transaction(self, transaction):
+        for field in self.fields:
+            transaction[field] = self.intern(transaction.get(field))
+        return transaction
+
+
+def deep_size(objects):
+    seen = set()
+    total = sys.getsizeof(objects)
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, Transaction):
+            stack.extend(obj.values())
+    return total
@@ -0,0 +1,332 @@
+import base64
+import hashlib
+import heapq
+import json
+import math
+import random
+from array import array
+from multiprocessing import Pool
+
+import personal_finance_lib8
+
+SKETCH_VERSION = 1
+
+
+def hash64(value, seed=0):
+    digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8, salt=seed.to_bytes(8, 'little')).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class HyperLogLog:
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18.")
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = bytearray(self.num_registers)
+
+    def add(self, value):
+        hashed = hash64(value)
+        index = hashed >> (64 - self.precision)
+        remaining = (hashed << self.precision) & 0xFFFFFFFFFFFFFFFF
+        rank = 1
+        while rank <= 64 - self.precision and not remaining & (1 << 63):
+            remaining = (remaining << 1) & 0xFFFFFFFFFFFFFFFF
+            rank += 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = self.num_registers
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        elif m == 64:
+            alpha = 0.709
+        elif m == 32:
+            alpha = 0.697
+        else:
+            alpha = 0.673
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))
+        return round(estimate)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision.")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def to_dict(self):
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(bytes(self.registers)).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['precision'])
+        sketch.registers = bytearray(base64.b64decode(data['registers']))
+        return sketch
+
+
+class QuantileSketch:
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.compactors = [[]]
+        self.random = random.Random(seed)
+
+    def capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def add(self, value):
+        value = float(value)
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.compactors[0].append(value)
+        if len(self.compactors[0]) >= self.capacity(0):
+            self.compress()
+
+    def compress(self):
+        for level in range(len(self.compactors)):
+            if len(self.compactors[level]) >= self.capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                items = sorted(self.compactors[level])
+                offset = self.random.randint(0, 1)
+                self.compactors[level + 1].extend(items[offset::2])
+                self.compactors[level] = []
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        self.compress()
+
+    def weighted_items(self):
+        items = []
+        for level, compactor in enumerate(self.compactors):
+            weight = 1 << level
+            items.extend((value, weight) for value in compactor)
+        items.sort()
+        return items
+
+    def quantile(self, q):
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1.")
+        if self.count == 0:
+            return None
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+
+        items = self.weighted_items()
+        total_weight = sum(weight for _, weight in items)
+        target = q * total_weight
+        running = 0
+        for value, weight in items:
+            running += weight
+            if running >= target:
+                return value
+        return self.max
+
+    def to_dict(self):
+        return {
+            'k': self.k,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'compactors': self.compactors
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['k'])
+        sketch.count = data['count']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        sketch.compactors = [list(items) for items in data['compactors']]
+        return sketch
+
+
+class CountMinSketch:
+    def __init__(self, width=2048, depth=5, top_k=20):
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.tables = [array('q', [0]) * width for _ in range(depth)]
+        self.candidates = {}
+
+    def positions(self, key):
+        hashed = hash64(key)
+        first = hashed & 0xFFFFFFFF
+        second = hashed >> 32
+        return [(first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, key, count=1):
+        positions = self.positions(key)
+        for row, position in enumerate(positions):
+            self.tables[row][position] += count
+        self.track(key, min(self.tables[row][position] for row, position in enumerate(positions)))
+
+    def estimate(self, key):
+        return min(self.tables[row][position] for row, position in enumerate(self.positions(key)))
+
+    def track(self, key, estimate):
+        if key in self.candidates or len(self.candidates) < self.top_k * 2:
+            self.candidates[key] = estimate
+            return
+        smallest_key = min(self.candidates, key=self.candidates.get)
+        if estimate > self.candidates[smallest_key]:
+            del self.candidates[smallest_key]
+            self.candidates[key] = estimate
+
+    def heavy_hitters(self, n=None):
+        n = n or self.top_k
+        return heapq.nlargest(n, ((self.estimate(key), key) for key in self.candidates))
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge count-min sketches with different dimensions.")
+        for row in range(self.depth):
+            table = self.tables[row]
+            other_table = other.tables[row]
+            for position in range(self.width):
+                table[position] += other_table[position]
+        keys = set(self.candidates) | set(other.candidates)
+        self.candidates = {}
+        for estimate, key in heapq.nlargest(self.top_k * 2, ((self.estimate(key), key) for key in keys)):
+            self.candidates[key] = estimate
+
+    def to_dict(self):
+        return {
+            'width': self.width,
+            'depth': self.depth,
+            'top_k': self.top_k,
+            'tables': [base64.b64encode(table.tobytes()).decode('ascii') for table in self.tables],
+            'candidates': self.candidates
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['width'], data['depth'], data['top_k'])
+        sketch.tables = []
+        for encoded in data['tables']:
+            table = array('q')
+            table.frombytes(base64.b64decode(encoded))
+            sketch.tables.append(table)
+        sketch.candidates = dict(data['candidates'])
+        return sketch
+
+
+class TransactionSketches:
+    def __init__(self, precision=14, k=200, width=2048, depth=5, top_k=20):
+        self.rows = 0
+        self.customers = HyperLogLog(precision)
+        self.amounts = QuantileSketch(k)
+        self.debits = QuantileSketch(k)
+        self.customer_counts = CountMinSketch(width, depth, top_k)
+
+    def update(self, transaction):
+        try:
+            amount = float(transaction.get('amount', 0))
+        except (ValueError, TypeError):
+            return
+        customer_id = transaction.get('customer_id', 'unknown')
+        self.rows += 1
+        self.customers.add(customer_id)
+        self.amounts.add(amount)
+        if transaction.get('type') == 'debit':
+            self.debits.add(abs(amount))
+        self.customer_counts.add(customer_id)
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.customers.merge(other.customers)
+        self.amounts.merge(other.amounts)
+        self.debits.merge(other.debits)
+        self.customer_counts.merge(other.customer_counts)
+
+    def to_dict(self):
+        return {
+            'version': SKETCH_VERSION,
+            'rows': self.rows,
+            'customers': self.customers.to_dict(),
+            'amounts': self.amounts.to_dict(),
+            'debits': self.debits.to_dict(),
+            'customer_counts': self.customer_counts.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != SKETCH_VERSION:
+            raise ValueError(f"Unsupported sketch version: {data.get('version')}")
+        sketches = cls()
+        sketches.rows = data['rows']
+        sketches.customers = HyperLogLog.from_dict(data['customers'])
+        sketches.amounts = QuantileSketch.from_dict(data['amounts'])
+        sketches.debits = QuantileSketch.from_dict(data['debits'])
+        sketches.customer_counts = CountMinSketch.from_dict(data['customer_counts'])
+        return sketches
+
+    def save(self, filename):
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def report_lines(self, heavy_hitters=10):
+        lines = ["Approximate Analytics: \n"]
+        if self.rows == 0:
+            lines.append("No transactions sketched. \n")
+            return lines
+
+        lines.append(f"- Rows Sketched: {self.rows}\n")
+        lines.append(f"- Distinct Customers (approx.): {self.customers.count()}\n")
+        for label, q in (("Median", 0.5), ("90th Percentile", 0.9), ("99th Percentile", 0.99)):
+            value = self.debits.quantile(q)
+            if value is not None:
+                lines.append(f"- {label} Debit (approx.): ${value:.2f}\n")
+        lines.append("- Most Active Customers (approx.): \n")
+        for estimate, customer_id in self.customer_counts.heavy_hitters(heavy_hitters):
+            lines.append(f"  * Customer {customer_id}: ~{estimate} transactions\n")
+        return lines
+
+
+def sketch_file(filename):
+    sketches = TransactionSketches()
+    for transaction in personal_finance_lib8.iter_transactions(filename):
+        sketches.update(transaction)
+    return sketches
+
+
+def sketch_files(filenames, processes=None):
+    filenames = list(filenames)
+    if processes == 1 or len(filenames) < 2:
+        results = [sketch_file(filename) for filename in filenames]
+    else:
+        with Pool(processes) as pool:
+            results = pool.map(sketch_file, filenames)
+
+    combined = TransactionSketches()
+    for sketches in results:
+        combined.merge(sketches)
+    return combined
@@ -0,0 +1,195 @@
+import math
+
+DEFAULT_Z_THRESHOLD = 3.0
+DEFAULT_MIN_HISTORY = 5
+MIN_STD_DEV = 0.01
+MIN_STD_DEV_FRACTION = 0.1
+
+
+class RunningStats:
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'last_seen')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.last_seen = None
+
+    def update(self, value, date=None):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if date and (self.last_seen is None or date > self.last_seen):
+            self.last_seen = date
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean
+            self.m2 = other.m2
+            self.min = other.min
+            self.max = other.max
+            self.last_seen = other.last_seen
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if other.last_seen and (self.last_seen is None or other.last_seen > self.last_seen):
+            self.last_seen = other.last_seen
+
+    def variance(self):
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    def std_dev(self):
+        return math.sqrt(self.variance())
+
+    def z_score(self, value):
+        # A history of identical amounts has no spread at all, so the spread
+        # is floored at a cent or 10% of the usual amount; small changes stay
+        # unremarkable while a large jump still stands out.
+        std_dev = max(self.std_dev(), MIN_STD_DEV, abs(self.mean) * MIN_STD_DEV_FRACTION)
+        return (value - self.mean) / std_dev
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'variance': self.variance(),
+            'std_dev': self.std_dev(),
+            'min': self.min,
+            'max': self.max,
+            'last_seen': self.last_seen
+        }
+
+
+class TransactionStats:
+    def __init__(self, z_threshold=DEFAULT_Z_THRESHOLD, min_history=DEFAULT_MIN_HISTORY, debits_only=True):
+        self.z_threshold = z_threshold
+        self.min_history = min_history
+        self.debits_only = debits_only
+        self.customers = {}
+        self.by_type = {}
+        self.overall = RunningStats()
+        self.flagged = []
+
+    def update(self, transaction):
+        try:
+            amount = float(transaction.get('amount', 0))
+        except (ValueError, TypeError):
+            return None
+
+        customer_id = transaction.get('customer_id', 'unknown')
+        date = transaction.get('date')
+        transaction_type = transaction.get('type')
+        customer_stats = self.customers.get(customer_id)
+        if customer_stats is None:
+            customer_stats = RunningStats()
+            self.customers[customer_id] = customer_stats
+        # Credits and debits are scored separately, so a mix of the two does
+        # not inflate the variance that debits are compared against.
+        type_stats = self.by_type.get((customer_id, transaction_type))
+        if type_stats is None:
+            type_stats = RunningStats()
+            self.by_type[(customer_id, transaction_type)] = type_stats
+
+        flagged = None
+        is_candidate = not self.debits_only or transaction_type == 'debit'
+        if is_candidate and type_stats.count >= self.min_history:
+            z_score = type_stats.z_score(amount)
+            if abs(z_score) > self.z_threshold:
+                flagged = {
+                    'transaction_id': transaction.get('transaction_id', 'N/A'),
+                    'customer_id': customer_id,
+                    'date': date,
+                    'amount': amount,
+                    'z_score': z_score
+                }
+                self.flagged.append(flagged)
+
+        customer_stats.update(amount, date)
+        type_stats.update(amount, date)
+        self.overall.update(amount, date)
+        return flagged
+
+    def merge(self, other):
+        for customer_id, other_stats in other.customers.items():
+            customer_stats = self.customers.get(customer_id)
+            if customer_stats is None:
+                customer_stats = RunningStats()
+                self.customers[customer_id] = customer_stats
+            customer_stats.merge(other_stats)
+        for key, other_stats in other.by_type.items():
+            type_stats = self.by_type.get(key)
+            if type_stats is None:
+                type_stats = RunningStats()
+                self.by_type[key] = type_stats
+            type_stats.merge(other_stats)
+        self.overall.merge(other.overall)
+        self.flagged.extend(other.flagged)
+
+    def customer_summary(self, customer_id):
+        customer_stats = self.customers.get(customer_id)
+        if customer_stats is None:
+            return {}
+        return customer_stats.to_dict()
+
+    def report_lines(self, max_flagged=20):
+        lines = ["Customer Statistics: \n"]
+        if self.overall.count == 0:
+            lines.append("No statistics collected. \n")
+            return lines
+
+        lines.append(f"- Customers Tracked: {len(self.customers)}\n")
+        lines.append(f"- Mean Amount: ${self.overall.mean:.2f}\n")
+        lines.append(f"- Std Dev: ${self.overall.std_dev():.2f}\n")
+        lines.append(f"- Min / Max: ${self.overall.min:.2f} / ${self.overall.max:.2f}\n")
+        lines.append(f"- Flagged Transactions (|z| > {self.z_threshold:g}): {len(self.flagged)}\n")
+
+        ranked = sorted(self.flagged, key=lambda item: abs(item['z_score']), reverse=True)
+        for item in ranked[:max_flagged]:
+            lines.append(f"  * ID {item['transaction_id']} | Customer {item['customer_id']} | {item['date']} | ${item['amount']:.2f} | z={item['z_score']:.2f}\n")
+        return lines
+
+
+class IncrementalSummary:
+    def __init__(self):
+        self.totals_by_type = {}
+        self.net_balance = 0.0
+        self.count = 0
+
+    def apply(self, transaction, sign=1):
+        try:
+            amount = float(transaction.get('amount', 0))
+        except (ValueError, TypeError):
+            return
+        transaction_type = str(transaction.get('type', 'unknown')).lower()
+        self.totals_by_type[transaction_type] = self.totals_by_type.get(transaction_type, 0.0) + sign * amount
+        self.net_balance += sign * amount
+        self.count += sign
+
+    def to_dict(self):
+        return {
+            "total_credits": self.totals_by_type.get('credit', 0.0),
+            "total_debits": self.totals_by_type.get('debit', 0.0),
+            "total_transfers": self.totals_by_type.get('transfer', 0.0),
+            "net_balance": self.net_balance,
+            "totals_by_type": dict(self.totals_by_type),
+            "count": self.count
+        }
@@ -0,0 +1,68 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+import tracemalloc
+
+import personal_finance_lib8
+from memory_benchmark import write_sample_file
+from xlsx_io import iter_xlsx_rows
+
+DEFAULT_ROWS = 500000
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def streaming_peak(function, filename):
+    tracemalloc.start()
+    count = sum(1 for _ in function(filename))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare loading and saving transactions as CSV and as XLSX.")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS)
+    parser.add_argument('--file', default='xlsx_benchmark.csv', help="sample CSV file to create (kept if it already exists)")
+    parser.add_argument('--peak-rows', type=int, default=50000, help="rows used for the streaming memory check")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"Writing {args.rows} sample transactions to '{args.file}'...")
+        write_sample_file(args.file, args.rows)
+
+    base, _ = os.path.splitext(args.file)
+    csv_copy = f"{base}.copy.csv"
+    xlsx_copy = f"{base}.xlsx"
+
+    transactions, elapsed = timed(personal_finance_lib8.load_transactions, args.file)
+    print(f"load CSV : {len(transactions)} transactions in {elapsed:.2f}s ({len(transactions) / elapsed:,.0f} rows/s)")
+
+    for label, filename in (("save CSV ", csv_copy), ("save XLSX", xlsx_copy)):
+        _, elapsed = timed(personal_finance_lib8.save_transactions, transactions, filename)
+        print(f"{label}: {elapsed:.2f}s, {os.path.getsize(filename) / 1024 / 1024:.1f} MiB on disk")
+
+    loaded, elapsed = timed(personal_finance_lib8.load_transactions, xlsx_copy)
+    print(f"load XLSX: {len(loaded)} transactions in {elapsed:.2f}s ({len(loaded) / elapsed:,.0f} rows/s)")
+    reloaded, _ = timed(personal_finance_lib8.load_transactions, csv_copy)
+    print(f"XLSX rows match the CSV copy: {loaded == reloaded}")
+
+    small = f"{base}.small.xlsx"
+    timed(personal_finance_lib8.save_transactions, transactions[:args.peak_rows], small)
+    for label, filename in (("small", small), ("full ", xlsx_copy)):
+        count, peak = streaming_peak(iter_xlsx_rows, filename)
+        print(f"stream XLSX {label}: {count} rows, peak {peak / 1024 / 1024:.1f} MiB traced")
+
+    for filename in (csv_copy, xlsx_copy, small):
+        os.remove(filename)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+import math
+import posixpath
+import zipfile
+from datetime import date, timedelta
+from xml.etree.ElementTree import iterparse
+from xml.parsers import expat
+from xml.sax.saxutils import escape
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+TEXT_TAG = f'{{{MAIN_NS}}}t'
+SHARED_ITEM_TAG = f'{{{MAIN_NS}}}si'
+PHONETIC_TAG = f'{{{MAIN_NS}}}rPh'
+EXPAT_ROW = f'{MAIN_NS} row'
+EXPAT_CELL = f'{MAIN_NS} c'
+EXPAT_VALUE = f'{MAIN_NS} v'
+EXPAT_TEXT = f'{MAIN_NS} t'
+EXPAT_PHONETIC = f'{MAIN_NS} rPh'
+EXCEL_EPOCH = date(1899, 12, 30)
+
+# IDs are written as text so values such as '0042' keep their leading zeros.
+NUMERIC_FIELDS = ('amount',)
+SHARED_STRING_FIELDS = ('date', 'customer_id', 'type', 'description', 'currency')
+MAX_SHARED_STRINGS = 1000000
+READ_CHUNK_SIZE = 1 << 16
+
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '</Types>'
+)
+ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{PACKAGE_REL_NS}">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{PACKAGE_REL_NS}">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+    '</Relationships>'
+)
+
+
+def is_xlsx(filename):
+    return str(filename).lower().endswith('.xlsx')
+
+
+def column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_index(reference):
+    index = 0
+    for char in reference:
+        if char.isdigit():
+            break
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+
+def is_number(text):
+    try:
+        return math.isfinite(float(text)) and text.strip() == text
+    except ValueError:
+        return False
+
+
+class XLSXWriter:
+    def __init__(self, filename, fieldnames, sheet_name='Transactions', shared_fields=SHARED_STRING_FIELDS, numeric_fields=NUMERIC_FIELDS):
+        self.filename = filename
+        self.fieldnames = list(fieldnames)
+        self.sheet_name = sheet_name
+        self.letters = [column_letter(position) for position in range(len(self.fieldnames))]
+        self.shared = [field in shared_fields for field in self.fieldnames]
+        self.numeric = [field in numeric_fields for field in self.fieldnames]
+        self.strings = {}
+        self.string_count = 0
+        self.row_number = 0
+        self.archive = zipfile.ZipFile(filename, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.sheet = self.archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True)
+        self.sheet.write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<worksheet xmlns="{MAIN_NS}" xmlns:r="{REL_NS}"><sheetData>'.encode('utf-8')
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def shared_index(self, text):
+        index = self.strings.get(text)
+        if index is None:
+            if len(self.strings) >= MAX_SHARED_STRINGS:
+                return None
+            index = len(self.strings)
+            self.strings[text] = index
+        self.string_count += 1
+        return index
+
+    def write_values(self, values):
+        self.row_number += 1
+        row = str(self.row_number)
+        cells = []
+        for letter, numeric, shared, value in zip(self.letters, self.numeric, self.shared, values):
+            text = '' if value is None else str(value)
+            if numeric and is_number(text):
+                cells.append(f'<c r="{letter}{row}"><v>{text}</v></c>')
+                continue
+            index = self.shared_index(text) if shared else None
+            if index is not None:
+                cells.append(f'<c r="{letter}{row}" t="s"><v>{index}</v></c>')
+            else:
+                cells.append(f'<c r="{letter}{row}" t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>')
+        self.sheet.write(f'<row r="{row}">{"".join(cells)}</row>'.encode('utf-8'))
+
+    def writeheader(self):
+        self.row_number += 1
+        cells = [f'<c r="{letter}1" t="inlineStr"><is><t>{escape(field)}</t></is></c>' for letter, field in zip(self.letters, self.fieldnames)]
+        self.sheet.write(f'<row r="1">{"".join(cells)}</row>'.encode('utf-8'))
+
+    def writerow(self, row):
+        self.write_values([row.get(field, '') for field in self.fieldnames])
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def close(self):
+        if self.archive is None:
+            return
+        self.sheet.write(b'</sheetData></worksheet>')
+        self.sheet.close()
+
+        with self.archive.open('xl/sharedStrings.xml', 'w', force_zip64=True) as f:
+            f.write(
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<sst xmlns="{MAIN_NS}" count="{self.string_count}" uniqueCount="{len(self.strings)}">'.encode('utf-8')
+            )
+            for text in self.strings:
+                f.write(f'<si><t xml:space="preserve">{escape(text)}</t></si>'.encode('utf-8'))
+            f.write(b'</sst>')
+
+        self.archive.writestr('[Content_Types].xml', CONTENT_TYPES_XML)
+        self.archive.writestr('_rels/.rels', ROOT_RELS_XML)
+        self.archive.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS_XML)
+        self.archive.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}"><sheets>'
+            f'<sheet name="{escape(self.sheet_name, {chr(34): "&quot;"})}" sheetId="1" r:id="rId1"/>'
+            '</sheets></workbook>'
+        ))
+        self.archive.close()
+        self.archive = None
+        self.strings = {}
+
+
+def write_xlsx(rows, filename, fieldnames, sheet_name='Transactions'):
+    count = 0
+    with XLSXWriter(filename, fieldnames, sheet_name) as writer:
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def find_sheet_path(archive, sheet=None):
+    sheets = []
+    with archive.open('xl/workbook.xml') as f:
+        for _, elem in iterparse(f):
+            if elem.tag == f'{{{MAIN_NS}}}sheet':
+                sheets.append((elem.get('name'), elem.get(f'{{{REL_NS}}}id')))
+
+    targets = {}
+    with archive.open('xl/_rels/workbook.xml.rels') as f:
+        for _, elem in iterparse(f):
+            if elem.tag == f'{{{PACKAGE_REL_NS}}}Relationship':
+                targets[elem.get('Id')] = elem.get('Target')
+
+    if not sheets:
+        raise ValueError("The workbook does not contain any sheets.")
+    if sheet is None:
+        relationship = sheets[0][1]
+    else:
+        matches = [relationship for name, relationship in sheets if name == sheet]
+        if not matches:
+            raise ValueError(f"Sheet '{sheet}' not found. Available sheets: {', '.join(name for name, _ in sheets)}.")
+        relationship = matches[0]
+
+    target = targets[relationship]
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join('xl', target))
+
+
+def read_shared_strings(archive):
+    strings = []
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return strings
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _, elem in iterparse(f):
+            if elem.tag == SHARED_ITEM_TAG:
+                strings.append(item_text(elem))
+                elem.clear()
+    return strings
+
+
+def item_text(elem):
+    parts = []
+    for child in elem.iter():
+        if child.tag == PHONETIC_TAG:
+            break
+        if child.tag == TEXT_TAG and child.text:
+            parts.append(child.text)
+    return ''.join(parts)
+
+
+def serial_to_date(text):
+    try:
+        return (EXCEL_EPOCH + timedelta(days=int(float(text)))).isoformat()
+    except (ValueError, OverflowError):
+        return text
+
+
+def iter_xlsx_values(filename, sheet=None, chunk_size=READ_CHUNK_SIZE):
+    with zipfile.ZipFile(filename) as archive:
+        shared_strings = read_shared_strings(archive)
+        with archive.open(find_sheet_path(archive, sheet)) as f:
+            yield from parse_sheet(f, shared_strings, chunk_size)
+
+
+def parse_sheet(f, shared_strings, chunk_size=READ_CHUNK_SIZE):
+    finished_rows = []
+    values = []
+    parts = []
+    positions = {}
+    # reference, type, inside <v> or <t>, inside <rPh>
+    cell = [None, None, False, False]
+
+    def start_element(name, attrs):
+        if name == EXPAT_CELL:
+            cell[0] = attrs.get('r')
+            cell[1] = attrs.get('t')
+        elif name == EXPAT_VALUE or (name == EXPAT_TEXT and not cell[3]):
+            # Only cached values and inline text are read; formula text in
+            # <f> and phonetic hints in <rPh> are skipped.
+            cell[2] = True
+        elif name == EXPAT_PHONETIC:
+            cell[3] = True
+        elif name == EXPAT_ROW:
+            values.clear()
+
+    def character_data(data):
+        if cell[2]:
+            parts.append(data)
+
+    def end_element(name):
+        if name == EXPAT_VALUE or name == EXPAT_TEXT:
+            cell[2] = False
+        elif name == EXPAT_PHONETIC:
+            cell[3] = False
+        elif name == EXPAT_CELL:
+            text = ''.join(parts)
+            parts.clear()
+            cell_type = cell[1]
+            if cell_type == 's':
+                text = shared_strings[int(text)]
+            elif cell_type == 'b':
+                text = 'TRUE' if text == '1' else 'FALSE'
+            reference = cell[0]
+            if reference:
+                letters = reference.rstrip('0123456789')
+                position = positions.get(letters)
+                if position is None:
+                    position = positions[letters] = column_index(letters)
+                if position > len(values):
+                    values.extend([''] * (position - len(values)))
+            values.append(text)
+        elif name == EXPAT_ROW:
+            finished_rows.append(values[:])
+
+    parser = expat.ParserCreate(namespace_separator=' ')
+    parser.buffer_text = True
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+
+    while True:
+        chunk = f.read(chunk_size)
+        parser.Parse(chunk, not chunk)
+        yield from finished_rows
+        finished_rows.clear()
+        if not chunk:
+            return
+
+
+def iter_xlsx_rows(filename, sheet=None):
+    fieldnames = None
+    for values in iter_xlsx_values(filename, sheet):
+        if fieldnames is None:
+            fieldnames = [value.strip() for value in values]
+            continue
+        if not any(values):
+            continue
+        row = dict(zip(fieldnames, values))
+        for field in fieldnames[len(values):]:
+            row[field] = ''
+        if 'date' in row and is_number(row['date']):
+            row['date'] = serial_to_date(row['date'])
+        yield row
@@ -231,6 +231,33 @@ progress_bar: Callable[..., Option] = partial(
     help="Specify whether the progress bar should be used [on, off, raw] (default: on)",
 )
 
+parallel_downloads: Callable[..., Option] = partial(
+    Option,
+    "--parallel-downloads",
+    dest="parallel_downloads",
+    type="int",
+    metavar="n",
+    default=1,
+    help=(
+        "Maximum number of files to download at the same time (default: 1). "
+        "At most 10 connections are opened to any single host."
+    ),
+)
+
+prefetch_workers: Callable[..., Option] = partial(
+    Option,
+    "--prefetch-workers",
+    dest="prefetch_workers",
+    type="int",
+    metavar="n",
+    default=0,
+    help=(
+        "Number of threads looking up the dependencies of packages on the "
+        "index while the resolver works on other packages (default: 0, "
+        "disabled). This does not change the packages that are selected."
+    ),
+)
+
 log: Callable[..., Option] = partial(
     PipOption,
     "--log",
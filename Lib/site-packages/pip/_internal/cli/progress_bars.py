@@ -1,6 +1,8 @@
 import functools
 import sys
-from typing import Callable, Generator, Iterable, Iterator, Optional, Tuple
+import threading
+from types import TracebackType
+from typing import Callable, Generator, Iterable, Iterator, Optional, Tuple, Type
 
 from pip._vendor.rich.progress import (
     BarColumn,
@@ -9,6 +11,7 @@ from pip._vendor.rich.progress import (
     Progress,
     ProgressColumn,
     SpinnerColumn,
+    TaskID,
     TextColumn,
     TimeElapsedColumn,
     TimeRemainingColumn,
@@ -92,3 +95,157 @@ def get_download_progress_renderer(
         return functools.partial(_raw_progress_bar, size=size)
     else:
         return iter  # no-op, when passed an iterator
+
+
+class BatchDownloadProgress:
+    """Aggregated progress for several downloads running at the same time.
+
+    ``track`` may be called from any thread. Every tracked download counts
+    towards the totals; ``visible=False`` hides its own bar. This base class
+    displays nothing.
+    """
+
+    def __enter__(self) -> "BatchDownloadProgress":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        pass
+
+    def track(
+        self,
+        iterable: Iterable[bytes],
+        *,
+        description: str,
+        size: Optional[int],
+        visible: bool = True,
+    ) -> Iterator[bytes]:
+        return iter(iterable)
+
+
+class _RichBatchDownloadProgress(BatchDownloadProgress):
+    def __init__(self, total_files: int) -> None:
+        self._total_files = total_files
+        self._finished_files = 0
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._progress = Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TextColumn("eta"),
+            TimeRemainingColumn(),
+            refresh_per_second=5,
+        )
+        self._overall: Optional[TaskID] = None
+
+    def _overall_description(self) -> str:
+        indent = " " * (get_indentation() + 2)
+        return f"{indent}{self._finished_files}/{self._total_files} files"
+
+    def __enter__(self) -> "BatchDownloadProgress":
+        self._progress.start()
+        self._overall = self._progress.add_task(
+            self._overall_description(), total=None
+        )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._progress.stop()
+
+    def track(
+        self,
+        iterable: Iterable[bytes],
+        *,
+        description: str,
+        size: Optional[int],
+        visible: bool = True,
+    ) -> Iterator[bytes]:
+        assert self._overall is not None
+        with self._lock:
+            if size:
+                self._total_bytes += size
+                self._progress.update(self._overall, total=self._total_bytes)
+        indent = " " * (get_indentation() + 4)
+        task_id = self._progress.add_task(
+            f"{indent}{description}", total=size, visible=visible
+        )
+        try:
+            for chunk in iterable:
+                yield chunk
+                self._progress.update(task_id, advance=len(chunk))
+                with self._lock:
+                    if not size:
+                        # Grow the total with files of unknown size so the
+                        # overall bar never runs past it.
+                        self._total_bytes += len(chunk)
+                        self._progress.update(
+                            self._overall, total=self._total_bytes
+                        )
+                    self._progress.update(self._overall, advance=len(chunk))
+        finally:
+            self._progress.remove_task(task_id)
+            with self._lock:
+                self._finished_files += 1
+                self._progress.update(
+                    self._overall, description=self._overall_description()
+                )
+
+
+class _RawBatchDownloadProgress(BatchDownloadProgress):
+    def __init__(self) -> None:
+        self._current = 0
+        self._total = 0
+        self._lock = threading.Lock()
+        self._rate_limiter = RateLimiter(0.25)
+
+    def _write_progress(self) -> None:
+        sys.stdout.write("Progress %d of %d\n" % (self._current, self._total))
+        sys.stdout.flush()
+
+    def track(
+        self,
+        iterable: Iterable[bytes],
+        *,
+        description: str,
+        size: Optional[int],
+        visible: bool = True,
+    ) -> Iterator[bytes]:
+        with self._lock:
+            self._total += size or 0
+            self._write_progress()
+        for chunk in iterable:
+            with self._lock:
+                self._current += len(chunk)
+                if not size:
+                    self._total += len(chunk)
+                if self._rate_limiter.ready() or self._current == self._total:
+                    self._write_progress()
+                    self._rate_limiter.reset()
+            yield chunk
+
+
+def get_batch_download_progress(
+    *, bar_type: str, total_files: int
+) -> BatchDownloadProgress:
+    """Get a progress display shared by concurrent downloads.
+
+    Unlike ``get_download_progress_renderer``, a single display is used for the
+    whole batch, since rich only allows one live display at a time.
+    """
+    if bar_type == "on":
+        return _RichBatchDownloadProgress(total_files)
+    elif bar_type == "raw":
+        return _RawBatchDownloadProgress()
+    else:
+        return BatchDownloadProgress()
@@ -136,6 +136,7 @@ class RequirementCommand(IndexGroupCommand):
             build_tracker=build_tracker,
             session=session,
             progress_bar=options.progress_bar,
+            parallel_downloads=options.parallel_downloads,
             finder=finder,
             require_hashes=options.require_hashes,
             use_user_site=use_user_site,
@@ -186,6 +187,7 @@ class RequirementCommand(IndexGroupCommand):
                 force_reinstall=force_reinstall,
                 upgrade_strategy=upgrade_strategy,
                 py_version_info=py_version_info,
+                prefetch_workers=options.prefetch_workers,
             )
         import pip._internal.resolution.legacy.resolver
 
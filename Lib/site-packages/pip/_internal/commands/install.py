@@ -218,6 +218,45 @@ class InstallCommand(RequirementCommand):
             help="Do not compile Python source files to bytecode",
         )
 
+        self.cmd_opts.add_option(
+            "--compile-workers",
+            dest="compile_workers",
+            type="int",
+            metavar="n",
+            default=1,
+            help=(
+                "Number of processes used to compile Python source files to "
+                "bytecode (default %default). Use 0 for one per CPU."
+            ),
+        )
+
+        self.cmd_opts.add_option(
+            "--defer-compile",
+            action="store_true",
+            dest="defer_compile",
+            default=False,
+            help=(
+                "Finish bytecode compilation after all packages are unpacked, "
+                "instead of after each package, so compiling overlaps with "
+                "unpacking. Only used with more than one compile worker."
+            ),
+        )
+
+        self.cmd_opts.add_option(
+            "--install-workers",
+            dest="install_workers",
+            type="int",
+            metavar="n",
+            default=1,
+            help=(
+                "Number of packages installed at the same time (default "
+                "%default). Use 0 for one per CPU. A package is only installed "
+                "once the packages it depends on are. Installs run in threads, "
+                "which overlap file I/O but do not spread CPU-bound work over "
+                "all cores; use --compile-workers for bytecode compilation."
+            ),
+        )
+
         self.cmd_opts.add_option(
             "--no-warn-script-location",
             action="store_false",
@@ -237,6 +276,8 @@ class InstallCommand(RequirementCommand):
         self.cmd_opts.add_option(cmdoptions.prefer_binary())
         self.cmd_opts.add_option(cmdoptions.require_hashes())
         self.cmd_opts.add_option(cmdoptions.progress_bar())
+        self.cmd_opts.add_option(cmdoptions.parallel_downloads())
+        self.cmd_opts.add_option(cmdoptions.prefetch_workers())
         self.cmd_opts.add_option(cmdoptions.root_user_action())
 
         index_opts = cmdoptions.make_option_group(
@@ -454,6 +495,12 @@ class InstallCommand(RequirementCommand):
             if options.target_dir or options.prefix_path:
                 warn_script_location = False
 
+            dependencies = None
+            if options.install_workers != 1:
+                dependencies = resolver.get_installation_dependencies(
+                    requirement_set
+                )
+
             installed = install_given_reqs(
                 to_install,
                 global_options,
@@ -463,6 +510,10 @@ class InstallCommand(RequirementCommand):
                 warn_script_location=warn_script_location,
                 use_user_site=options.use_user_site,
                 pycompile=options.compile,
+                compile_workers=options.compile_workers,
+                defer_compile=options.defer_compile,
+                dependencies=dependencies,
+                install_workers=options.install_workers,
             )
 
             lib_locations = get_lib_location_guesses(
@@ -67,6 +67,8 @@ class WheelCommand(RequirementCommand):
         self.cmd_opts.add_option(cmdoptions.ignore_requires_python())
         self.cmd_opts.add_option(cmdoptions.no_deps())
         self.cmd_opts.add_option(cmdoptions.progress_bar())
+        self.cmd_opts.add_option(cmdoptions.parallel_downloads())
+        self.cmd_opts.add_option(cmdoptions.prefetch_workers())
 
         self.cmd_opts.add_option(
             "--no-verify",
@@ -4,14 +4,16 @@ The main purpose of this module is to expose LinkCollector.collect_sources().
 
 import collections
 import email.message
+import email.utils
 import functools
+import hashlib
 import itertools
 import json
 import logging
 import os
 import urllib.parse
 import urllib.request
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from html.parser import HTMLParser
 from optparse import Values
 from typing import (
@@ -41,6 +43,7 @@ from pip._internal.utils.filetypes import is_archive_file
 from pip._internal.utils.misc import redact_auth_from_url
 from pip._internal.vcs import vcs
 
+from .link_cache import LinkCache
 from .sources import CandidatesFromPage, LinkSource, build_source
 
 logger = logging.getLogger(__name__)
@@ -110,7 +113,9 @@ def _ensure_api_response(url: str, session: PipSession) -> None:
     _ensure_api_header(resp)
 
 
-def _get_simple_response(url: str, session: PipSession) -> Response:
+def _get_simple_response(
+    url: str, session: PipSession, headers: Optional[Dict[str, str]] = None
+) -> Response:
     """Access an Simple API response with GET, and return the response.
 
     This consists of three parts:
@@ -122,6 +127,9 @@ def _get_simple_response(url: str, session: PipSession) -> Response:
     2. Actually perform the request. Raise HTTP exceptions on network failures.
     3. Check the Content-Type header to make sure we got a Simple API response,
        and raise `_NotAPIContent` otherwise.
+
+    Extra ``headers`` (e.g. for a conditional request) are sent with the GET.
+    A 304 Not Modified response is returned without the Content-Type check.
     """
     if is_archive_file(Link(url).filename):
         _ensure_api_response(url, session=session)
@@ -152,10 +160,15 @@ def _get_simple_response(url: str, session: PipSession) -> Response:
             # once per 10 minutes.
             # For more information, please see pypa/pip#5670.
             "Cache-Control": "max-age=0",
+            **(headers or {}),
         },
     )
     raise_for_status(resp)
 
+    if resp.status_code == 304:
+        logger.debug("Page %s was not modified", redact_auth_from_url(url))
+        return resp
+
     # The check for archives above only works if the url ends with
     # something that looks like an archive. However that is not a
     # requirement of an url. Unless we issue a HEAD request on every
@@ -258,6 +271,11 @@ class IndexContent:
     :param cache_link_parsing: whether links parsed from this page's url
                                should be cached. PyPI index urls should
                                have this set to False, for example.
+    :param validator: the response's ETag or Last-Modified header, used to
+                      tell whether links parsed earlier are still current.
+    :param cached_links: the links parsed earlier, when the server answered a
+                         conditional request with 304 Not Modified (in which
+                         case ``content`` is empty).
     """
 
     content: bytes
@@ -265,6 +283,8 @@ class IndexContent:
     encoding: Optional[str]
     url: str
     cache_link_parsing: bool = True
+    validator: Optional[str] = None
+    cached_links: Optional[List[Link]] = field(default=None, compare=False)
 
     def __str__(self) -> str:
         return redact_auth_from_url(self.url)
@@ -312,16 +332,33 @@ def _make_index_content(
     response: Response, cache_link_parsing: bool = True
 ) -> IndexContent:
     encoding = _get_encoding_from_headers(response.headers)
+    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
     return IndexContent(
         response.content,
         response.headers["Content-Type"],
         encoding=encoding,
         url=response.url,
         cache_link_parsing=cache_link_parsing,
+        validator=validator,
     )
 
 
-def _get_index_content(link: Link, *, session: PipSession) -> Optional["IndexContent"]:
+def _conditional_headers(validator: Optional[str]) -> Dict[str, str]:
+    """Headers asking the server to answer 304 if the page is unchanged."""
+    if validator is None or validator.startswith("sha256:"):
+        return {}
+    # ETags are quoted, but some servers send them bare; anything that is not
+    # an HTTP date came from the ETag header.
+    if validator.startswith(('"', 'W/"')):
+        return {"If-None-Match": validator}
+    if email.utils.parsedate_tz(validator) is None:
+        return {"If-None-Match": validator}
+    return {"If-Modified-Since": validator}
+
+
+def _get_index_content(
+    link: Link, *, session: PipSession, link_cache: Optional[LinkCache] = None
+) -> Optional["IndexContent"]:
     url = link.url.split("#", 1)[0]
 
     # Check for VCS schemes that do not support lookup as web pages.
@@ -348,8 +385,14 @@ def _get_index_content(link: Link, *, session: PipSession) -> Optional["IndexCon
         url = urllib.parse.urljoin(url, "index.html")
         logger.debug(" file: URL is directory, getting %s", url)
 
+    validator = None
+    if link_cache is not None:
+        validator = link_cache.validator(url)
+
     try:
-        resp = _get_simple_response(url, session=session)
+        resp = _get_simple_response(
+            url, session=session, headers=_conditional_headers(validator)
+        )
     except _NotHTTP:
         logger.warning(
             "Skipping page %s because it looks like an archive, and cannot "
@@ -378,7 +421,24 @@ def _get_index_content(link: Link, *, session: PipSession) -> Optional["IndexCon
     except requests.Timeout:
         _handle_get_simple_fail(link, "timed out")
     else:
-        return _make_index_content(resp, cache_link_parsing=link.cache_link_parsing)
+        if resp.status_code != 304:
+            return _make_index_content(
+                resp, cache_link_parsing=link.cache_link_parsing
+            )
+        assert link_cache is not None and validator is not None
+        cached_links = link_cache.get(url, validator)
+        if cached_links is None:
+            # The entry was replaced or evicted since it was revalidated.
+            return _get_index_content(link, session=session)
+        return IndexContent(
+            b"",
+            "",
+            encoding=None,
+            url=url,
+            cache_link_parsing=link.cache_link_parsing,
+            validator=validator,
+            cached_links=cached_links,
+        )
     return None
 
 
@@ -399,9 +459,11 @@ class LinkCollector:
         self,
         session: PipSession,
         search_scope: SearchScope,
+        link_cache: Optional[LinkCache] = None,
     ) -> None:
         self.search_scope = search_scope
         self.session = session
+        self.link_cache = link_cache
 
     @classmethod
     def create(
@@ -431,9 +493,14 @@ class LinkCollector:
             index_urls=index_urls,
             no_index=options.no_index,
         )
+        link_cache = None
+        if options.cache_dir:
+            link_cache = LinkCache(os.path.join(options.cache_dir, "links-v1"))
+
         link_collector = LinkCollector(
             session=session,
             search_scope=search_scope,
+            link_cache=link_cache,
         )
         return link_collector
 
@@ -445,7 +512,30 @@ class LinkCollector:
         """
         Fetch an HTML page containing package links.
         """
-        return _get_index_content(location, session=self.session)
+        return _get_index_content(
+            location, session=self.session, link_cache=self.link_cache
+        )
+
+    def parse_links(self, page: IndexContent) -> List[Link]:
+        """
+        Parse the links of a fetched page, reusing the links parsed by an
+        earlier run when the page has not changed since.
+        """
+        if page.cached_links is not None:
+            return page.cached_links
+        if self.link_cache is None:
+            return list(parse_links(page))
+
+        validator = page.validator
+        if validator is None:
+            validator = "sha256:" + hashlib.sha256(page.content).hexdigest()
+        links = self.link_cache.get(page.url, validator)
+        if links is None:
+            links = list(parse_links(page))
+            self.link_cache.set(page.url, validator, links)
+        else:
+            logger.debug("Using cached links for %s", page)
+        return links
 
     def collect_sources(
         self,
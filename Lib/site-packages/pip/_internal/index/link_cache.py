@@ -0,0 +1,189 @@
+"""Persistent cache of the links parsed from index pages.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from pip._vendor import msgpack
+
+from pip._internal.models.link import Link, LinkHash, MetadataFile
+from pip._internal.network.cache import suppressed_cache_errors
+from pip._internal.utils.filesystem import adjacent_tmp_file, replace
+from pip._internal.utils.misc import ensure_dir
+
+logger = logging.getLogger(__name__)
+
+# Bump when the entry format changes; old entries then stop matching.
+FORMAT_VERSION = 1
+
+DEFAULT_MAX_SIZE = 50 * 1024 * 1024
+
+
+def _encode_links(links: List[Link]) -> List[Any]:
+    """Encode links column by column.
+
+    The vendored msgpack is pure Python, so decoding time grows with the
+    number of objects rather than bytes. URLs are joined into one string
+    after their common prefix, Requires-Python is run-length encoded, and
+    rarer attributes are stored only for the links that have them.
+    """
+    urls = [link.url for link in links]
+    prefix = os.path.commonprefix(urls) if urls else ""
+    requires_python: List[List[Any]] = []
+    yanked: Dict[int, str] = {}
+    metadata: Dict[int, Optional[Dict[str, str]]] = {}
+    hashes: Dict[int, Dict[str, str]] = {}
+    for index, link in enumerate(links):
+        if requires_python and requires_python[-1][0] == link.requires_python:
+            requires_python[-1][1] += 1
+        else:
+            requires_python.append([link.requires_python, 1])
+        if link.yanked_reason is not None:
+            yanked[index] = link.yanked_reason
+        if link.metadata_file_data is not None:
+            metadata[index] = link.metadata_file_data.hashes
+        link_hash = LinkHash.find_hash_url_fragment(link.url)
+        if link._hashes != ({} if link_hash is None else link_hash.as_dict()):
+            hashes[index] = link._hashes
+    suffixes = "\n".join(url[len(prefix) :] for url in urls)
+    return [prefix, suffixes, len(urls), requires_python, yanked, metadata, hashes]
+
+
+def _decode_links(columns: List[Any], page_url: str) -> List[Link]:
+    prefix, suffixes, count, requires_python, yanked, metadata, hashes = columns
+    urls = [prefix + suffix for suffix in suffixes.split("\n")] if count else []
+    requires = [value for value, run in requires_python for _ in range(run)]
+    return [
+        Link(
+            url,
+            comes_from=page_url,
+            requires_python=requires[index],
+            yanked_reason=yanked.get(index),
+            metadata_file_data=(
+                MetadataFile(metadata[index]) if index in metadata else None
+            ),
+            hashes=hashes.get(index),
+        )
+        for index, url in enumerate(urls)
+    ]
+
+
+class LinkCache:
+    """
+    A size-bounded, on-disk cache of the links parsed from index pages.
+
+    Entries are keyed by page URL and stamped with the page's validator: its
+    ETag or Last-Modified header, or a digest of the content when the server
+    sends neither. The validator can be sent back to the server in a
+    conditional request; when the page comes back changed, it carries a new
+    validator and misses here.
+
+    When the cache grows beyond ``max_size`` bytes, the least recently used
+    entries (by modification time, which is refreshed on every hit) are
+    removed.
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        assert directory is not None, "Cache directory must not be None."
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._sizes: Optional[Dict[str, Tuple[float, int]]] = None
+        self._total_size = 0
+
+    def _get_cache_path(self, url: str) -> str:
+        hashed = hashlib.sha224(url.encode()).hexdigest()
+        return os.path.join(self.directory, hashed[:2], hashed)
+
+    def _read_header(self, f: BinaryIO) -> "Tuple[Optional[str], msgpack.Unpacker]":
+        unpacker = msgpack.Unpacker(f, raw=False, strict_map_key=False)
+        version, validator = next(unpacker)
+        if version != FORMAT_VERSION:
+            return None, unpacker
+        return validator, unpacker
+
+    def validator(self, url: str) -> Optional[str]:
+        """Return the validator of the entry for url, if there is one."""
+        path = self._get_cache_path(url)
+        try:
+            with open(path, "rb") as f:
+                validator, _ = self._read_header(f)
+        except OSError:
+            return None
+        except Exception as exc:
+            logger.debug("Ignoring unreadable link cache entry %s: %s", path, exc)
+            return None
+        return validator
+
+    def get(self, url: str, validator: str) -> Optional[List[Link]]:
+        """Return the links cached for url, if they have the given validator."""
+        path = self._get_cache_path(url)
+        try:
+            with open(path, "rb") as f:
+                entry_validator, unpacker = self._read_header(f)
+                if entry_validator != validator:
+                    return None
+                links = _decode_links(next(unpacker), url)
+        except OSError:
+            return None
+        except Exception as exc:
+            logger.debug("Ignoring unreadable link cache entry %s: %s", path, exc)
+            return None
+
+        with suppressed_cache_errors():
+            os.utime(path)
+            with self._lock:
+                if self._sizes is not None and path in self._sizes:
+                    self._sizes[path] = (os.path.getmtime(path), self._sizes[path][1])
+        return links
+
+    def set(self, url: str, validator: str, links: List[Link]) -> None:
+        path = self._get_cache_path(url)
+        packer = msgpack.Packer(use_bin_type=True)
+        data = packer.pack([FORMAT_VERSION, validator])
+        data += packer.pack(_encode_links(links))
+        with suppressed_cache_errors():
+            ensure_dir(os.path.dirname(path))
+            with adjacent_tmp_file(path) as f:
+                f.write(data)
+            replace(f.name, path)
+            self._record_write(path, len(data))
+
+    def _scan(self) -> Dict[str, Tuple[float, int]]:
+        sizes = {}
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                sizes[path] = (info.st_mtime, info.st_size)
+        return sizes
+
+    def _record_write(self, path: str, size: int) -> None:
+        with self._lock:
+            if self._sizes is None:
+                self._sizes = self._scan()
+                self._total_size = sum(entry[1] for entry in self._sizes.values())
+            else:
+                _, old_size = self._sizes.get(path, (0.0, 0))
+                self._total_size += size - old_size
+                self._sizes[path] = (os.path.getmtime(path), size)
+            if self._total_size > self.max_size:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries, down to 90% of max_size."""
+        assert self._sizes is not None
+        target = self.max_size * 9 // 10
+        for path, (_, size) in sorted(self._sizes.items(), key=lambda i: i[1][0]):
+            if self._total_size <= target:
+                break
+            with suppressed_cache_errors():
+                os.remove(path)
+            del self._sizes[path]
+            self._total_size -= size
@@ -20,7 +20,7 @@ from pip._internal.exceptions import (
     InvalidWheelFilename,
     UnsupportedWheel,
 )
-from pip._internal.index.collector import LinkCollector, parse_links
+from pip._internal.index.collector import LinkCollector
 from pip._internal.models.candidate import InstallationCandidate
 from pip._internal.models.format_control import FormatControl
 from pip._internal.models.link import Link
@@ -40,6 +40,9 @@ from pip._internal.utils.unpacking import SUPPORTED_EXTENSIONS
 if TYPE_CHECKING:
     from pip._vendor.typing_extensions import TypeGuard
 
+    from pip._internal.index.prefetch import CandidatePrefetcher
+    from pip._internal.network.session import PipSession
+
 __all__ = ["FormatControl", "BestCandidateResult", "PackageFinder"]
 
 
@@ -619,6 +622,9 @@ class PackageFinder:
         # These are boring links that have already been logged somehow.
         self._logged_links: Set[Tuple[Link, LinkType, str]] = set()
 
+        # Looks up candidates ahead of find_all_candidates(), if set.
+        self.prefetcher: Optional["CandidatePrefetcher"] = None
+
     # Don't include an allow_yanked default value to make sure each call
     # site considers whether yanked releases are allowed. This also causes
     # that decision to be made explicit in the calling code, which helps
@@ -675,6 +681,10 @@ class PackageFinder:
     def index_urls(self) -> List[str]:
         return self.search_scope.index_urls
 
+    @property
+    def session(self) -> "PipSession":
+        return self._link_collector.session
+
     @property
     def trusted_hosts(self) -> Iterable[str]:
         for host_port in self._link_collector.session.pip_trusted_origins:
@@ -785,7 +795,7 @@ class PackageFinder:
         if index_response is None:
             return []
 
-        page_links = list(parse_links(index_response))
+        page_links = self._link_collector.parse_links(index_response)
 
         with indent_log():
             package_links = self.evaluate_links(
@@ -805,6 +815,14 @@ class PackageFinder:
         See LinkEvaluator.evaluate_link() for details on which files
         are accepted.
         """
+        if self.prefetcher is not None:
+            candidates = self.prefetcher.take(project_name)
+            if candidates is not None:
+                return candidates
+        return self.collect_all_candidates(project_name)
+
+    def collect_all_candidates(self, project_name: str) -> List[InstallationCandidate]:
+        """Like find_all_candidates(), without caching or prefetching."""
         link_evaluator = self.make_link_evaluator(project_name)
 
         collected_sources = self._link_collector.collect_sources(
@@ -0,0 +1,170 @@
+"""Find the candidates of projects ahead of the resolver.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from types import TracebackType
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+
+from pip._vendor.cachecontrol import CacheControlAdapter
+from pip._vendor.packaging.specifiers import BaseSpecifier
+from pip._vendor.packaging.utils import canonicalize_name
+
+from pip._internal.models.candidate import InstallationCandidate
+from pip._internal.network.utils import HEADERS
+from pip._internal.utils._log import getLogger
+from pip._internal.utils.logging import CapturedRecord, ThreadLogCapture
+
+if TYPE_CHECKING:
+    from pip._internal.index.package_finder import PackageFinder
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class _Prefetch:
+    records: List[CapturedRecord]
+    candidates: Optional[List[InstallationCandidate]]
+    started: float
+    finished: float
+
+
+class CandidatePrefetcher:
+    """
+    Find the candidates of projects in background threads.
+
+    The resolver asks for the candidates of one project at a time, as it
+    discovers them, so index round-trips happen one after another. Projects
+    passed to ``prefetch()`` are looked up in a thread pool instead, and
+    ``PackageFinder.find_all_candidates()`` takes the result when the
+    resolver gets to them. Prefetching only warms caches: the candidates are
+    computed exactly as the resolver would, log output is held back and
+    replayed when the result is taken, and a failed prefetch is simply
+    repeated by the resolver. With an HTTP cache, the core metadata file
+    (PEP 658) of the likely best candidate is fetched too.
+    """
+
+    def __init__(self, finder: "PackageFinder", max_workers: int) -> None:
+        self._finder = finder
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pip-prefetch"
+        )
+        self._lock = threading.Lock()
+        self._futures: Dict[str, "Future[_Prefetch]"] = {}
+        self._taken: List[Tuple[float, float]] = []
+        self._log_capture = ThreadLogCapture()
+
+    def __enter__(self) -> "CandidatePrefetcher":
+        self._log_capture.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def prefetch(
+        self, project_name: str, specifier: Optional[BaseSpecifier] = None
+    ) -> None:
+        """Start finding the candidates of a project, unless already started."""
+        project_name = canonicalize_name(project_name)
+        with self._lock:
+            if project_name in self._futures:
+                return
+            self._futures[project_name] = self._executor.submit(
+                self._fetch, project_name, specifier
+            )
+
+    def take(self, project_name: str) -> Optional[List[InstallationCandidate]]:
+        """Return the prefetched candidates of a project.
+
+        Returns None if the project was not prefetched, if its prefetch has
+        not started yet (it is quicker for the caller to do the work than to
+        wait for a free thread), or if it failed.
+        """
+        with self._lock:
+            future = self._futures.get(canonicalize_name(project_name))
+        if future is None or future.cancel():
+            return None
+
+        requested = time.perf_counter()
+        prefetched = future.result()
+        self._log_capture.replay(prefetched.records)
+        if prefetched.candidates is None:
+            return None
+        self._taken.append(
+            (
+                prefetched.finished - prefetched.started,
+                max(0.0, prefetched.finished - requested),
+            )
+        )
+        return prefetched.candidates
+
+    def _fetch(
+        self, project_name: str, specifier: Optional[BaseSpecifier]
+    ) -> _Prefetch:
+        started = time.perf_counter()
+        candidates: Optional[List[InstallationCandidate]] = None
+        with self._log_capture.capture() as records:
+            try:
+                candidates = self._finder.collect_all_candidates(project_name)
+                self._fetch_metadata(project_name, specifier, candidates)
+            except Exception as exc:
+                logger.debug("Prefetching %s failed: %s", project_name, exc)
+        return _Prefetch(records, candidates, started, time.perf_counter())
+
+    def _fetch_metadata(
+        self,
+        project_name: str,
+        specifier: Optional[BaseSpecifier],
+        candidates: List[InstallationCandidate],
+    ) -> None:
+        if not candidates:
+            return
+        evaluator = self._finder.make_candidate_evaluator(project_name, specifier)
+        best = evaluator.compute_best_candidate(candidates).best_candidate
+        if best is None:
+            return
+        metadata_link = best.link.metadata_link()
+        if metadata_link is None:
+            return
+        url = metadata_link.url_without_fragment
+        session = self._finder.session
+        # Without an HTTP cache, the response would not be kept for the
+        # preparer, so the request would only waste bandwidth.
+        if not isinstance(session.get_adapter(url), CacheControlAdapter):
+            return
+        try:
+            # Same request as the preparer's download, so it hits the cache.
+            session.get(url, headers=HEADERS).content
+        except Exception as exc:
+            logger.debug("Prefetching %s failed: %s", url, exc)
+
+    def close(self) -> None:
+        """Stop prefetching, and log how much waiting it saved."""
+        with self._lock:
+            futures = list(self._futures.values())
+        for future in futures:
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        self._log_capture.__exit__(None, None, None)
+
+        prefetched = sum(not future.cancelled() for future in futures)
+        if not prefetched:
+            return
+        fetching = sum(duration for duration, _ in self._taken)
+        waiting = sum(waited for _, waited in self._taken)
+        logger.verbose(
+            "Prefetching: the resolver used %d of %d prefetched projects and "
+            "waited %.2fs for %.2fs of index lookups (%.2fs saved)",
+            len(self._taken),
+            prefetched,
+            waiting,
+            fetching,
+            fetching - waiting,
+        )
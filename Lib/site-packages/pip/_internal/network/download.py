@@ -5,11 +5,18 @@ import email.message
 import logging
 import mimetypes
 import os
-from typing import Iterable, Optional, Tuple
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from pip._vendor.requests.adapters import DEFAULT_POOLSIZE
 from pip._vendor.requests.models import Response
 
-from pip._internal.cli.progress_bars import get_download_progress_renderer
+from pip._internal.cli.progress_bars import (
+    BatchDownloadProgress,
+    get_batch_download_progress,
+    get_download_progress_renderer,
+)
 from pip._internal.exceptions import NetworkConnectionError
 from pip._internal.models.index import PyPI
 from pip._internal.models.link import Link
@@ -28,11 +35,8 @@ def _get_http_response_size(resp: Response) -> Optional[int]:
         return None
 
 
-def _prepare_download(
-    resp: Response,
-    link: Link,
-    progress_bar: str,
-) -> Iterable[bytes]:
+def _log_download(resp: Response, link: Link) -> Optional[int]:
+    """Log the download of link and return its size, if known."""
     total_length = _get_http_response_size(resp)
 
     if link.netloc == PyPI.file_storage_domain:
@@ -49,21 +53,31 @@ def _prepare_download(
         logger.info("Using cached %s", logged_url)
     else:
         logger.info("Downloading %s", logged_url)
+    return total_length
+
 
+def _should_show_progress(resp: Response, total_length: Optional[int]) -> bool:
     if logger.getEffectiveLevel() > logging.INFO:
-        show_progress = False
+        return False
     elif is_from_cache(resp):
-        show_progress = False
+        return False
     elif not total_length:
-        show_progress = True
+        return True
     elif total_length > (512 * 1024):
-        show_progress = True
+        return True
     else:
-        show_progress = False
+        return False
 
+
+def _prepare_download(
+    resp: Response,
+    link: Link,
+    progress_bar: str,
+) -> Iterable[bytes]:
+    total_length = _log_download(resp, link)
     chunks = response_chunks(resp)
 
-    if not show_progress:
+    if not _should_show_progress(resp, total_length):
         return chunks
 
     renderer = get_download_progress_renderer(bar_type=progress_bar, size=total_length)
@@ -156,32 +170,112 @@ class BatchDownloader:
         self,
         session: PipSession,
         progress_bar: str,
+        max_workers: int = 1,
+        max_per_host: Optional[int] = None,
     ) -> None:
         self._session = session
         self._progress_bar = progress_bar
+        self._max_workers = max(1, max_workers)
+        # Never open more connections to one host than the session's
+        # connection pool keeps alive, or urllib3 discards the extras.
+        self._max_per_host = min(max_per_host or self._max_workers, DEFAULT_POOLSIZE)
 
     def __call__(
         self, links: Iterable[Link], location: str
     ) -> Iterable[Tuple[Link, Tuple[str, str]]]:
-        """Download the files given by links into location."""
-        for link in links:
-            try:
-                resp = _http_get_download(self._session, link)
-            except NetworkConnectionError as e:
-                assert e.response is not None
-                logger.critical(
-                    "HTTP error %s while getting %s",
-                    e.response.status_code,
-                    link,
-                )
-                raise
+        """Download the files given by links into location.
+
+        Results are yielded in the order of links, even when the files are
+        downloaded concurrently.
+        """
+        if self._max_workers == 1:
+            for link in links:
+                yield link, self._download_one(link, location)
+            return
 
-            filename = _get_http_response_filename(resp, link)
-            filepath = os.path.join(location, filename)
+        links = list(links)
+        if len(links) <= 1:
+            for link in links:
+                yield link, self._download_one(link, location)
+            return
 
+        yield from self._download_concurrently(links, location)
+
+    def _download_one(
+        self,
+        link: Link,
+        location: str,
+        progress: Optional[BatchDownloadProgress] = None,
+    ) -> Tuple[str, str]:
+        try:
+            resp = _http_get_download(self._session, link)
+        except NetworkConnectionError as e:
+            assert e.response is not None
+            logger.critical(
+                "HTTP error %s while getting %s",
+                e.response.status_code,
+                link,
+            )
+            raise
+
+        filename = _get_http_response_filename(resp, link)
+        filepath = os.path.join(location, filename)
+
+        if progress is None:
             chunks = _prepare_download(resp, link, self._progress_bar)
-            with open(filepath, "wb") as content_file:
-                for chunk in chunks:
-                    content_file.write(chunk)
-            content_type = resp.headers.get("Content-Type", "")
-            yield link, (filepath, content_type)
+        else:
+            total_length = _log_download(resp, link)
+            chunks = progress.track(
+                response_chunks(resp),
+                description=filename,
+                size=total_length,
+                visible=_should_show_progress(resp, total_length),
+            )
+        with open(filepath, "wb") as content_file:
+            for chunk in chunks:
+                content_file.write(chunk)
+        content_type = resp.headers.get("Content-Type", "")
+        return filepath, content_type
+
+    def _download_concurrently(
+        self, links: List[Link], location: str
+    ) -> Iterable[Tuple[Link, Tuple[str, str]]]:
+        host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        for link in links:
+            if link.netloc not in host_limits:
+                host_limits[link.netloc] = threading.BoundedSemaphore(
+                    self._max_per_host
+                )
+
+        progress = get_batch_download_progress(
+            bar_type=self._progress_bar, total_files=len(links)
+        )
+
+        failed = threading.Event()
+
+        def download(link: Link) -> Tuple[str, str]:
+            with host_limits[link.netloc]:
+                # Workers pick links up in input order, so every link skipped
+                # here comes after the one that failed and is never reported.
+                if failed.is_set():
+                    raise CancelledError()
+                try:
+                    return self._download_one(link, location, progress)
+                except BaseException:
+                    failed.set()
+                    raise
+
+        workers = min(self._max_workers, len(links))
+        logger.debug("Downloading %d files using %d threads", len(links), workers)
+        with progress, ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="pip-download"
+        ) as executor:
+            futures: List[Future[Tuple[str, str]]] = [
+                executor.submit(download, link) for link in links
+            ]
+            try:
+                for link, future in zip(links, futures):
+                    yield link, future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
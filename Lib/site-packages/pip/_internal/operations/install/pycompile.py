@@ -0,0 +1,159 @@
+"""Byte-compile installed Python files, optionally in worker processes.
+"""
+
+import compileall
+import contextlib
+import io
+import logging
+import os
+import threading
+import warnings
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import TracebackType
+from typing import List, Optional, Sequence, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+# Files handed to a worker at a time. Most installed modules are small, so
+# sending them one by one would spend more time on IPC than on compiling.
+CHUNK_SIZE = 32
+
+CompileResult = Tuple[bool, str]
+
+# redirect_stdout() swaps sys.stdout for the whole process, so threads
+# compiling in-process must take turns.
+_redirect_lock = threading.Lock()
+
+
+def _compile_files(paths: Sequence[str]) -> List[CompileResult]:
+    """Compile each path, returning (success, captured output) pairs."""
+    results = []
+    with _redirect_lock:
+        for path in paths:
+            with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                with warnings.catch_warnings():
+                    warnings.filterwarnings("ignore")
+                    success = compileall.compile_file(path, force=True, quiet=True)
+            results.append((bool(success), stdout.getvalue()))
+    return results
+
+
+class CompileJob:
+    """The pending compilation of one wheel's files."""
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        chunks: List["Future[List[CompileResult]]"],
+        results: Optional[List[CompileResult]] = None,
+        compiler: Optional["BytecodeCompiler"] = None,
+    ) -> None:
+        self._paths = paths
+        self._chunks = chunks
+        self._results = results
+        self._compiler = compiler
+
+    def compiled_paths(self) -> List[str]:
+        """Wait for compilation and return the compiled sources, in order.
+
+        If the worker pool fails, the remaining files are compiled in this
+        process, so a broken pool never loses .pyc files or RECORD entries.
+        """
+        if self._results is None:
+            results: List[CompileResult] = []
+            for index, chunk in enumerate(self._chunks):
+                try:
+                    results.extend(chunk.result())
+                except Exception as exc:
+                    logger.debug("Bytecode compilation worker failed: %s", exc)
+                    if isinstance(exc, BrokenProcessPool) and self._compiler:
+                        self._compiler.discard_pool(exc)
+                    start = index * CHUNK_SIZE
+                    results.extend(_compile_files(self._paths[start:]))
+                    break
+            self._results = results
+
+        output = "".join(text for _, text in self._results)
+        if output:
+            logger.debug(output)
+        return [path for path, (ok, _) in zip(self._paths, self._results) if ok]
+
+
+class BytecodeCompiler:
+    """Byte-compile the files of every wheel in one install transaction.
+
+    With ``workers`` greater than one, files are compiled in a process pool
+    that is shared by all wheels. Each wheel's files are split into chunks
+    compiled in parallel, but a wheel waits for its own chunks before its
+    RECORD is written, so compiling it does not overlap with unpacking the
+    next wheel. With ``deferred``, wheels are left to finish (collect their
+    .pyc files and write RECORD) after every wheel's files are in place, so
+    compilation does overlap with unpacking the wheels that follow.
+    """
+
+    def __init__(self, workers: int = 1, deferred: bool = False) -> None:
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        self.deferred = deferred and workers > 1
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "BytecodeCompiler":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        with self._lock:
+            if self.workers <= 1:
+                return None
+            if self._executor is None:
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                except (ImportError, NotImplementedError, OSError) as exc:
+                    # Some platforms (e.g. without sem_open) cannot run a
+                    # process pool; compile serially there.
+                    logger.debug("Compiling bytecode serially: %s", exc)
+                    self.workers = 1
+                    self.deferred = False
+                    return None
+            return self._executor
+
+    def discard_pool(self, exc: BaseException) -> None:
+        """Stop using a broken pool; every later wheel compiles serially."""
+        with self._lock:
+            if self._executor is None:
+                return
+            logger.debug("Compiling bytecode serially from now on: %s", exc)
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self.workers = 1
+
+    def submit(self, paths: Sequence[str]) -> CompileJob:
+        paths = list(paths)
+        executor = self._get_executor()
+        if executor is None or not paths:
+            return CompileJob(paths, [], _compile_files(paths))
+        try:
+            chunks = [
+                executor.submit(_compile_files, paths[start : start + CHUNK_SIZE])
+                for start in range(0, len(paths), CHUNK_SIZE)
+            ]
+        except BrokenProcessPool as exc:
+            # A worker died while an earlier wheel was compiling.
+            self.discard_pool(exc)
+            return CompileJob(paths, [], _compile_files(paths))
+        return CompileJob(paths, chunks, compiler=self)
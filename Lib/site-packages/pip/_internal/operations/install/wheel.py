@@ -2,7 +2,6 @@
 """
 
 import collections
-import compileall
 import contextlib
 import csv
 import importlib
@@ -11,7 +10,6 @@ import os.path
 import re
 import shutil
 import sys
-import warnings
 from base64 import urlsafe_b64encode
 from email.message import Message
 from itertools import chain, filterfalse, starmap
@@ -50,8 +48,9 @@ from pip._internal.metadata import (
 )
 from pip._internal.models.direct_url import DIRECT_URL_METADATA_NAME, DirectUrl
 from pip._internal.models.scheme import SCHEME_KEYS, Scheme
+from pip._internal.operations.install.pycompile import BytecodeCompiler, CompileJob
 from pip._internal.utils.filesystem import adjacent_tmp_file, replace
-from pip._internal.utils.misc import StreamWrapper, ensure_dir, hash_file, partition
+from pip._internal.utils.misc import ensure_dir, hash_file, partition
 from pip._internal.utils.unpacking import (
     current_umask,
     is_within_directory,
@@ -428,7 +427,8 @@ def _install_wheel(  # noqa: C901, PLR0915 function is too long
     warn_script_location: bool = True,
     direct_url: Optional[DirectUrl] = None,
     requested: bool = False,
-) -> None:
+    compiler: Optional[BytecodeCompiler] = None,
+) -> Optional[Callable[[], None]]:
     """Install a wheel.
 
     :param name: Name of the project to install
@@ -439,6 +439,9 @@ def _install_wheel(  # noqa: C901, PLR0915 function is too long
     :param pycompile: Whether to byte-compile installed Python files
     :param warn_script_location: Whether to check that scripts are installed
         into a directory on PATH
+    :param compiler: Shared bytecode compiler for the install transaction
+    :returns: When ``compiler`` defers compilation, a callable that must be
+        called to finish the install (collect .pyc files and write RECORD)
     :raises UnsupportedWheel:
         * when the directory holds an unpacked wheel with incompatible
           Wheel-Version
@@ -607,23 +610,14 @@ def _install_wheel(  # noqa: C901, PLR0915 function is too long
         """Return the path the pyc file would have been written to."""
         return importlib.util.cache_from_source(path)
 
-    # Compile all of the pyc files for the installed files
+    # Compile all of the pyc files for the installed files. With a shared
+    # compiler this only queues the files; the results are collected when
+    # RECORD is written.
+    compile_job: Optional[CompileJob] = None
     if pycompile:
-        with contextlib.redirect_stdout(
-            StreamWrapper.from_stream(sys.stdout)
-        ) as stdout:
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore")
-                for path in pyc_source_file_paths():
-                    success = compileall.compile_file(path, force=True, quiet=True)
-                    if success:
-                        pyc_path = pyc_output_path(path)
-                        assert os.path.exists(pyc_path)
-                        pyc_record_path = cast(
-                            "RecordPath", pyc_path.replace(os.path.sep, "/")
-                        )
-                        record_installed(pyc_record_path, pyc_path)
-        logger.debug(stdout.getvalue())
+        if compiler is None:
+            compiler = BytecodeCompiler()
+        compile_job = compiler.submit(list(pyc_source_file_paths()))
 
     maker = PipScriptMaker(None, scheme.scripts)
 
@@ -687,25 +681,41 @@ def _install_wheel(  # noqa: C901, PLR0915 function is too long
             pass
         generated.append(requested_path)
 
-    record_text = distribution.read_text("RECORD")
-    record_rows = list(csv.reader(record_text.splitlines()))
+    def finish_install() -> None:
+        """Record the compiled files and write RECORD."""
+        if compile_job is not None:
+            for path in compile_job.compiled_paths():
+                pyc_path = pyc_output_path(path)
+                assert os.path.exists(pyc_path)
+                pyc_record_path = cast(
+                    "RecordPath", pyc_path.replace(os.path.sep, "/")
+                )
+                record_installed(pyc_record_path, pyc_path)
 
-    rows = get_csv_rows_for_installed(
-        record_rows,
-        installed=installed,
-        changed=changed,
-        generated=generated,
-        lib_dir=lib_dir,
-    )
+        record_text = distribution.read_text("RECORD")
+        record_rows = list(csv.reader(record_text.splitlines()))
+
+        rows = get_csv_rows_for_installed(
+            record_rows,
+            installed=installed,
+            changed=changed,
+            generated=generated,
+            lib_dir=lib_dir,
+        )
+
+        # Record details of all files installed
+        record_path = os.path.join(dest_info_dir, "RECORD")
 
-    # Record details of all files installed
-    record_path = os.path.join(dest_info_dir, "RECORD")
+        with _generate_file(record_path, **csv_io_kwargs("w")) as record_file:
+            # Explicitly cast to typing.IO[str] as a workaround for the mypy error:
+            # "writer" has incompatible type "BinaryIO"; expected "_Writer"
+            writer = csv.writer(cast("IO[str]", record_file))
+            writer.writerows(_normalized_outrows(rows))
 
-    with _generate_file(record_path, **csv_io_kwargs("w")) as record_file:
-        # Explicitly cast to typing.IO[str] as a workaround for the mypy error:
-        # "writer" has incompatible type "BinaryIO"; expected "_Writer"
-        writer = csv.writer(cast("IO[str]", record_file))
-        writer.writerows(_normalized_outrows(rows))
+    if compiler is not None and compiler.deferred:
+        return finish_install
+    finish_install()
+    return None
 
 
 @contextlib.contextmanager
@@ -726,10 +736,11 @@ def install_wheel(
     warn_script_location: bool = True,
     direct_url: Optional[DirectUrl] = None,
     requested: bool = False,
-) -> None:
+    compiler: Optional[BytecodeCompiler] = None,
+) -> Optional[Callable[[], None]]:
     with ZipFile(wheel_path, allowZip64=True) as z:
         with req_error_context(req_description):
-            _install_wheel(
+            return _install_wheel(
                 name=name,
                 wheel_zip=z,
                 wheel_path=wheel_path,
@@ -738,4 +749,5 @@ def install_wheel(
                 warn_script_location=warn_script_location,
                 direct_url=direct_url,
                 requested=requested,
+                compiler=compiler,
             )
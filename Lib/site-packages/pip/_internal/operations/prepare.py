@@ -231,6 +231,7 @@ class RequirementPreparer:
         lazy_wheel: bool,
         verbosity: int,
         legacy_resolver: bool,
+        parallel_downloads: int = 1,
     ) -> None:
         super().__init__()
 
@@ -239,7 +240,9 @@ class RequirementPreparer:
         self.build_tracker = build_tracker
         self._session = session
         self._download = Downloader(session, progress_bar)
-        self._batch_download = BatchDownloader(session, progress_bar)
+        self._batch_download = BatchDownloader(
+            session, progress_bar, max_workers=parallel_downloads
+        )
         self.finder = finder
 
         # Where still-packed archives should be written to. If None, they are
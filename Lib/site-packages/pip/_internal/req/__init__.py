@@ -1,9 +1,26 @@
 import collections
+import heapq
 import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Generator, List, Optional, Sequence, Tuple
-
-from pip._internal.utils.logging import indent_log
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Generator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from pip._vendor.packaging.utils import canonicalize_name
+
+from pip._internal.operations.install.pycompile import BytecodeCompiler
+from pip._internal.utils.logging import CapturedRecord, ThreadLogCapture, indent_log
 
 from .req_file import parse_requirements
 from .req_install import InstallRequirement
@@ -32,6 +49,94 @@ def _validate_requirements(
         yield req.name, req
 
 
+FinishInstall = Optional[Callable[[], None]]
+InstallOutcome = Tuple[List[CapturedRecord], FinishInstall, Optional[Exception]]
+
+
+def _install_concurrently(
+    to_install: Mapping[str, InstallRequirement],
+    dependencies: Mapping[str, Collection[str]],
+    max_workers: int,
+    install: Callable[[str, InstallRequirement], FinishInstall],
+) -> Generator[Tuple[str, FinishInstall], None, None]:
+    """Install requirements in threads, each once its dependencies are in.
+
+    A requirement only waits for dependencies that come before it in
+    ``to_install``, which breaks dependency cycles where the installation
+    order breaks them. Results and log output are produced in installation
+    order. After a failure no new installs are started; those already
+    running are finished, then the first failure is raised.
+    """
+    order = list(to_install)
+    position = {canonicalize_name(name): index for index, name in enumerate(order)}
+    waiting_on: List[Set[int]] = []
+    dependents: List[List[int]] = [[] for _ in order]
+    for index, name in enumerate(order):
+        needed = {
+            position[dependency]
+            for dependency in dependencies.get(canonicalize_name(name), ())
+            if position.get(dependency, index) < index
+        }
+        waiting_on.append(needed)
+        for dependency in needed:
+            dependents[dependency].append(index)
+
+    ready = [index for index, needed in enumerate(waiting_on) if not needed]
+    heapq.heapify(ready)
+    running: Dict["Future[InstallOutcome]", int] = {}
+    outcomes: Dict[int, InstallOutcome] = {}
+    next_index = 0
+    error: Optional[Exception] = None
+
+    with ThreadLogCapture() as log_capture:
+
+        def run(index: int) -> InstallOutcome:
+            with log_capture.capture() as records:
+                try:
+                    finish_install = install(order[index], to_install[order[index]])
+                except Exception as exc:
+                    return records, None, exc
+            return records, finish_install, None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                while ready and error is None and len(running) < max_workers:
+                    index = heapq.heappop(ready)
+                    running[executor.submit(run, index)] = index
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = running.pop(future)
+                    outcomes[index] = future.result()
+                    if outcomes[index][2] is not None:
+                        error = error or outcomes[index][2]
+                        continue
+                    for dependent in dependents[index]:
+                        waiting_on[dependent].discard(index)
+                        if not waiting_on[dependent]:
+                            heapq.heappush(ready, dependent)
+
+                while next_index in outcomes:
+                    records, finish_install, install_error = outcomes.pop(next_index)
+                    log_capture.replay(records)
+                    if install_error is None:
+                        yield order[next_index], finish_install
+                    next_index += 1
+
+        # After a failure, requirements waiting on it were never started;
+        # report the ones that did run past them.
+        for index in sorted(outcomes):
+            records, finish_install, install_error = outcomes[index]
+            log_capture.replay(records)
+            if install_error is None:
+                yield order[index], finish_install
+
+    if error is not None:
+        raise error
+
+
 def install_given_reqs(
     requirements: List[InstallRequirement],
     global_options: Sequence[str],
@@ -41,11 +146,23 @@ def install_given_reqs(
     warn_script_location: bool,
     use_user_site: bool,
     pycompile: bool,
+    compile_workers: int = 1,
+    defer_compile: bool = False,
+    dependencies: Optional[Mapping[str, Collection[str]]] = None,
+    install_workers: int = 1,
 ) -> List[InstallationResult]:
     """
     Install everything in the given list.
 
     (to be called after having downloaded and unpacked the packages)
+
+    With ``compile_workers`` greater than one, bytecode is compiled in a
+    process pool shared by all packages. With ``defer_compile``, each
+    package's RECORD is written once every package's files are in place.
+
+    With ``install_workers`` greater than one and the ``dependencies`` of
+    each requirement (keyed by canonical name), packages are installed in
+    threads as soon as the packages they depend on are installed.
     """
     to_install = collections.OrderedDict(_validate_requirements(requirements))
 
@@ -56,35 +173,61 @@ def install_given_reqs(
         )
 
     installed = []
-
-    with indent_log():
-        for req_name, requirement in to_install.items():
-            if requirement.should_reinstall:
-                logger.info("Attempting uninstall: %s", req_name)
-                with indent_log():
-                    uninstalled_pathset = requirement.uninstall(auto_confirm=True)
-            else:
-                uninstalled_pathset = None
-
-            try:
-                requirement.install(
-                    global_options,
-                    root=root,
-                    home=home,
-                    prefix=prefix,
-                    warn_script_location=warn_script_location,
-                    use_user_site=use_user_site,
-                    pycompile=pycompile,
-                )
-            except Exception:
-                # if install did not succeed, rollback previous uninstall
-                if uninstalled_pathset and not requirement.install_succeeded:
-                    uninstalled_pathset.rollback()
-                raise
-            else:
-                if uninstalled_pathset and requirement.install_succeeded:
-                    uninstalled_pathset.commit()
-
-            installed.append(InstallationResult(req_name))
+    finishers: List[Callable[[], None]] = []
+
+    compiler = BytecodeCompiler(compile_workers, deferred=defer_compile)
+    if install_workers <= 0:
+        install_workers = os.cpu_count() or 1
+
+    def install(req_name: str, requirement: InstallRequirement) -> FinishInstall:
+        if requirement.should_reinstall:
+            logger.info("Attempting uninstall: %s", req_name)
+            with indent_log():
+                uninstalled_pathset = requirement.uninstall(auto_confirm=True)
+        else:
+            uninstalled_pathset = None
+
+        try:
+            finish_install = requirement.install(
+                global_options,
+                root=root,
+                home=home,
+                prefix=prefix,
+                warn_script_location=warn_script_location,
+                use_user_site=use_user_site,
+                pycompile=pycompile,
+                compiler=compiler,
+            )
+        except Exception:
+            # if install did not succeed, rollback previous uninstall
+            if uninstalled_pathset and not requirement.install_succeeded:
+                uninstalled_pathset.rollback()
+            raise
+        else:
+            if uninstalled_pathset and requirement.install_succeeded:
+                uninstalled_pathset.commit()
+        return finish_install
+
+    with compiler, indent_log():
+        if install_workers > 1 and dependencies is not None and len(to_install) > 1:
+            results = _install_concurrently(
+                to_install, dependencies, install_workers, install
+            )
+        else:
+            results = (
+                (req_name, install(req_name, requirement))
+                for req_name, requirement in to_install.items()
+            )
+
+        try:
+            for req_name, finish_install in results:
+                if finish_install is not None:
+                    finishers.append(finish_install)
+                installed.append(InstallationResult(req_name))
+        finally:
+            # Packages whose files are in place get their RECORD even if a
+            # later package fails, so they can still be uninstalled.
+            for finish_install in finishers:
+                finish_install()
 
     return installed
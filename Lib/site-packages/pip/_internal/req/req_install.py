@@ -7,7 +7,17 @@ import uuid
 import zipfile
 from optparse import Values
 from pathlib import Path
-from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence, Union
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from pip._vendor.packaging.markers import Marker
 from pip._vendor.packaging.requirements import Requirement
@@ -37,6 +47,7 @@ from pip._internal.operations.build.metadata_legacy import (
 from pip._internal.operations.install.editable_legacy import (
     install_editable as install_editable_legacy,
 )
+from pip._internal.operations.install.pycompile import BytecodeCompiler
 from pip._internal.operations.install.wheel import install_wheel
 from pip._internal.pyproject import load_pyproject_toml, make_pyproject_path
 from pip._internal.req.req_uninstall import UninstallPathSet
@@ -813,7 +824,13 @@ class InstallRequirement:
         warn_script_location: bool = True,
         use_user_site: bool = False,
         pycompile: bool = True,
-    ) -> None:
+        compiler: Optional[BytecodeCompiler] = None,
+    ) -> Optional[Callable[[], None]]:
+        """Install the requirement.
+
+        Returns a callable that finishes the install when ``compiler`` defers
+        bytecode compilation, and None otherwise.
+        """
         assert self.req is not None
         scheme = get_scheme(
             self.req.name,
@@ -859,12 +876,12 @@ class InstallRequirement:
                 unpacked_source_directory=self.unpacked_source_directory,
             )
             self.install_succeeded = True
-            return
+            return None
 
         assert self.is_wheel
         assert self.local_file_path
 
-        install_wheel(
+        finish_install = install_wheel(
             self.req.name,
             self.local_file_path,
             scheme=scheme,
@@ -873,8 +890,10 @@ class InstallRequirement:
             warn_script_location=warn_script_location,
             direct_url=self.download_info if self.is_direct else None,
             requested=self.user_supplied,
+            compiler=compiler,
         )
         self.install_succeeded = True
+        return finish_install
 
 
 def check_invalid_constraint_type(req: InstallRequirement) -> str:
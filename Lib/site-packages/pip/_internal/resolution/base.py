@@ -1,4 +1,4 @@
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Set
 
 from pip._internal.req.req_install import InstallRequirement
 from pip._internal.req.req_set import RequirementSet
@@ -18,3 +18,14 @@ class BaseResolver:
         self, req_set: RequirementSet
     ) -> List[InstallRequirement]:
         raise NotImplementedError()
+
+    def get_installation_dependencies(
+        self, req_set: RequirementSet
+    ) -> Optional[Dict[str, Set[str]]]:
+        """Get the requirements each requirement in RequirementSet depends on.
+
+        Keys are the names in ``req_set.requirements``. Resolvers that do not
+        keep a dependency graph return None, and their requirements are
+        installed one by one.
+        """
+        return None
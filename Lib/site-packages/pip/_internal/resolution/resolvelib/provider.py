@@ -7,6 +7,7 @@ from typing import (
     Iterable,
     Iterator,
     Mapping,
+    Optional,
     Sequence,
     TypeVar,
     Union,
@@ -22,6 +23,8 @@ if TYPE_CHECKING:
     from pip._vendor.resolvelib.providers import Preference
     from pip._vendor.resolvelib.resolvers import RequirementInformation
 
+    from pip._internal.index.prefetch import CandidatePrefetcher
+
     PreferenceInformation = RequirementInformation[Requirement, Candidate]
 
     _ProviderBase = AbstractProvider[Requirement, Candidate, str]
@@ -94,6 +97,7 @@ class PipProvider(_ProviderBase):
         ignore_dependencies: bool,
         upgrade_strategy: str,
         user_requested: Dict[str, int],
+        prefetcher: Optional["CandidatePrefetcher"] = None,
     ) -> None:
         self._factory = factory
         self._constraints = constraints
@@ -101,6 +105,7 @@ class PipProvider(_ProviderBase):
         self._upgrade_strategy = upgrade_strategy
         self._user_requested = user_requested
         self._known_depths: Dict[str, float] = collections.defaultdict(lambda: math.inf)
+        self._prefetcher = prefetcher
 
     def identify(self, requirement_or_candidate: Union[Requirement, Candidate]) -> str:
         return requirement_or_candidate.name
@@ -244,7 +249,21 @@ class PipProvider(_ProviderBase):
 
     def get_dependencies(self, candidate: Candidate) -> Sequence[Requirement]:
         with_requires = not self._ignore_dependencies
-        return [r for r in candidate.iter_dependencies(with_requires) if r is not None]
+        dependencies = [
+            r for r in candidate.iter_dependencies(with_requires) if r is not None
+        ]
+        self.prefetch(dependencies)
+        return dependencies
+
+    def prefetch(self, requirements: Iterable[Requirement]) -> None:
+        """Start looking up the index candidates of requirements."""
+        if self._prefetcher is None:
+            return
+        for requirement in requirements:
+            _, ireq = requirement.get_candidate_lookup()
+            if ireq is None or ireq.req is None or ireq.link is not None:
+                continue
+            self._prefetcher.prefetch(ireq.req.name, ireq.req.specifier)
 
     @staticmethod
     def is_backtrack_cause(
@@ -11,6 +11,7 @@ from pip._vendor.resolvelib.structs import DirectedGraph
 
 from pip._internal.cache import WheelCache
 from pip._internal.index.package_finder import PackageFinder
+from pip._internal.index.prefetch import CandidatePrefetcher
 from pip._internal.operations.prepare import RequirementPreparer
 from pip._internal.req.constructors import install_req_extend_extras
 from pip._internal.req.req_install import InstallRequirement
@@ -51,6 +52,7 @@ class Resolver(BaseResolver):
         force_reinstall: bool,
         upgrade_strategy: str,
         py_version_info: Optional[Tuple[int, ...]] = None,
+        prefetch_workers: int = 0,
     ):
         super().__init__()
         assert upgrade_strategy in self._allowed_strategies
@@ -68,40 +70,53 @@ class Resolver(BaseResolver):
         )
         self.ignore_dependencies = ignore_dependencies
         self.upgrade_strategy = upgrade_strategy
+        self._finder = finder
+        self._prefetch_workers = prefetch_workers
         self._result: Optional[Result] = None
 
     def resolve(
         self, root_reqs: List[InstallRequirement], check_supported_wheels: bool
     ) -> RequirementSet:
         collected = self.factory.collect_root_requirements(root_reqs)
-        provider = PipProvider(
-            factory=self.factory,
-            constraints=collected.constraints,
-            ignore_dependencies=self.ignore_dependencies,
-            upgrade_strategy=self.upgrade_strategy,
-            user_requested=collected.user_requested,
-        )
-        if "PIP_RESOLVER_DEBUG" in os.environ:
-            reporter: BaseReporter = PipDebuggingReporter()
-        else:
-            reporter = PipReporter()
-        resolver: RLResolver[Requirement, Candidate, str] = RLResolver(
-            provider,
-            reporter,
-        )
-
-        try:
-            limit_how_complex_resolution_can_be = 200000
-            result = self._result = resolver.resolve(
-                collected.requirements, max_rounds=limit_how_complex_resolution_can_be
+        with contextlib.ExitStack() as stack:
+            prefetcher: Optional[CandidatePrefetcher] = None
+            if self._prefetch_workers > 0:
+                prefetcher = stack.enter_context(
+                    CandidatePrefetcher(self._finder, self._prefetch_workers)
+                )
+                self._finder.prefetcher = prefetcher
+                stack.callback(setattr, self._finder, "prefetcher", None)
+            provider = PipProvider(
+                factory=self.factory,
+                constraints=collected.constraints,
+                ignore_dependencies=self.ignore_dependencies,
+                upgrade_strategy=self.upgrade_strategy,
+                user_requested=collected.user_requested,
+                prefetcher=prefetcher,
             )
-
-        except ResolutionImpossible as e:
-            error = self.factory.get_installation_error(
-                cast("ResolutionImpossible[Requirement, Candidate]", e),
-                collected.constraints,
+            provider.prefetch(collected.requirements)
+            if "PIP_RESOLVER_DEBUG" in os.environ:
+                reporter: BaseReporter = PipDebuggingReporter()
+            else:
+                reporter = PipReporter()
+            resolver: RLResolver[Requirement, Candidate, str] = RLResolver(
+                provider,
+                reporter,
             )
-            raise error from e
+
+            try:
+                limit_how_complex_resolution_can_be = 200000
+                result = self._result = resolver.resolve(
+                    collected.requirements,
+                    max_rounds=limit_how_complex_resolution_can_be,
+                )
+
+            except ResolutionImpossible as e:
+                error = self.factory.get_installation_error(
+                    cast("ResolutionImpossible[Requirement, Candidate]", e),
+                    collected.constraints,
+                )
+                raise error from e
 
         req_set = RequirementSet(check_supported_wheels=check_supported_wheels)
         # process candidates with extras last to ensure their base equivalent is
@@ -203,7 +218,9 @@ class Resolver(BaseResolver):
             # Nothing is left to install, so we do not need an order.
             return []
 
-        graph = self._result.graph
+        # get_topological_weights() prunes the graph it is given; keep ours
+        # intact for get_installation_dependencies().
+        graph = self._result.graph.copy()
         weights = get_topological_weights(graph, set(req_set.requirements.keys()))
 
         sorted_items = sorted(
@@ -213,6 +230,37 @@ class Resolver(BaseResolver):
         )
         return [ireq for _, ireq in sorted_items]
 
+    def get_installation_dependencies(
+        self, req_set: RequirementSet
+    ) -> Dict[str, Set[str]]:
+        """Get the requirements each requirement in RequirementSet depends on.
+
+        Dependencies are found in the resolver's dependency graph. Nodes that
+        are not installed (e.g. extras, or packages already satisfied) are
+        looked through, so a requirement depends on the nearest requirements
+        below it on every path.
+        """
+        assert self._result is not None, "must call resolve() first"
+
+        graph = self._result.graph
+        requirement_keys = set(req_set.requirements.keys())
+        dependencies: Dict[str, Set[str]] = {}
+        for key in requirement_keys:
+            found: Set[str] = set()
+            seen = {key}
+            stack = list(graph.iter_children(key))
+            while stack:
+                child = stack.pop()
+                if child in seen or child is None:
+                    continue
+                seen.add(child)
+                if child in requirement_keys:
+                    found.add(child)
+                else:
+                    stack.extend(graph.iter_children(child))
+            dependencies[key] = found
+        return dependencies
+
 
 def get_topological_weights(
     graph: "DirectedGraph[Optional[str]]", requirement_keys: Set[str]
@@ -8,7 +8,17 @@ import threading
 from dataclasses import dataclass
 from io import TextIOWrapper
 from logging import Filter
-from typing import Any, ClassVar, Generator, List, Optional, TextIO, Type
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Type,
+)
 
 from pip._vendor.rich.console import (
     Console,
@@ -222,6 +232,70 @@ class ExcludeLoggerFilter(Filter):
         return not super().filter(record)
 
 
+CapturedRecord = Tuple[logging.Handler, logging.LogRecord, int]
+
+
+class _CaptureFilter(Filter):
+    def __init__(self, capture: "ThreadLogCapture", handler: logging.Handler) -> None:
+        super().__init__()
+        self.capture = capture
+        self.handler = handler
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        buffer = self.capture.buffers.get(threading.get_ident())
+        if buffer is None:
+            return True
+        buffer.append((self.handler, record, get_indentation()))
+        return False
+
+
+class ThreadLogCapture:
+    """
+    Hold back the log records of threads, to replay them in a fixed order.
+
+    While active, a filter is attached to every handler of the root logger.
+    Records logged by a thread inside ``capture()`` are stored with the
+    handler that would have emitted them and the thread's indentation, so
+    that they can be replayed later from the main thread.
+    """
+
+    def __init__(self) -> None:
+        self.buffers: Dict[int, List[CapturedRecord]] = {}
+        self._filters: List[_CaptureFilter] = []
+
+    def __enter__(self) -> "ThreadLogCapture":
+        for handler in logging.getLogger().handlers:
+            capture_filter = _CaptureFilter(self, handler)
+            handler.addFilter(capture_filter)
+            self._filters.append(capture_filter)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        for capture_filter in self._filters:
+            capture_filter.handler.removeFilter(capture_filter)
+        self._filters = []
+
+    @contextlib.contextmanager
+    def capture(self) -> Generator[List[CapturedRecord], None, None]:
+        """Hold back the records logged by the current thread."""
+        buffer: List[CapturedRecord] = []
+        self.buffers[threading.get_ident()] = buffer
+        try:
+            yield buffer
+        finally:
+            del self.buffers[threading.get_ident()]
+
+    def replay(self, records: List[CapturedRecord]) -> None:
+        """Emit captured records, indented as they were when logged."""
+        indentation = get_indentation()
+        try:
+            for handler, record, record_indentation in records:
+                _log_state.indentation = indentation + record_indentation
+                handler.handle(record)
+        finally:
+            _log_state.indentation = indentation
+
+
 def setup_logging(verbosity: int, no_color: bool, user_log_file: Optional[str]) -> int:
     """Configures and sets up all of the logging
 
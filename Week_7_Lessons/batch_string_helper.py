@@ -0,0 +1,79 @@
+import string
+from itertools import islice
+from multiprocessing import Pool
+
+from string_helper import reverse
+
+# No character outside ASCII lowercases to a, e, i, o or u, so deleting
+# these ten bytes matches string_helper.remove_vowels for any text.
+ASCII_VOWELS = b'aeiouAEIOU'
+PUNCTUATION_TABLE = str.maketrans({char: ' ' for char in string.punctuation})
+ASCII_PUNCTUATION_TABLE = bytes.maketrans(string.punctuation.encode('ascii'), b' ' * len(string.punctuation))
+PARALLEL_CHUNK_SIZE = 10000
+
+
+def remove_vowels_fast(text):
+    # ASCII bytes never occur inside a multi-byte UTF-8 sequence, so one
+    # bytes.translate over the UTF-8 encoding works for non-ASCII text too.
+    try:
+        return text.encode('utf-8').translate(None, ASCII_VOWELS).decode('utf-8')
+    except UnicodeEncodeError:
+        # Lone surrogates only encode with surrogatepass, which is slower.
+        return text.encode('utf-8', 'surrogatepass').translate(None, ASCII_VOWELS).decode('utf-8', 'surrogatepass')
+
+
+def normalize(text, strip_vowels=False, reverse_text=False):
+    return normalize_batch([text], strip_vowels, reverse_text)[0]
+
+
+def reverse_batch(strings):
+    return [reverse(text) for text in strings]
+
+
+def remove_vowels_batch(strings):
+    return list(map(remove_vowels_fast, strings))
+
+
+def normalize_batch(strings, strip_vowels=False, reverse_text=False):
+    results = []
+    for text in strings:
+        if text.isascii():
+            data = b' '.join(text.encode('ascii').translate(ASCII_PUNCTUATION_TABLE).lower().split())
+            if strip_vowels:
+                data = data.translate(None, ASCII_VOWELS)
+            text = data.decode('ascii')
+        else:
+            text = ' '.join(text.translate(PUNCTUATION_TABLE).lower().split())
+            if strip_vowels:
+                text = remove_vowels_fast(text)
+        if reverse_text:
+            text = reverse(text)
+        results.append(text)
+    return results
+
+
+def normalize_chunk(job):
+    strings, strip_vowels, reverse_text = job
+    return normalize_batch(strings, strip_vowels, reverse_text)
+
+
+def chunked(strings, size):
+    iterator = iter(strings)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def normalize_stream(strings, strip_vowels=False, reverse_text=False, processes=None, chunk_size=PARALLEL_CHUNK_SIZE):
+    chunks = chunked(strings, chunk_size)
+    if processes is None or processes <= 1:
+        for chunk in chunks:
+            yield from normalize_batch(chunk, strip_vowels, reverse_text)
+        return
+
+    with Pool(processes) as pool:
+        jobs = ((chunk, strip_vowels, reverse_text) for chunk in chunks)
+        for normalized in pool.imap(normalize_chunk, jobs):
+            yield from normalized
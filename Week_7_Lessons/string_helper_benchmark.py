@@ -0,0 +1,49 @@
+import argparse
+import os
+import random
+import time
+
+from batch_string_helper import normalize_stream, remove_vowels_batch, reverse_batch
+from string_helper import remove_vowels, reverse
+
+WORDS = "Expect series shake art again our. Each left similar likely coach take. Direction wife job pull determine leader move college.".split()
+
+
+def sample_strings(count, seed=7):
+    generator = random.Random(seed)
+    return [" ".join(generator.choices(WORDS, k=8)) for _ in range(count)]
+
+
+def timed(label, function, baseline=None):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    speedup = f" ({baseline / elapsed:.1f}x speedup)" if baseline else ""
+    print(f"{label:<34}: {elapsed:.3f}s{speedup}")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare string_helper per-call functions with the batch helpers.")
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    strings = sample_strings(args.count)
+    print(f"Benchmarking {args.count} strings")
+
+    expected, baseline = timed("remove_vowels (per call)", lambda: [remove_vowels(text) for text in strings])
+    result, _ = timed("remove_vowels_batch", lambda: remove_vowels_batch(strings), baseline)
+    assert result == expected
+
+    expected, baseline = timed("reverse(remove_vowels) (per call)", lambda: [reverse(remove_vowels(text)) for text in strings])
+    result, _ = timed("reverse_batch(remove_vowels_batch)", lambda: reverse_batch(remove_vowels_batch(strings)), baseline)
+    assert result == expected
+
+    serial, baseline = timed("normalize_stream (1 process)", lambda: list(normalize_stream(strings, strip_vowels=True, processes=1)))
+    parallel, _ = timed("normalize_stream (process pool)", lambda: list(normalize_stream(strings, strip_vowels=True, processes=args.processes)), baseline)
+    assert serial == parallel
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+from batch_string_helper import normalize, normalize_stream, remove_vowels_batch, remove_vowels_fast, reverse_batch
+from string_helper import remove_vowels, reverse
+
+SAMPLES = ["Each left similar likely coach take.", "ÉCOLE über Ärger", "", "AEIOU aeiou xyz", "İstanbul Ωmega ﬃ KELVIN \u212a \udcff"]
+
+
+def test_batch_helpers_match_string_helper():
+    assert remove_vowels_batch(SAMPLES) == [remove_vowels(text) for text in SAMPLES]
+    assert [remove_vowels_fast(text) for text in SAMPLES] == [remove_vowels(text) for text in SAMPLES]
+    assert reverse_batch(SAMPLES) == [reverse(text) for text in SAMPLES]
+
+
+def test_normalize_strips_punctuation_and_case():
+    assert normalize("  Coach,   TAKE! ") == "coach take"
+    assert normalize("Coach take", strip_vowels=True, reverse_text=True) == "kt hcc"
+
+
+def test_stream_is_serial_by_default_and_matches_pool():
+    strings = SAMPLES * 50
+    serial = list(normalize_stream(strings, strip_vowels=True, chunk_size=7))
+    assert serial == [normalize(text, strip_vowels=True) for text in strings]
+    assert list(normalize_stream(strings, strip_vowels=True, processes=2, chunk_size=7)) == serial
@@ -0,0 +1,82 @@
+"""Time BatchDownloader against a local index stand-in.
+
+A ThreadingHTTPServer serves FILES files of FILE_SIZE bytes each and waits
+LATENCY seconds before every response, roughly what a remote index costs per
+file. Run it from the repository root:
+
+    python tests/benchmarks/bench_batch_download.py [workers ...]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "Lib",
+        "site-packages",
+    ),
+)
+
+from pip._internal.models.link import Link  # noqa: E402
+from pip._internal.network.download import BatchDownloader  # noqa: E402
+from pip._internal.network.session import PipSession  # noqa: E402
+
+FILES = 100
+FILE_SIZE = 256 * 1024
+LATENCY = 0.08
+PAYLOAD = os.urandom(FILE_SIZE)
+
+
+class IndexHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def run(workers: int, links: List[Link]) -> float:
+    session = PipSession()
+    downloader = BatchDownloader(session, "off", max_workers=workers)
+    with tempfile.TemporaryDirectory() as location:
+        start = time.perf_counter()
+        for _ in downloader(links, location):
+            pass
+        elapsed = time.perf_counter() - start
+    session.close()
+    return elapsed
+
+
+def main(argv: List[str]) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), IndexHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    links = [
+        Link(f"http://{host}:{port}/packages/pkg_{i}-1.0-py3-none-any.whl")
+        for i in range(FILES)
+    ]
+    try:
+        for workers in [int(arg) for arg in argv] or [1, 4, 8, 16]:
+            elapsed = run(workers, links)
+            print(f"{workers:>3} workers: {elapsed:.2f}s")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,17 @@
+"""Run the tests against the pip copy in Lib/site-packages.
+
+The interpreter running pytest usually has its own pip installed, so the
+copy edited in this repository has to come first on sys.path.
+"""
+
+import os
+import sys
+
+SITE_PACKAGES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Lib",
+    "site-packages",
+)
+sys.path.insert(0, SITE_PACKAGES)
+for name in [name for name in sys.modules if name.split(".")[0] == "pip"]:
+    del sys.modules[name]
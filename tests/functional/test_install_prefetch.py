@@ -0,0 +1,108 @@
+import json
+import os
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from pip._internal.utils.urls import path_to_url
+
+SITE_PACKAGES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "Lib",
+    "site-packages",
+)
+
+# root needs a and b. a 2.0 needs c>=2 but b needs c<2, so the resolver
+# has to backtrack to a 1.0. d comes in through an extra of c.
+PROJECTS: Dict[Tuple[str, str], List[str]] = {
+    ("root", "1.0"): ["a", "b"],
+    ("a", "1.0"): ["c<2"],
+    ("a", "2.0"): ["c>=2"],
+    ("b", "1.0"): ["c[speedups]<2"],
+    ("c", "1.0"): ['d; extra == "speedups"'],
+    ("c", "2.0"): [],
+    ("d", "1.0"): [],
+    ("d", "1.1"): ["e"],
+    ("e", "3.0"): [],
+}
+
+
+def make_index(path: Path) -> str:
+    files = path / "files"
+    files.mkdir(parents=True)
+    anchors: Dict[str, List[str]] = {}
+    for (name, version), requires in PROJECTS.items():
+        filename = f"{name}-{version}-py3-none-any.whl"
+        dist_info = f"{name}-{version}.dist-info"
+        metadata = f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+        metadata += "Provides-Extra: speedups\n" if name == "c" else ""
+        metadata += "".join(f"Requires-Dist: {req}\n" for req in requires)
+        with zipfile.ZipFile(files / filename, "w") as wheel:
+            wheel.writestr(f"{name}/__init__.py", "")
+            wheel.writestr(f"{dist_info}/METADATA", metadata)
+            wheel.writestr(
+                f"{dist_info}/WHEEL",
+                "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\n"
+                "Tag: py3-none-any\n",
+            )
+            wheel.writestr(f"{dist_info}/RECORD", "")
+        anchors.setdefault(name, []).append(
+            f'<a href="../../files/{filename}">{filename}</a>'
+        )
+    for name, links in anchors.items():
+        project = path / "simple" / name
+        project.mkdir(parents=True)
+        (project / "index.html").write_text(
+            "<html><body>" + "".join(links) + "</body></html>"
+        )
+    return path_to_url(str(path / "simple"))
+
+
+def resolve(index_url: str, report: Path, *options: str) -> List[Tuple[str, str]]:
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pip",
+            "install",
+            "--isolated",
+            "--disable-pip-version-check",
+            "--no-cache-dir",
+            "--dry-run",
+            "--ignore-installed",
+            "--quiet",
+            "--index-url",
+            index_url,
+            "--report",
+            str(report),
+            *options,
+            "root",
+        ],
+        check=True,
+        env={**os.environ, "PYTHONPATH": SITE_PACKAGES},
+    )
+    installs = json.loads(report.read_text())["install"]
+    return [
+        (item["metadata"]["name"], item["metadata"]["version"]) for item in installs
+    ]
+
+
+def test_prefetching_does_not_change_the_resolution(tmp_path) -> None:
+    index_url = make_index(tmp_path / "index")
+
+    serial = resolve(index_url, tmp_path / "serial.json")
+    prefetched = resolve(
+        index_url, tmp_path / "prefetched.json", "--prefetch-workers", "4"
+    )
+
+    assert serial == [
+        ("root", "1.0"),
+        ("a", "1.0"),
+        ("b", "1.0"),
+        ("c", "1.0"),
+        ("d", "1.1"),
+        ("e", "3.0"),
+    ]
+    assert prefetched == serial
@@ -0,0 +1,247 @@
+import os
+import shutil
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from pip._vendor import msgpack
+from pip._vendor.requests.models import Response
+
+from pip._internal.index import link_cache as link_cache_module
+from pip._internal.index.collector import (
+    IndexContent,
+    LinkCollector,
+    _conditional_headers,
+)
+from pip._internal.index.link_cache import LinkCache
+from pip._internal.models.link import Link, MetadataFile
+from pip._internal.models.search_scope import SearchScope
+
+PAGE_URL = "https://index.example.com/simple/demo/"
+FILES = "https://files.example.com/packages/"
+SHA = "a" * 64
+
+
+def make_links() -> List[Link]:
+    return [
+        Link(f"{FILES}demo-1.0.tar.gz#sha256={SHA}", requires_python=">=3.8"),
+        Link(f"{FILES}demo-1.0-py3-none-any.whl", requires_python=">=3.8"),
+        Link(f"{FILES}demo-1.1.tar.gz", yanked_reason=""),
+        Link(f"{FILES}demo-1.2.tar.gz", yanked_reason="broken build"),
+        Link(
+            f"{FILES}demo-1.3.tar.gz",
+            metadata_file_data=MetadataFile({"sha256": SHA}),
+            hashes={"sha256": SHA, "md5": "b" * 32},
+        ),
+        Link(f"{FILES}demo-1.4.tar.gz", metadata_file_data=MetadataFile(None)),
+        Link(
+            f"{FILES}demo-1.5.tar.gz#sha256={SHA}",
+            hashes={"sha256": "c" * 64, "blake2b": "d" * 128},
+        ),
+        Link("https://mirror.example.org/demo-2.0.zip", requires_python="<4"),
+    ]
+
+
+def fields(link: Link) -> Tuple[object, ...]:
+    return (
+        link.url,
+        link.comes_from,
+        link.requires_python,
+        link.yanked_reason,
+        link.metadata_file_data,
+        link.cache_link_parsing,
+        link._hashes,
+    )
+
+
+@pytest.mark.parametrize("count", [0, 1, 8])
+def test_links_round_trip(tmp_path, count: int) -> None:
+    links = make_links()[:count]
+    for link in links:
+        link.comes_from = PAGE_URL
+    cache = LinkCache(str(tmp_path))
+
+    cache.set(PAGE_URL, '"v1"', links)
+
+    cached = cache.get(PAGE_URL, '"v1"')
+    assert cached is not None
+    assert [fields(link) for link in cached] == [fields(link) for link in links]
+    assert cache.validator(PAGE_URL) == '"v1"'
+
+
+def test_entries_only_match_their_validator_and_version(tmp_path) -> None:
+    cache = LinkCache(str(tmp_path))
+    cache.set(PAGE_URL, '"v1"', make_links())
+
+    assert cache.get(PAGE_URL, '"v2"') is None
+    assert cache.get(PAGE_URL + "other/", '"v1"') is None
+
+    path = cache._get_cache_path(PAGE_URL)
+    with open(path, "wb") as f:
+        f.write(msgpack.packb([link_cache_module.FORMAT_VERSION + 1, '"v1"']))
+    assert cache.validator(PAGE_URL) is None
+    assert cache.get(PAGE_URL, '"v1"') is None
+
+    with open(path, "wb") as f:
+        f.write(b"\xc1 not msgpack")
+    assert cache.validator(PAGE_URL) is None
+    assert cache.get(PAGE_URL, '"v1"') is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path) -> None:
+    links = make_links()
+    probe = LinkCache(str(tmp_path / "probe"))
+    probe.set("https://example.com/probe/", "x", links)
+    entry_size = os.path.getsize(probe._get_cache_path("https://example.com/probe/"))
+    urls = [f"https://example.com/{i}/" for i in range(4)]
+    tmp_path = tmp_path / "links"
+
+    writer = LinkCache(str(tmp_path))
+    for age, url in enumerate(reversed(urls)):
+        writer.set(url, "x", links)
+        path = writer._get_cache_path(url)
+        os.utime(path, (1000 + age, 1000 + age))
+    # A new process reads urls[3], the oldest entry. Going over max_size
+    # evicts down to 90% of it: 3.78 entries, so urls[2] and urls[1] go.
+    cache = LinkCache(str(tmp_path), max_size=int(entry_size * 4.2))
+    assert cache.get(urls[3], "x") is not None
+
+    cache.set("https://example.com/new/", "x", links)
+
+    remaining = [url for url in urls if cache.validator(url) is not None]
+    assert remaining == [urls[0], urls[3]]
+    assert cache.validator("https://example.com/new/") == "x"
+
+
+@pytest.mark.parametrize(
+    "validator, expected",
+    [
+        (None, {}),
+        ("sha256:" + SHA, {}),
+        ('"abc"', {"If-None-Match": '"abc"'}),
+        ('W/"abc"', {"If-None-Match": 'W/"abc"'}),
+        ('"Wed, 21 Oct 2015"', {"If-None-Match": '"Wed, 21 Oct 2015"'}),
+        ("abc123", {"If-None-Match": "abc123"}),
+        (
+            "Wed, 21 Oct 2015 07:28:00 GMT",
+            {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"},
+        ),
+    ],
+)
+def test_conditional_headers(
+    validator: Optional[str], expected: Dict[str, str]
+) -> None:
+    assert _conditional_headers(validator) == expected
+
+
+PAGE = (
+    b"<html><body>"
+    b'<a href="../../packages/demo-1.0.tar.gz" data-requires-python="&gt;=3.8">'
+    b"demo-1.0.tar.gz</a>"
+    b'<a href="../../packages/demo-1.1.tar.gz" data-yanked="bad">demo-1.1</a>'
+    b"</body></html>"
+)
+
+
+class FakeSession:
+    """Answer each GET with the next of ``responses``: (status, headers)."""
+
+    def __init__(self) -> None:
+        self.responses: List[Tuple[int, Dict[str, str]]] = []
+        self.sent: List[Dict[str, str]] = []
+        self.on_get = lambda: None
+
+    def get(self, url: str, headers: Dict[str, str]) -> Response:
+        self.sent.append(
+            {
+                name: value
+                for name, value in headers.items()
+                if name.startswith("If-")
+            }
+        )
+        self.on_get()
+        status, response_headers = self.responses.pop(0)
+        resp = Response()
+        resp.url = url
+        resp.status_code = status
+        resp.reason = "OK" if status == 200 else "Not Modified"
+        resp.headers.update(response_headers)
+        resp._content = PAGE if status == 200 else b""
+        if status == 200:
+            resp.headers["Content-Type"] = "text/html"
+        return resp
+
+
+def make_collector(tmp_path) -> Tuple[LinkCollector, FakeSession]:
+    session = FakeSession()
+    collector = LinkCollector(
+        session=session,  # type: ignore[arg-type]
+        search_scope=SearchScope.create(find_links=[], index_urls=[], no_index=True),
+        link_cache=LinkCache(str(tmp_path)),
+    )
+    return collector, session
+
+
+def fetch(collector: LinkCollector) -> Tuple[IndexContent, List[Link]]:
+    page = collector.fetch_response(Link(PAGE_URL))
+    assert page is not None
+    return page, collector.parse_links(page)
+
+
+@pytest.mark.parametrize(
+    "validator_header, request_header",
+    [("ETag", "If-None-Match"), ("Last-Modified", "If-Modified-Since")],
+)
+def test_not_modified_page_reuses_cached_links(
+    tmp_path, validator_header: str, request_header: str
+) -> None:
+    collector, session = make_collector(tmp_path)
+    validator = {
+        "ETag": '"v1"',
+        "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }[validator_header]
+    session.responses = [(200, {validator_header: validator}), (304, {})]
+
+    _, first_links = fetch(collector)
+    page, links = fetch(collector)
+
+    assert session.sent == [{}, {request_header: validator}]
+    assert page.content == b""
+    assert page.cached_links is links
+    assert [fields(link) for link in links] == [fields(link) for link in first_links]
+    assert [link.yanked_reason for link in links] == [None, "bad"]
+
+
+def test_page_is_fetched_again_when_the_entry_disappears(tmp_path) -> None:
+    collector, session = make_collector(tmp_path)
+    session.responses = [(200, {"ETag": '"v1"'}), (304, {}), (200, {"ETag": '"v2"'})]
+    fetch(collector)
+
+    # The entry is removed between reading its validator and the 304.
+    def remove_entry() -> None:
+        if session.sent[-1]:
+            shutil.rmtree(tmp_path)
+
+    session.on_get = remove_entry
+    page, links = fetch(collector)
+
+    assert session.sent == [{}, {"If-None-Match": '"v1"'}, {}]
+    assert page.content == PAGE
+    assert page.validator == '"v2"'
+    assert [link.filename for link in links] == ["demo-1.0.tar.gz", "demo-1.1.tar.gz"]
+    assert collector.link_cache is not None
+    assert collector.link_cache.validator(PAGE_URL) == '"v2"'
+
+
+def test_pages_without_validator_are_keyed_by_content(tmp_path) -> None:
+    collector, session = make_collector(tmp_path)
+    session.responses = [(200, {}), (200, {})]
+
+    _, first_links = fetch(collector)
+    _, links = fetch(collector)
+
+    assert session.sent == [{}, {}]
+    assert collector.link_cache is not None
+    validator = collector.link_cache.validator(PAGE_URL)
+    assert validator is not None and validator.startswith("sha256:")
+    assert [fields(link) for link in links] == [fields(link) for link in first_links]
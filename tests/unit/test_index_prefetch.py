@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, Generator, List, Tuple
+
+import pytest
+
+from pip._internal.index.prefetch import CandidatePrefetcher
+from pip._internal.utils.logging import get_indentation, indent_log
+
+logger = logging.getLogger("pip._internal.tests")
+
+
+class FakeFinder:
+    """Return ``candidates[name]``, or raise it if it is an exception.
+
+    ``hold[name]`` is waited on before the lookup starts.
+    """
+
+    def __init__(self, candidates: Dict[str, object]) -> None:
+        self.candidates = candidates
+        self.hold: Dict[str, threading.Event] = {}
+        self.looked_up: List[str] = []
+
+    def collect_all_candidates(self, project_name: str) -> object:
+        if project_name in self.hold:
+            assert self.hold[project_name].wait(5)
+        self.looked_up.append(project_name)
+        logger.info("looking up %s", project_name)
+        with indent_log():
+            logger.info("found candidates of %s", project_name)
+        result = self.candidates[project_name]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def make_candidate_evaluator(
+        self, project_name: str, specifier: object
+    ) -> SimpleNamespace:
+        return SimpleNamespace(
+            compute_best_candidate=lambda candidates: SimpleNamespace(
+                best_candidate=None
+            )
+        )
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self.lines: List[Tuple[int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append((get_indentation(), record.getMessage()))
+
+
+@pytest.fixture
+def handler() -> Generator[ListHandler, None, None]:
+    handler = ListHandler()
+    root = logging.getLogger()
+    root.addHandler(handler)
+    levels = {name: logging.getLogger(name).level for name in ("pip", logger.name)}
+    logging.getLogger("pip").setLevel(logging.DEBUG)
+    logger.setLevel(logging.INFO)
+    try:
+        yield handler
+    finally:
+        for name, level in levels.items():
+            logging.getLogger(name).setLevel(level)
+        root.removeHandler(handler)
+
+
+def make_prefetcher(
+    candidates: Dict[str, object], max_workers: int = 2
+) -> Tuple[CandidatePrefetcher, FakeFinder]:
+    finder = FakeFinder(candidates)
+    return CandidatePrefetcher(finder, max_workers), finder  # type: ignore
+
+
+def test_take_returns_finished_prefetch(handler: ListHandler) -> None:
+    prefetcher, finder = make_prefetcher({"demo": ["demo-1.0"]})
+
+    with prefetcher:
+        prefetcher.prefetch("Demo")
+        prefetcher.prefetch("demo")
+        assert prefetcher.take("DEMO") == ["demo-1.0"]
+        assert prefetcher.take("other") is None
+
+    assert finder.looked_up == ["demo"]
+
+
+def test_take_cancels_a_prefetch_that_has_not_started() -> None:
+    prefetcher, finder = make_prefetcher({"first": [], "second": []}, 1)
+    finder.hold["first"] = threading.Event()
+
+    with prefetcher:
+        prefetcher.prefetch("first")
+        prefetcher.prefetch("second")
+        # The only worker is busy with "first", so the caller looks
+        # "second" up itself instead of waiting.
+        assert prefetcher.take("second") is None
+        finder.hold["first"].set()
+        assert prefetcher.take("first") == []
+
+    assert finder.looked_up == ["first"]
+
+
+def test_take_returns_none_for_a_failed_prefetch(handler: ListHandler) -> None:
+    prefetcher, _ = make_prefetcher({"demo": OSError("connection reset")})
+
+    with prefetcher:
+        prefetcher.prefetch("demo")
+        assert prefetcher.take("demo") is None
+
+    messages = [message for _, message in handler.lines]
+    assert "Prefetching demo failed: connection reset" in messages
+
+
+def test_logs_are_replayed_when_taken(handler: ListHandler) -> None:
+    prefetcher, finder = make_prefetcher({"a": [], "b": []})
+    finder.hold["a"] = threading.Event()
+
+    with prefetcher:
+        prefetcher.prefetch("a")
+        prefetcher.prefetch("b")
+        # "b" finishes first, but logs are replayed in the order taken.
+        while finder.looked_up != ["b"]:
+            time.sleep(0.01)
+        finder.hold["a"].set()
+        assert handler.lines == []
+
+        with indent_log():
+            prefetcher.take("a")
+            prefetcher.take("b")
+        logger.info("done")
+
+    assert handler.lines[:5] == [
+        (2, "looking up a"),
+        (4, "found candidates of a"),
+        (2, "looking up b"),
+        (4, "found candidates of b"),
+        (0, "done"),
+    ]
+    assert handler.lines[5][1].startswith("Prefetching: the resolver used 2 of 2 ")
+
+
+def test_close_cancels_prefetches_that_have_not_started(
+    handler: ListHandler,
+) -> None:
+    prefetcher, finder = make_prefetcher({"a": [], "b": []}, 1)
+    finder.hold["a"] = threading.Event()
+    timer = threading.Timer(0.2, finder.hold["a"].set)
+
+    with prefetcher:
+        prefetcher.prefetch("a")
+        prefetcher.prefetch("b")
+        timer.start()
+
+    assert finder.looked_up == ["a"]
+    assert handler.lines[-1][1].startswith("Prefetching: the resolver used 0 of 1 ")
@@ -0,0 +1,186 @@
+import io
+import threading
+import time
+from typing import Dict, List, Optional
+
+import pytest
+
+from pip._vendor.requests.adapters import DEFAULT_POOLSIZE
+from pip._vendor.requests.models import Response
+
+from pip._internal.cli.progress_bars import (
+    _RawBatchDownloadProgress,
+    _RichBatchDownloadProgress,
+)
+from pip._internal.exceptions import NetworkConnectionError
+from pip._internal.models.link import Link
+from pip._internal.network.download import BatchDownloader
+
+
+class FakeSession:
+    """Serve ``files`` (URL -> bytes) and record every request.
+
+    ``before_response`` maps a URL to a callable run inside ``get``, which
+    lets a test hold a download open or fail it.
+    """
+
+    def __init__(self, files: Dict[str, bytes]) -> None:
+        self.files = files
+        self.before_response: Dict[str, object] = {}
+        self.requested: List[str] = []
+        self.active: Dict[str, int] = {}
+        self.max_active: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: Dict[str, str], stream: bool) -> Response:
+        host = Link(url).netloc
+        with self._lock:
+            self.requested.append(url)
+            self.active[host] = self.active.get(host, 0) + 1
+            self.max_active[host] = max(
+                self.max_active.get(host, 0), self.active[host]
+            )
+        try:
+            hook = self.before_response.get(url)
+            if hook is not None:
+                hook()  # type: ignore[operator]
+        finally:
+            with self._lock:
+                self.active[host] -= 1
+
+        resp = Response()
+        resp.url = url
+        if url in self.files:
+            resp.status_code = 200
+            resp.reason = "OK"
+            resp.headers["Content-Length"] = str(len(self.files[url]))
+            resp.raw = io.BytesIO(self.files[url])
+        else:
+            resp.status_code = 404
+            resp.reason = "Not Found"
+            resp.raw = io.BytesIO(b"")
+        return resp
+
+
+def make_links(count: int, host: str = "files.example.com") -> List[Link]:
+    return [Link(f"https://{host}/pkg-{i}.tar.gz") for i in range(count)]
+
+
+def serve(links: List[Link], size: int = 100) -> FakeSession:
+    return FakeSession(
+        {link.url: bytes([i % 256]) * (size + i) for i, link in enumerate(links)}
+    )
+
+
+def test_results_are_yielded_in_input_order(tmp_path) -> None:
+    links = make_links(4)
+    session = serve(links)
+    # Each request waits for the one after it, so the downloads finish in
+    # reverse order.
+    done = [threading.Event() for _ in links]
+    for i, link in enumerate(links):
+
+        def hold(i: int = i) -> None:
+            if i + 1 < len(links):
+                assert done[i + 1].wait(5)
+            done[i].set()
+
+        session.before_response[link.url] = hold
+    downloader = BatchDownloader(session, "off", max_workers=4)  # type: ignore
+
+    results = list(downloader(links, str(tmp_path)))
+
+    assert [link for link, _ in results] == links
+    for link, (filepath, _) in results:
+        with open(filepath, "rb") as f:
+            assert f.read() == session.files[link.url]
+
+
+def test_error_stops_new_downloads_and_is_reraised(tmp_path) -> None:
+    links = make_links(6)
+    session = serve(links)
+    del session.files[links[0].url]
+    # links[1] is still downloading when links[0] fails; the idle worker
+    # must not start links[2:].
+    started = threading.Event()
+    release = threading.Event()
+
+    def hold() -> None:
+        started.set()
+        release.wait(5)
+
+    session.before_response[links[0].url] = lambda: started.wait(5)
+    session.before_response[links[1].url] = hold
+    timer = threading.Timer(0.3, release.set)
+    timer.start()
+    downloader = BatchDownloader(session, "off", max_workers=2)  # type: ignore
+
+    with pytest.raises(NetworkConnectionError, match="404 Client Error"):
+        list(downloader(links, str(tmp_path)))
+
+    timer.cancel()
+    assert sorted(session.requested) == [links[0].url, links[1].url]
+    assert (tmp_path / links[1].filename).exists()
+
+
+def test_connections_per_host_are_capped(tmp_path) -> None:
+    links = make_links(8, "a.example.com") + make_links(4, "b.example.com")
+    session = serve(links)
+    for link in links:
+        session.before_response[link.url] = lambda: time.sleep(0.05)
+    downloader = BatchDownloader(
+        session, "off", max_workers=6, max_per_host=2  # type: ignore
+    )
+
+    results = list(downloader(links, str(tmp_path)))
+
+    assert [link for link, _ in results] == links
+    assert session.max_active == {"a.example.com": 2, "b.example.com": 2}
+
+
+@pytest.mark.parametrize(
+    "max_workers, max_per_host, expected",
+    [(4, None, 4), (32, None, DEFAULT_POOLSIZE), (32, 64, DEFAULT_POOLSIZE)],
+)
+def test_per_host_limit_stays_within_connection_pool(
+    max_workers: int, max_per_host: Optional[int], expected: int
+) -> None:
+    downloader = BatchDownloader(
+        FakeSession({}), "off", max_workers, max_per_host  # type: ignore
+    )
+
+    assert downloader._max_per_host == expected
+
+
+def test_raw_progress_totals_every_byte(tmp_path, capsys) -> None:
+    links = make_links(5)
+    session = serve(links, size=1000)
+    downloader = BatchDownloader(session, "raw", max_workers=3)  # type: ignore
+
+    list(downloader(links, str(tmp_path)))
+
+    total = sum(len(content) for content in session.files.values())
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[-1] == f"Progress {total} of {total}"
+
+
+def test_raw_progress_counts_files_of_unknown_size(capsys) -> None:
+    progress = _RawBatchDownloadProgress()
+
+    with progress:
+        list(progress.track([b"ab", b"c"], description="a", size=3))
+        list(progress.track([b"defg"], description="b", size=None))
+
+    assert capsys.readouterr().out.splitlines()[-1] == "Progress 7 of 7"
+
+
+def test_rich_progress_totals_and_counts_files() -> None:
+    progress = _RichBatchDownloadProgress(total_files=2)
+
+    with progress:
+        list(progress.track([b"ab", b"c"], description="a", size=3))
+        list(progress.track([b"defg"], description="b", size=None, visible=False))
+        (overall,) = progress._progress.tasks
+
+    assert (overall.completed, overall.total) == (7, 7)
+    assert overall.description.endswith("2/2 files")
@@ -0,0 +1,159 @@
+import csv
+import importlib.util
+import os
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from pip._internal.models.scheme import Scheme
+from pip._internal.operations.install import pycompile
+from pip._internal.operations.install.pycompile import (
+    CHUNK_SIZE,
+    BytecodeCompiler,
+    CompileJob,
+)
+from pip._internal.operations.install.wheel import install_wheel
+
+MODULES = CHUNK_SIZE * 2 + 5
+
+
+def make_sources(directory: Path, count: int = MODULES) -> List[str]:
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = directory / f"mod_{i:03}.py"
+        path.write_text(f"VALUE = {i}\n")
+        paths.append(str(path))
+    return paths
+
+
+def compiled(paths: List[str]) -> List[str]:
+    return [
+        path
+        for path in paths
+        if os.path.exists(importlib.util.cache_from_source(path))
+    ]
+
+
+def kill_worker(compiler: BytecodeCompiler) -> None:
+    executor = compiler._get_executor()
+    assert executor is not None
+    with pytest.raises(BrokenProcessPool):
+        executor.submit(os._exit, 1).result()
+
+
+def test_serial_when_pool_cannot_start(tmp_path, monkeypatch) -> None:
+    def no_pool(max_workers: int) -> None:
+        raise OSError("sem_open is not implemented")
+
+    monkeypatch.setattr(pycompile, "ProcessPoolExecutor", no_pool)
+    paths = make_sources(tmp_path)
+
+    with BytecodeCompiler(workers=4, deferred=True) as compiler:
+        job = compiler.submit(paths)
+        assert (compiler.workers, compiler.deferred) == (1, False)
+
+    assert job.compiled_paths() == paths == compiled(paths)
+
+
+def test_worker_killed_between_wheels(tmp_path) -> None:
+    first = make_sources(tmp_path / "first")
+    second = make_sources(tmp_path / "second")
+
+    with BytecodeCompiler(workers=2) as compiler:
+        assert compiler.submit(first).compiled_paths() == first
+        kill_worker(compiler)
+        job = compiler.submit(second)
+        assert (compiler._executor, compiler.workers) == (None, 1)
+        assert job.compiled_paths() == second
+
+    assert compiled(first + second) == first + second
+
+
+def test_worker_killed_while_job_is_pending(tmp_path) -> None:
+    paths = make_sources(tmp_path / "first")
+    later = make_sources(tmp_path / "later")
+
+    with BytecodeCompiler(workers=2) as compiler:
+        executor = compiler._get_executor()
+        assert executor is not None
+        job = CompileJob(paths, [executor.submit(os._exit, 1)], compiler=compiler)
+        assert job.compiled_paths() == paths
+        assert (compiler._executor, compiler.workers) == (None, 1)
+        assert compiler.submit(later).compiled_paths() == later
+
+    assert compiled(paths + later) == paths + later
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_uncompilable_files_are_left_out(tmp_path, workers: int) -> None:
+    paths = make_sources(tmp_path)
+    Path(paths[CHUNK_SIZE]).write_text("def broken(:\n")
+
+    with BytecodeCompiler(workers=workers) as compiler:
+        result = compiler.submit(paths).compiled_paths()
+
+    assert result == paths[:CHUNK_SIZE] + paths[CHUNK_SIZE + 1 :]
+
+
+def make_wheel(path: Path) -> str:
+    wheel_path = path / "demo-1.0-py3-none-any.whl"
+    rows = []
+    with zipfile.ZipFile(wheel_path, "w") as wheel:
+        for i in range(MODULES):
+            wheel.writestr(f"demo/mod_{i:03}.py", f"VALUE = {i}\n")
+            rows.append(f"demo/mod_{i:03}.py,,")
+        wheel.writestr("demo/broken.py", "def broken(:\n")
+        wheel.writestr(
+            "demo-1.0.dist-info/METADATA",
+            "Metadata-Version: 2.1\nName: demo\nVersion: 1.0\n",
+        )
+        wheel.writestr(
+            "demo-1.0.dist-info/WHEEL",
+            "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\n"
+            "Tag: py3-none-any\n",
+        )
+        rows += ["demo/broken.py,,", "demo-1.0.dist-info/METADATA,,"]
+        rows += ["demo-1.0.dist-info/WHEEL,,", "demo-1.0.dist-info/RECORD,,"]
+        wheel.writestr("demo-1.0.dist-info/RECORD", "\n".join(rows) + "\n")
+    return str(wheel_path)
+
+
+def install_record(wheel_path: str, target: Path, compiler: BytecodeCompiler) -> str:
+    scheme = Scheme(
+        platlib=str(target / "lib"),
+        purelib=str(target / "lib"),
+        headers=str(target / "headers"),
+        scripts=str(target / "bin"),
+        data=str(target / "data"),
+    )
+    with compiler:
+        finish_install = install_wheel(
+            "demo", wheel_path, scheme, "demo", compiler=compiler
+        )
+        assert (finish_install is not None) == compiler.deferred
+        if finish_install is not None:
+            finish_install()
+    return (target / "lib" / "demo-1.0.dist-info" / "RECORD").read_text()
+
+
+def test_record_is_the_same_in_every_mode(tmp_path, monkeypatch) -> None:
+    # Hash-based .pyc files, so RECORD does not depend on source mtimes.
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "0")
+    wheel_path = make_wheel(tmp_path)
+
+    records = [
+        install_record(wheel_path, tmp_path / "serial", BytecodeCompiler()),
+        install_record(wheel_path, tmp_path / "pool", BytecodeCompiler(2)),
+        install_record(
+            wheel_path, tmp_path / "deferred", BytecodeCompiler(2, deferred=True)
+        ),
+    ]
+
+    assert records[1] == records[0]
+    assert records[2] == records[0]
+    rows = list(csv.reader(records[0].splitlines()))
+    assert len([row for row in rows if row[0].endswith(".pyc")]) == MODULES
@@ -0,0 +1,184 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import pytest
+
+from pip._internal.req import _install_concurrently, install_given_reqs
+
+
+class Recorder:
+    """An ``install`` callable that records when each package starts and ends."""
+
+    def __init__(
+        self,
+        delays: Optional[Dict[str, float]] = None,
+        failures: Optional[Dict[str, Exception]] = None,
+    ) -> None:
+        self.delays = delays or {}
+        self.failures = failures or {}
+        self.hooks: Dict[str, Callable[[], None]] = {}
+        self.events: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str, requirement: object) -> Callable[[], None]:
+        with self._lock:
+            self.events.append(("start", name))
+        time.sleep(self.delays.get(name, 0.01))
+        if name in self.hooks:
+            self.hooks[name]()
+        with self._lock:
+            self.events.append(("end", name))
+        if name in self.failures:
+            raise self.failures[name]
+        return lambda: None
+
+    def started(self) -> Set[str]:
+        return {name for event, name in self.events if event == "start"}
+
+    def index(self, event: str, name: str) -> int:
+        return self.events.index((event, name))
+
+
+def install_all(
+    order: List[str], dependencies: Dict[str, Set[str]], recorder: Recorder
+) -> List[str]:
+    to_install = {name: None for name in order}
+    results = _install_concurrently(
+        to_install, dependencies, 4, recorder  # type: ignore[arg-type]
+    )
+    return [name for name, _ in results]
+
+
+def test_packages_start_after_their_dependencies() -> None:
+    order = ["base", "left", "right", "top", "other"]
+    dependencies = {
+        "left": {"base"},
+        "right": {"base"},
+        "top": {"left", "right"},
+        "other": set(),
+    }
+    recorder = Recorder(delays={"base": 0.05, "other": 0.1})
+
+    assert install_all(order, dependencies, recorder) == order
+
+    for name, needed in dependencies.items():
+        for dependency in needed:
+            assert recorder.index("end", dependency) < recorder.index("start", name)
+    # Nothing depends on "other", so it runs alongside "base".
+    assert recorder.index("start", "other") < recorder.index("end", "base")
+
+
+def test_cycles_are_broken_by_installation_order() -> None:
+    order = ["a", "b", "c"]
+    dependencies = {"a": {"c"}, "b": {"a"}, "c": {"b"}}
+    recorder = Recorder()
+
+    assert install_all(order, dependencies, recorder) == order
+
+    assert recorder.events == [
+        ("start", "a"),
+        ("end", "a"),
+        ("start", "b"),
+        ("end", "b"),
+        ("start", "c"),
+        ("end", "c"),
+    ]
+
+
+def test_failure_stops_new_installs_and_finishes_running_ones() -> None:
+    order = ["fails", "slow", "queued", "dependent"]
+    dependencies = {"dependent": {"fails"}}
+    error = RuntimeError("broken wheel")
+    recorder = Recorder(failures={"fails": error})
+    failed = threading.Event()
+    recorder.hooks["fails"] = failed.set
+    # "slow" is still running when "fails" fails.
+    recorder.hooks["slow"] = lambda: (failed.wait(5), time.sleep(0.1))
+    to_install = {name: None for name in order}
+    yielded = []
+
+    with pytest.raises(RuntimeError) as excinfo:
+        results = _install_concurrently(
+            to_install, dependencies, 2, recorder  # type: ignore[arg-type]
+        )
+        for name, _ in results:
+            yielded.append(name)
+
+    assert excinfo.value is error
+    assert recorder.started() == {"fails", "slow"}
+    assert recorder.index("end", "fails") < recorder.index("end", "slow")
+    assert yielded == ["slow"]
+
+
+def test_first_failure_is_raised() -> None:
+    first = RuntimeError("first")
+    recorder = Recorder(
+        delays={"a": 0.01, "b": 0.1},
+        failures={"a": first, "b": RuntimeError("second")},
+    )
+
+    with pytest.raises(RuntimeError) as excinfo:
+        install_all(["b", "a"], {}, recorder)
+
+    assert excinfo.value is first
+    assert recorder.started() == {"a", "b"}
+
+
+class FakePathSet:
+    def __init__(self) -> None:
+        self.outcome: Optional[str] = None
+
+    def commit(self) -> None:
+        self.outcome = "committed"
+
+    def rollback(self) -> None:
+        self.outcome = "rolled back"
+
+
+class FakeRequirement:
+    def __init__(self, name: str, fails: bool = False, delay: float = 0.01) -> None:
+        self.name = name
+        self.fails = fails
+        self.delay = delay
+        self.should_reinstall = True
+        self.install_succeeded: Optional[bool] = None
+        self.pathset = FakePathSet()
+
+    def uninstall(self, auto_confirm: bool) -> FakePathSet:
+        return self.pathset
+
+    def install(self, *args: object, **kwargs: object) -> None:
+        time.sleep(self.delay)
+        if self.fails:
+            self.install_succeeded = False
+            raise RuntimeError(f"cannot install {self.name}")
+        self.install_succeeded = True
+
+
+def test_failed_reinstalls_are_rolled_back() -> None:
+    requirements = [
+        FakeRequirement("first-bad", fails=True, delay=0.02),
+        FakeRequirement("second-bad", fails=True, delay=0.05),
+        FakeRequirement("good", delay=0.05),
+    ]
+
+    with pytest.raises(RuntimeError, match="cannot install first-bad"):
+        install_given_reqs(
+            requirements,  # type: ignore[arg-type]
+            [],
+            root=None,
+            home=None,
+            prefix=None,
+            warn_script_location=False,
+            use_user_site=False,
+            pycompile=False,
+            dependencies={},
+            install_workers=3,
+        )
+
+    assert [req.pathset.outcome for req in requirements] == [
+        "rolled back",
+        "rolled back",
+        "committed",
+    ]
@@ -0,0 +1,87 @@
+import logging
+import threading
+import time
+from typing import Generator, List, Tuple
+
+import pytest
+
+from pip._internal.utils.logging import ThreadLogCapture, get_indentation, indent_log
+
+logger = logging.getLogger("pip._internal.tests")
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: List[Tuple[int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append((get_indentation(), record.getMessage()))
+
+
+@pytest.fixture
+def handler() -> Generator[ListHandler, None, None]:
+    handler = ListHandler()
+    root = logging.getLogger()
+    root.addHandler(handler)
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        yield handler
+    finally:
+        logger.setLevel(level)
+        root.removeHandler(handler)
+
+
+def log_package(name: str, delay: float) -> None:
+    logger.info("start %s", name)
+    time.sleep(delay)
+    with indent_log():
+        logger.info("files of %s", name)
+    logger.info("done %s", name)
+
+
+def test_records_are_replayed_in_the_order_asked(handler: ListHandler) -> None:
+    names = ["a", "b", "c"]
+    captured = {}
+
+    with ThreadLogCapture() as log_capture:
+
+        def run(name: str, delay: float) -> None:
+            with log_capture.capture() as records:
+                log_package(name, delay)
+            captured[name] = records
+
+        # Later packages log first.
+        threads = [
+            threading.Thread(target=run, args=(name, 0.02 * (len(names) - i)))
+            for i, name in enumerate(names)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert handler.lines == []
+
+        with indent_log():
+            for name in names:
+                log_capture.replay(captured[name])
+        logger.info("after")
+
+    expected = []
+    for name in names:
+        expected += [(2, f"start {name}"), (4, f"files of {name}"), (2, f"done {name}")]
+    assert handler.lines == expected + [(0, "after")]
+
+
+def test_records_outside_capture_pass_through(handler: ListHandler) -> None:
+    with ThreadLogCapture() as log_capture:
+        logger.info("main thread")
+        with log_capture.capture() as records:
+            logger.info("held back")
+        logger.info("main thread again")
+
+    assert handler.lines == [(0, "main thread"), (0, "main thread again")]
+    held = [record.getMessage() for owner, record, _ in records if owner is handler]
+    assert held == ["held back"]
+    assert not any(owner.filters for owner in logging.getLogger().handlers)